@@ -0,0 +1,26 @@
+"""add_sambaza_expiry_index
+
+Revision ID: 0b6d8e3f5a21
+Revises: f4a9c2e71d03
+Create Date: 2026-10-18 14:31:05.772940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6d8e3f5a21'
+down_revision: Union[str, None] = 'f4a9c2e71d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_sambaza_groups_status_expires_at', 'sambaza_groups', ['status', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sambaza_groups_status_expires_at', table_name='sambaza_groups')
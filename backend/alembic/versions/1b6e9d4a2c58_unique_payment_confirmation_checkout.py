@@ -0,0 +1,42 @@
+"""unique_payment_confirmation_checkout
+
+Revision ID: 1b6e9d4a2c58
+Revises: e8c1a4f6b290
+Create Date: 2026-10-18 17:05:31.204418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b6e9d4a2c58'
+down_revision: Union[str, None] = 'e8c1a4f6b290'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A checkout is credited at most once: keep its first confirmation (applied ones first)
+    op.execute("""
+        DELETE FROM payment_confirmations c
+        USING (
+            SELECT receipt, row_number() OVER (
+                PARTITION BY checkout_request_id
+                ORDER BY applied_at IS NULL, received_at, receipt
+            ) AS n
+            FROM payment_confirmations
+        ) d
+        WHERE c.receipt = d.receipt AND d.n > 1
+    """)
+    op.drop_index(op.f('ix_payment_confirmations_checkout_request_id'), table_name='payment_confirmations')
+    op.create_index(op.f('ix_payment_confirmations_checkout_request_id'), 'payment_confirmations',
+                    ['checkout_request_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_payment_confirmations_checkout_request_id'), table_name='payment_confirmations')
+    op.create_index(op.f('ix_payment_confirmations_checkout_request_id'), 'payment_confirmations',
+                    ['checkout_request_id'], unique=False)
@@ -0,0 +1,32 @@
+"""add_counter_flushes
+
+Revision ID: 2d8f6b1e4c73
+Revises: 9c4e2a7b5d18
+Create Date: 2026-10-18 16:12:45.906213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8f6b1e4c73'
+down_revision: Union[str, None] = '9c4e2a7b5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('counter_flushes',
+    sa.Column('batch_id', sa.UUID(), nullable=False),
+    sa.Column('flushed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('batch_id')
+    )
+    op.create_index(op.f('ix_counter_flushes_flushed_at'), 'counter_flushes', ['flushed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_counter_flushes_flushed_at'), table_name='counter_flushes')
+    op.drop_table('counter_flushes')
@@ -0,0 +1,53 @@
+"""add_provider_search_index
+
+Revision ID: 3f1c2a9d7b6e
+Revises: ecb0e7ed343c
+Create Date: 2026-10-18 09:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b6e'
+down_revision: Union[str, None] = 'ecb0e7ed343c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(business_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(trade_category, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(verification_notes, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Generated column: Postgres keeps it in sync on every INSERT/UPDATE
+    op.add_column('providers', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_providers_search_vector', 'providers', ['search_vector'], unique=False, postgresql_using='gin')
+    # Trigram indexes serve fuzzy name matches and make ILIKE '%term%' indexable
+    op.create_index(
+        'ix_providers_business_name_trgm', 'providers', ['business_name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'business_name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_providers_trade_category_trgm', 'providers', ['trade_category'], unique=False,
+        postgresql_using='gin', postgresql_ops={'trade_category': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_providers_trade_category_trgm', table_name='providers')
+    op.drop_index('ix_providers_business_name_trgm', table_name='providers')
+    op.drop_index('ix_providers_search_vector', table_name='providers')
+    op.drop_column('providers', 'search_vector')
@@ -0,0 +1,42 @@
+"""add_vote_tables
+
+Revision ID: 5a9f3c7e1d24
+Revises: 1b6e9d4a2c58
+Create Date: 2026-10-18 17:21:08.647205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9f3c7e1d24'
+down_revision: Union[str, None] = '1b6e9d4a2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('alert_upvotes',
+    sa.Column('alert_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['alert_id'], ['community_alerts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('alert_id', 'user_id')
+    )
+    op.create_table('review_helpful_votes',
+    sa.Column('review_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['review_id'], ['reviews.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('review_id', 'user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('review_helpful_votes')
+    op.drop_table('alert_upvotes')
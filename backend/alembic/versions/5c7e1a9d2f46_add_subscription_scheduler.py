@@ -0,0 +1,34 @@
+"""add_subscription_scheduler
+
+Revision ID: 5c7e1a9d2f46
+Revises: 0b6d8e3f5a21
+Create Date: 2026-10-18 14:48:19.330617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e1a9d2f46'
+down_revision: Union[str, None] = '0b6d8e3f5a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_maintenance_subscriptions_status_next_run', 'maintenance_subscriptions', ['status', 'next_run_date'], unique=False)
+    op.add_column('bookings', sa.Column('subscription_id', sa.UUID(), nullable=True))
+    op.create_foreign_key('bookings_subscription_id_fkey', 'bookings', 'maintenance_subscriptions', ['subscription_id'], ['id'])
+    op.add_column('job_requests', sa.Column('subscription_id', sa.UUID(), nullable=True))
+    op.create_foreign_key('job_requests_subscription_id_fkey', 'job_requests', 'maintenance_subscriptions', ['subscription_id'], ['id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('job_requests_subscription_id_fkey', 'job_requests', type_='foreignkey')
+    op.drop_column('job_requests', 'subscription_id')
+    op.drop_constraint('bookings_subscription_id_fkey', 'bookings', type_='foreignkey')
+    op.drop_column('bookings', 'subscription_id')
+    op.drop_index('ix_maintenance_subscriptions_status_next_run', table_name='maintenance_subscriptions')
@@ -0,0 +1,35 @@
+"""add_alert_geotiles
+
+Revision ID: 6a1d3c5e7f92
+Revises: b3d5f7a9c1e8
+Create Date: 2026-10-18 15:41:37.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1d3c5e7f92'
+down_revision: Union[str, None] = 'b3d5f7a9c1e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('community_alerts', sa.Column('geotile', sa.String(length=5), nullable=True))
+    # Same encoding as app.core.geo.geohash (PostGIS is already required by job_requests)
+    op.execute("""
+        UPDATE community_alerts
+        SET geotile = ST_GeoHash(ST_SetSRID(ST_MakePoint(lng, lat), 4326), 5)
+        WHERE lat IS NOT NULL AND lng IS NOT NULL
+    """)
+    op.create_index('ix_community_alerts_geotile_created_at_id', 'community_alerts',
+                    ['geotile', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_community_alerts_geotile_created_at_id', table_name='community_alerts')
+    op.drop_column('community_alerts', 'geotile')
@@ -0,0 +1,31 @@
+"""add_mesh_membership_indexes
+
+Revision ID: 7f3b9d2e6a15
+Revises: 2d8f6b1e4c73
+Create Date: 2026-10-18 16:27:19.480352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3b9d2e6a15'
+down_revision: Union[str, None] = '2d8f6b1e4c73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_mesh_members_user_id_status_team_id', 'mesh_members',
+                    ['user_id', 'status', 'team_id'], unique=False)
+    op.create_index(op.f('ix_mesh_members_team_id'), 'mesh_members', ['team_id'], unique=False)
+    op.create_index(op.f('ix_mesh_teams_leader_id'), 'mesh_teams', ['leader_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_mesh_teams_leader_id'), table_name='mesh_teams')
+    op.drop_index(op.f('ix_mesh_members_team_id'), table_name='mesh_members')
+    op.drop_index('ix_mesh_members_user_id_status_team_id', table_name='mesh_members')
@@ -0,0 +1,51 @@
+"""add_payment_requests
+
+Revision ID: 8e2f4b6c1a97
+Revises: 5c7e1a9d2f46
+Create Date: 2026-10-18 15:06:44.918273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4b6c1a97'
+down_revision: Union[str, None] = '5c7e1a9d2f46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('payment_requests',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('booking_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('phone_number', sa.String(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('merchant_request_id', sa.String(), nullable=True),
+    sa.Column('checkout_request_id', sa.String(), nullable=True),
+    sa.Column('result_code', sa.Integer(), nullable=True),
+    sa.Column('result_desc', sa.String(), nullable=True),
+    sa.Column('mpesa_receipt', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('checkout_request_id')
+    )
+    op.create_index(op.f('ix_payment_requests_booking_id'), 'payment_requests', ['booking_id'], unique=False)
+    op.create_index('ix_payment_requests_open_booking', 'payment_requests', ['booking_id'], unique=True,
+                    postgresql_where=sa.text("status IN ('queued', 'sending', 'sent')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_requests_open_booking', table_name='payment_requests')
+    op.drop_index(op.f('ix_payment_requests_booking_id'), table_name='payment_requests')
+    op.drop_table('payment_requests')
@@ -0,0 +1,46 @@
+"""add_alert_incidents
+
+Revision ID: 9c4e2a7b5d18
+Revises: 6a1d3c5e7f92
+Create Date: 2026-10-18 15:58:02.734519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2a7b5d18'
+down_revision: Union[str, None] = '6a1d3c5e7f92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('community_alerts', sa.Column('incident_id', sa.UUID(), nullable=True))
+    op.add_column('community_alerts', sa.Column('report_count', sa.Integer(), server_default='1', nullable=False))
+    op.create_foreign_key('fk_community_alerts_incident_id', 'community_alerts', 'community_alerts',
+                          ['incident_id'], ['id'])
+    op.create_index(op.f('ix_community_alerts_incident_id'), 'community_alerts', ['incident_id'], unique=False)
+
+    # Feeds only read incidents; existing alerts all are one
+    op.create_index('ix_community_alerts_incidents_created_at_id', 'community_alerts', ['created_at', 'id'],
+                    unique=False, postgresql_where=sa.text('incident_id IS NULL'))
+    op.create_index('ix_community_alerts_incidents_geotile_created_at_id', 'community_alerts',
+                    ['geotile', 'created_at', 'id'], unique=False, postgresql_where=sa.text('incident_id IS NULL'))
+    op.drop_index('ix_community_alerts_geotile_created_at_id', table_name='community_alerts')
+    op.drop_index('ix_community_alerts_created_at_id', table_name='community_alerts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_community_alerts_created_at_id', 'community_alerts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_community_alerts_geotile_created_at_id', 'community_alerts',
+                    ['geotile', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_community_alerts_incidents_geotile_created_at_id', table_name='community_alerts')
+    op.drop_index('ix_community_alerts_incidents_created_at_id', table_name='community_alerts')
+    op.drop_index(op.f('ix_community_alerts_incident_id'), table_name='community_alerts')
+    op.drop_constraint('fk_community_alerts_incident_id', 'community_alerts', type_='foreignkey')
+    op.drop_column('community_alerts', 'report_count')
+    op.drop_column('community_alerts', 'incident_id')
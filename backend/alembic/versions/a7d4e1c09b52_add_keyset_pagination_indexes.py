@@ -0,0 +1,33 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: a7d4e1c09b52
+Revises: 3f1c2a9d7b6e
+Create Date: 2026-10-18 10:03:17.548102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4e1c09b52'
+down_revision: Union[str, None] = '3f1c2a9d7b6e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes matching the (sort key, unique id) cursors of the list endpoints
+    op.create_index('ix_community_alerts_created_at_id', 'community_alerts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_providers_trust_score_user_id', 'providers', ['trust_score', 'user_id'], unique=False)
+    op.create_index('ix_diy_guides_title_id', 'diy_guides', ['title', 'id'], unique=False)
+    op.create_index('ix_bookings_consumer_scheduled', 'bookings', ['consumer_id', 'scheduled_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_consumer_scheduled', table_name='bookings')
+    op.drop_index('ix_diy_guides_title_id', table_name='diy_guides')
+    op.drop_index('ix_providers_trust_score_user_id', table_name='providers')
+    op.drop_index('ix_community_alerts_created_at_id', table_name='community_alerts')
@@ -0,0 +1,42 @@
+"""add_payment_confirmations
+
+Revision ID: b3d5f7a9c1e8
+Revises: 8e2f4b6c1a97
+Create Date: 2026-10-18 15:24:10.652148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d5f7a9c1e8'
+down_revision: Union[str, None] = '8e2f4b6c1a97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('payment_confirmations',
+    sa.Column('receipt', sa.String(), nullable=False),
+    sa.Column('checkout_request_id', sa.String(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('phone_number', sa.String(), nullable=True),
+    sa.Column('transaction_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('booking_id', sa.UUID(), nullable=True),
+    sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('applied_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ),
+    sa.PrimaryKeyConstraint('receipt')
+    )
+    op.create_index(op.f('ix_payment_confirmations_checkout_request_id'), 'payment_confirmations', ['checkout_request_id'], unique=False)
+    op.create_index('ix_payment_confirmations_unapplied', 'payment_confirmations', ['received_at'], unique=False,
+                    postgresql_where=sa.text('applied_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_confirmations_unapplied', table_name='payment_confirmations')
+    op.drop_index(op.f('ix_payment_confirmations_checkout_request_id'), table_name='payment_confirmations')
+    op.drop_table('payment_confirmations')
@@ -0,0 +1,64 @@
+"""add_provider_stats
+
+Revision ID: c58b3e2f7a14
+Revises: a7d4e1c09b52
+Create Date: 2026-10-18 11:26:52.117334
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58b3e2f7a14'
+down_revision: Union[str, None] = 'a7d4e1c09b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('provider_stats',
+    sa.Column('provider_id', sa.UUID(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('vouch_weight_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('bookings_completed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('bookings_cancelled', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('response_minutes_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('response_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['provider_id'], ['providers.user_id'], ),
+    sa.PrimaryKeyConstraint('provider_id')
+    )
+    op.add_column('bookings', sa.Column('responded_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Seed aggregates from existing history once; from here on they are maintained incrementally
+    op.execute("""
+        INSERT INTO provider_stats (provider_id, rating_sum, rating_count, bookings_completed, bookings_cancelled)
+        SELECT p.user_id,
+               COALESCE(r.rating_sum, 0), COALESCE(r.rating_count, 0),
+               COALESCE(b.completed, 0), COALESCE(b.cancelled, 0)
+        FROM providers p
+        LEFT JOIN (
+            SELECT reviewee_id, SUM(overall_rating) AS rating_sum, COUNT(*) AS rating_count
+            FROM reviews GROUP BY reviewee_id
+        ) r ON r.reviewee_id = p.user_id
+        LEFT JOIN (
+            SELECT provider_id,
+                   COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+                   COUNT(*) FILTER (WHERE status = 'cancelled') AS cancelled
+            FROM bookings GROUP BY provider_id
+        ) b ON b.provider_id = p.user_id
+    """)
+    op.execute("""
+        UPDATE provider_stats s SET vouch_weight_sum = v.total
+        FROM (SELECT provider_id, SUM(weight) AS total FROM vouches GROUP BY provider_id) v
+        WHERE v.provider_id = s.provider_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('bookings', 'responded_at')
+    op.drop_table('provider_stats')
@@ -0,0 +1,31 @@
+"""add_provider_fk_indexes
+
+Revision ID: d91f6a3b2c80
+Revises: c58b3e2f7a14
+Create Date: 2026-10-18 12:41:09.662170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91f6a3b2c80'
+down_revision: Union[str, None] = 'c58b3e2f7a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Range scans per provider-id chunk in the nightly trust score rebuild
+    op.create_index(op.f('ix_reviews_reviewee_id'), 'reviews', ['reviewee_id'], unique=False)
+    op.create_index(op.f('ix_vouches_provider_id'), 'vouches', ['provider_id'], unique=False)
+    op.create_index(op.f('ix_bookings_provider_id'), 'bookings', ['provider_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_bookings_provider_id'), table_name='bookings')
+    op.drop_index(op.f('ix_vouches_provider_id'), table_name='vouches')
+    op.drop_index(op.f('ix_reviews_reviewee_id'), table_name='reviews')
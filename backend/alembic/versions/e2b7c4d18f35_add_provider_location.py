@@ -0,0 +1,30 @@
+"""add_provider_location
+
+Revision ID: e2b7c4d18f35
+Revises: d91f6a3b2c80
+Create Date: 2026-10-18 13:55:30.481296
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c4d18f35'
+down_revision: Union[str, None] = 'd91f6a3b2c80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('providers', sa.Column('lat', sa.Float(), nullable=True))
+    op.add_column('providers', sa.Column('lng', sa.Float(), nullable=True))
+    op.add_column('providers', sa.Column('is_available', sa.Boolean(), server_default=sa.true(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('providers', 'is_available')
+    op.drop_column('providers', 'lng')
+    op.drop_column('providers', 'lat')
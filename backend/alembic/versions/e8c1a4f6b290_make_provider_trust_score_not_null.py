@@ -0,0 +1,30 @@
+"""make_provider_trust_score_not_null
+
+Revision ID: e8c1a4f6b290
+Revises: 7f3b9d2e6a15
+Create Date: 2026-10-18 16:44:02.913587
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c1a4f6b290'
+down_revision: Union[str, None] = '7f3b9d2e6a15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # trust_score is the directory's keyset sort key; a NULL key breaks the cursor comparison
+    op.execute("UPDATE providers SET trust_score = 0 WHERE trust_score IS NULL")
+    op.alter_column('providers', 'trust_score', existing_type=sa.Integer(),
+                    nullable=False, server_default='0')
+
+
+def downgrade() -> None:
+    op.alter_column('providers', 'trust_score', existing_type=sa.Integer(),
+                    nullable=True, server_default=None)
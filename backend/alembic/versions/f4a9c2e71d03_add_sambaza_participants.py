@@ -0,0 +1,61 @@
+"""add_sambaza_participants
+
+Revision ID: f4a9c2e71d03
+Revises: e2b7c4d18f35
+Create Date: 2026-10-18 14:12:37.508216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a9c2e71d03'
+down_revision: Union[str, None] = 'e2b7c4d18f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # sambaza_groups was modelled but never migrated (create it where missing)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS sambaza_groups (
+            id UUID PRIMARY KEY,
+            title VARCHAR NOT NULL,
+            service_category VARCHAR NOT NULL,
+            suburb VARCHAR NOT NULL,
+            organizer_id VARCHAR NOT NULL,
+            participant_count INTEGER,
+            target_count INTEGER,
+            discount_tier VARCHAR,
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            status VARCHAR,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+    """)
+    op.create_table('sambaza_participants',
+    sa.Column('group_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['group_id'], ['sambaza_groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('group_id', 'user_id')
+    )
+    op.create_index(op.f('ix_sambaza_participants_user_id'), 'sambaza_participants', ['user_id'], unique=False)
+
+    # Organizers of existing groups are their first participant
+    op.execute("""
+        INSERT INTO sambaza_participants (group_id, user_id, joined_at)
+        SELECT g.id, u.id, g.created_at
+        FROM sambaza_groups g
+        JOIN users u ON u.id::text = g.organizer_id
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sambaza_participants_user_id'), table_name='sambaza_participants')
+    op.drop_table('sambaza_participants')
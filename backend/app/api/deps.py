@@ -1,19 +1,47 @@
+import time
 from typing import Generator
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from jose import jwt, JWTError
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal
+from app.core.database import AsyncSessionLocal, ReplicaSessionLocal
+from app.core.replica import replica_health, wrote_recently
 from app.models.user import User
 from app.schemas.user import TokenData
 
+# Resolved users by id, so authenticated requests skip the `users` lookup.
+# Entries never outlive the token that loaded them.
+user_cache = TTLCache("users", settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+def invalidate_user(user_id) -> None:
+    """
+    Drop a cached user. Call after any change to the user row (profile, type, deactivation).
+    """
+    user_cache.invalidate(str(user_id))
+
 async def get_db() -> Generator:
     async with AsyncSessionLocal() as session:
         yield session
 
+async def get_read_db(request: Request) -> Generator:
+    """
+    Session for safe read-only handlers: the replica, unless this client wrote within
+    READ_YOUR_WRITES_SECONDS, the replica is lagging/unreachable, or the response is
+    about to be stored by the response cache.
+    """
+    use_replica = (
+        not getattr(request.state, "read_from_primary", False)
+        and not wrote_recently(request)
+        and await replica_health.usable()
+    )
+    session_factory = ReplicaSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as session:
+        yield session
+
 async def get_current_user(
     token: str = Depends(security.oauth2_scheme),
     db: AsyncSession = Depends(get_db),
@@ -31,9 +59,30 @@ async def get_current_user(
         token_data = TokenData(user_id=user_id)
     except JWTError:
         raise credentials_exception
-    
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalars().first()
+
+    user = user_cache.get(token_data.user_id)
     if user is None:
-        raise credentials_exception
-    return user
+        result = await db.execute(select(User).where(User.id == token_data.user_id))
+        user = result.scalars().first()
+        if user is None:
+            raise credentials_exception
+        # Cache a detached snapshot; each request gets its own session-bound copy below
+        db.expunge(user)
+        user_cache.set(token_data.user_id, user, ttl_seconds=payload.get("exp", 0) - time.time())
+
+    # Attach to this request's session without a SELECT
+    return await db.merge(user, load=False)
+
+async def get_current_active_user(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_active_user),
+) -> User:
+    if current_user.user_type != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, providers, payments, reviews, users, emergency, bookings, support, sambaza, estate, supply, portfolio, invoices, family, scan, mesh, subscriptions, alerts, jifunze
+from app.api.v1.endpoints import auth, providers, payments, reviews, users, emergency, bookings, support, sambaza, estate, supply, portfolio, invoices, family, scan, mesh, subscriptions, alerts, jifunze, metrics
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -21,3 +21,4 @@ api_router.include_router(mesh.router, prefix="/mesh", tags=["mesh"])
 api_router.include_router(subscriptions.router, prefix="/subscriptions", tags=["subscriptions"])
 api_router.include_router(alerts.router, prefix="/alerts", tags=["alerts"])
 api_router.include_router(jifunze.router, prefix="/jifunze", tags=["jifunze"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
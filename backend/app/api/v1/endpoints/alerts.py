@@ -1,34 +1,116 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import uuid
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, func, literal, true
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 from app.api import deps
+from app.core import response_cache
+from app.core.config import settings
+from app.core.geo import geohash, geohash_cells_within
+from app.core.pagination import keyset, finish_page
+from app.core.serialization import json_list
 from app.models.alert import CommunityAlert
+from app.models.vote import AlertUpvote
 from app.schemas import alert as schemas
+from app.services.alert_clustering import alert_clusterer
+from app.services.alert_stream import alert_stream
+from app.services.counters import counter_buffer
 from app.models.user import User
 
-router = APIRouter()
+router = APIRouter(route_class=response_cache.CachedRoute)
 
 @router.get("/feed", response_model=List[schemas.AlertOut])
-def read_alerts(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 50,
+@response_cache.cache_response("alerts", ttl_seconds=15)
+async def read_alerts(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
 ) -> Any:
     """
-    Get recent community alerts.
+    Get recent community alerts, newest first, one entry per incident (duplicate reports
+    are counted in `report_count`).
+    Pass the `X-Next-Cursor` response header back as `cursor` for older alerts.
     """
-    alerts = db.query(CommunityAlert).order_by(CommunityAlert.created_at.desc()).offset(skip).limit(limit).all()
-    return alerts
+    sort_keys = [CommunityAlert.created_at, CommunityAlert.id]
+    incidents = select(CommunityAlert).where(CommunityAlert.incident_id.is_(None))
+    result = await db.execute(keyset(incidents, sort_keys, cursor, limit))
+    alerts = finish_page(response, result.scalars().all(), limit, key=lambda a: (a.created_at, a.id))
+    counter_buffer.overlay("alert_upvotes", alerts, "upvotes")
+    return json_list(schemas.AlertListAdapter, alerts, response)
+
+def near_alerts_query(lat: float, lng: float, radius_km: float, cursor: Optional[str], limit: int):
+    """
+    Newest incidents in the geohash tiles around (lat, lng), keyset-paginated.
+    One index range scan of at most limit + 1 rows per tile, merged: the cost depends
+    on the radius, not on how many alerts the table holds nationally.
+    """
+    tiles = (
+        func.unnest(literal(geohash_cells_within(lat, lng, radius_km), ARRAY(String)))
+        .table_valued("tile")
+        .render_derived(name="tiles")
+    )
+    sort_keys = [CommunityAlert.created_at, CommunityAlert.id]
+    per_tile = keyset(
+        select(CommunityAlert).where(CommunityAlert.geotile == tiles.c.tile, CommunityAlert.incident_id.is_(None)),
+        sort_keys, cursor, limit,
+    ).lateral("per_tile")
+    nearby = aliased(CommunityAlert, per_tile)
+    return keyset(select(nearby).select_from(tiles).join(per_tile, true()), [nearby.created_at, nearby.id], None, limit)
+
+@router.get("/near", response_model=List[schemas.AlertOut])
+async def read_alerts_near(
+    response: Response,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(settings.ALERTS_NEAR_DEFAULT_RADIUS_KM, gt=0, le=settings.ALERTS_NEAR_MAX_RADIUS_KM),
+    db: AsyncSession = Depends(deps.get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+) -> Any:
+    """
+    Community alerts around (lat, lng), newest first. The area covered is every ~5 km
+    geohash tile the radius touches. Pass the `X-Next-Cursor` response header back as
+    `cursor` (with the same lat, lng and radius) for older alerts.
+    """
+    query = near_alerts_query(lat, lng, radius_km, cursor, limit)
+    result = await db.execute(query)
+    alerts = finish_page(response, result.scalars().all(), limit, key=lambda a: (a.created_at, a.id))
+    counter_buffer.overlay("alert_upvotes", alerts, "upvotes")
+    return json_list(schemas.AlertListAdapter, alerts, response)
+
+@router.get("/stream")
+async def stream_alerts(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(settings.ALERTS_NEAR_DEFAULT_RADIUS_KM, gt=0, le=settings.ALERTS_NEAR_MAX_RADIUS_KM),
+) -> Any:
+    """
+    Server-Sent Events stream of new alerts around (lat, lng), covering the same tiles
+    as `/alerts/near`. Each alert arrives as an `alert` event carrying an AlertOut.
+    An `overflow` event means the client fell behind and was disconnected: refetch
+    `/alerts/near` and reconnect.
+    """
+    return StreamingResponse(
+        alert_stream.events(geohash_cells_within(lat, lng, radius_km)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.post("/report", response_model=schemas.AlertOut)
-def create_alert(
+async def create_alert(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     alert_in: schemas.AlertCreate,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Report a new community alert.
+    Report a new community alert. A report matching a recent nearby incident of the
+    same type is merged into it: the response then carries that `incident_id`.
     """
     alert = CommunityAlert(
         user_id=current_user.id,
@@ -38,9 +120,47 @@ def create_alert(
         severity=alert_in.severity,
         location_name=alert_in.location_name,
         lat=alert_in.lat,
-        lng=alert_in.lng
+        lng=alert_in.lng,
+        geotile=geohash(alert_in.lat, alert_in.lng) if alert_in.lat is not None and alert_in.lng is not None else None,
     )
+    match = await alert_clusterer.find_incident(db, alert)
+    if match is not None:
+        await alert_clusterer.attach(db, alert, match)
     db.add(alert)
-    db.commit()
-    db.refresh(alert)
+    await db.commit()
+    await db.refresh(alert)
+    response_cache.invalidate("alerts")
+    # Subscribers upsert by id: a merged report re-sends its incident with the new count
+    incident = await db.get(CommunityAlert, match.incident_id, populate_existing=True) if match else alert
+    alert_stream.publish_alert(incident)
     return alert
+
+@router.post("/{alert_id}/upvote", response_model=dict)
+async def upvote_alert(
+    alert_id: uuid.UUID,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Upvote an alert (or the incident it was merged into), once per user. The count is
+    buffered and written in the next batched flush; `upvotes` includes it already.
+    """
+    result = await db.execute(
+        select(CommunityAlert.id, CommunityAlert.incident_id, CommunityAlert.upvotes).where(CommunityAlert.id == alert_id)
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    target_id, upvotes = row.id, row.upvotes
+    if row.incident_id is not None:
+        target_id = row.incident_id
+        upvotes = await db.scalar(select(CommunityAlert.upvotes).where(CommunityAlert.id == target_id))
+    voted = await db.scalar(
+        insert(AlertUpvote).values(alert_id=target_id, user_id=current_user.id)
+        .on_conflict_do_nothing()
+        .returning(AlertUpvote.alert_id)
+    )
+    await db.commit()
+    if voted is not None:
+        counter_buffer.increment("alert_upvotes", target_id)
+    return {"id": target_id, "upvotes": counter_buffer.live("alert_upvotes", target_id, upvotes)}
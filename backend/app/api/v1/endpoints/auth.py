@@ -6,6 +6,7 @@ from sqlalchemy.future import select
 from jose import jwt, JWTError
 
 from app.api import deps
+from app.api.deps import get_current_user # Routers import it from here; single cached implementation
 from app.core import security
 from app.core.config import settings
 from app.models.user import User
@@ -32,7 +33,7 @@ async def register(
         phone=user_in.phone,
         email=user_in.email,
         full_name=user_in.full_name,
-        password_hash=security.get_password_hash(user_in.password),
+        password_hash=await security.get_password_hash(user_in.password),
         user_type=user_in.user_type,
     )
     db.add(user)
@@ -55,7 +56,7 @@ async def login(
     )
     user = result.scalars().first()
     
-    if not user or not security.verify_password(user_in.password, user.password_hash):
+    if not user or not await security.verify_password(user_in.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email/phone or password",
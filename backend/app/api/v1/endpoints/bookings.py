@@ -1,32 +1,25 @@
-from typing import Any, Optional
-from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException
+import uuid
+from typing import Any, List, Optional
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 from pydantic import BaseModel
 from pydantic.fields import Field
 
 from app.api import deps
 from app.models.user import User
 from app.models.booking import Booking
+from app.models.provider import Provider
 from app.api.v1.endpoints.auth import get_current_user
+from app.core import response_cache
+from app.core.pagination import keyset, finish_page
+from app.core.serialization import json_list
+from app.schemas.booking import BookingCreate, BookingResponse, BookingListSchema, BookingListAdapter
+from app.services.trust_score import trust_score_service
 
 router = APIRouter()
 
-class BookingCreate(BaseModel):
-    provider_id: str
-    service_id: Optional[str] = None # Or just service name/type
-    service_name: str
-    scheduled_date: datetime
-    quoted_price: float
-    payment_plan: str = "full" # 'full' or 'installments'
-
-class BookingResponse(BaseModel):
-    id: str
-    status: str
-    total_amount: float
-    amount_due_now: float
-    message: str
-
 @router.post("/", response_model=BookingResponse)
 async def create_booking(
     booking_in: BookingCreate,
@@ -77,62 +70,96 @@ async def create_booking(
         "message": start_msg
     }
 
-from typing import List
-from sqlalchemy.orm import selectinload
-from sqlalchemy import desc
-
-class BookingListSchema(BaseModel):
-    id: str
-    provider_name: str
-    service_name: str
-    date: str
-    amount: str
-    status: str
-    image: str
-
 @router.get("/", response_model=List[BookingListSchema])
 async def get_my_bookings(
+    response: Response,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
 ) -> Any:
     """
-    Get current user's bookings.
+    Get current user's bookings, latest scheduled first.
+    Pass the `X-Next-Cursor` response header back as `cursor` for the next page.
     """
+    # Only the columns the list shows: no ORM hydration, one indexed join
     stmt = (
-        select(Booking)
+        select(
+            Booking.id, Booking.scheduled_date, Booking.quoted_price, Booking.status,
+            Provider.business_name,
+        )
+        .outerjoin(Provider, Provider.user_id == Booking.provider_id)
         .where(Booking.consumer_id == current_user.id)
-        .options(selectinload(Booking.provider).selectinload("user")) # Load provider and their user info (for name)
-        .order_by(desc(Booking.scheduled_date))
     )
+    # Served by ix_bookings_consumer_scheduled (consumer_id, scheduled_date, id)
+    stmt = keyset(stmt, [Booking.scheduled_date, Booking.id], cursor, limit)
     result = await db.execute(stmt)
-    bookings = result.scalars().all()
-    
-    # Transform to schema
-    # Note: Provider model needs to have a way to get name. 
-    # Usually provider.user.full_name or similar if Provider links to User.
-    # We will assume a simple mapping for now, handling potential missing relations safely.
-    
-    booking_list = []
-    for b in bookings:
-        # Mocking provider name/image extraction if relation is complex
-        # In a real scenario, we'd access b.provider.business_name or b.provider.user.full_name
-        # For this MVP step, we'll try to get it if loaded, else fallback.
-        
-        provider_name = "Service Provider"
-        if b.provider:
-             # Assuming Provider model has 'business_name' or we use the linked User's name
-             # Let's check if we can access attributes. For safety in this iteration, we use defaults 
-             # allowing the frontend to verify 'Real Data' flow even if names are generic initially.
-             provider_name = getattr(b.provider, "business_name", "Provider") 
+    rows = finish_page(response, result.all(), limit, key=lambda r: (r.scheduled_date, r.id))
 
+    booking_list = []
+    for row in rows:
+        provider_name = row.business_name or "Service Provider"
         booking_list.append({
-            "id": str(b.id),
+            "id": str(row.id),
             "provider_name": provider_name,
             "service_name": "Service", # We should store service name in booking or derive it
-            "date": b.scheduled_date.strftime("%Y-%m-%d %H:%M"),
-            "amount": f"KES {b.quoted_price}",
-            "status": b.status,
+            "date": row.scheduled_date.strftime("%Y-%m-%d %H:%M"),
+            "amount": f"KES {row.quoted_price}",
+            "status": row.status,
             "image": f"https://api.dicebear.com/7.x/avataaars/svg?seed={provider_name}"
         })
-        
-    return booking_list
+
+    return json_list(BookingListAdapter, booking_list, response)
+
+BOOKING_STATUSES = {"pending_payment", "confirmed", "declined", "in_progress", "completed", "cancelled"}
+
+# Allowed moves per party: (role, current status) -> statuses it may set.
+# declined, completed and cancelled are final, so a finished booking can't be
+# flipped back and forth to move the provider's Trust Score.
+BOOKING_TRANSITIONS = {
+    ("provider", "quoted"): {"confirmed", "declined"},
+    ("provider", "pending_payment"): {"confirmed", "declined"},
+    ("provider", "confirmed"): {"in_progress", "cancelled"},
+    ("provider", "in_progress"): {"completed"},
+    ("consumer", "quoted"): {"cancelled"},
+    ("consumer", "pending_payment"): {"cancelled"},
+    ("consumer", "confirmed"): {"cancelled"},
+}
+
+class BookingStatusUpdate(BaseModel):
+    status: str
+
+@router.patch("/{booking_id}/status", response_model=dict)
+async def update_booking_status(
+    booking_id: uuid.UUID,
+    status_in: BookingStatusUpdate,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Move a booking to a new status (provider or consumer on the booking, per BOOKING_TRANSITIONS).
+    Feeds completion, cancellation and response-time stats into the provider's Trust Score.
+    """
+    if status_in.status not in BOOKING_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Unknown status '{status_in.status}'")
+
+    # Row lock so concurrent transitions see a consistent old status
+    result = await db.execute(select(Booking).where(Booking.id == booking_id).with_for_update())
+    booking = result.scalars().first()
+    if not booking or current_user.id not in (booking.provider_id, booking.consumer_id):
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    old_status = booking.status
+    role = "provider" if current_user.id == booking.provider_id else "consumer"
+    if status_in.status not in BOOKING_TRANSITIONS.get((role, old_status), set()):
+        other = "consumer" if role == "provider" else "provider"
+        if status_in.status in BOOKING_TRANSITIONS.get((other, old_status), set()):
+            raise HTTPException(status_code=403, detail=f"Only the {other} can mark this booking {status_in.status}")
+        raise HTTPException(status_code=409, detail=f"Cannot move a {old_status} booking to {status_in.status}")
+
+    booking.status = status_in.status
+    await trust_score_service.record_booking_transition(db, booking, old_status, booking.status)
+    await db.commit()
+    response_cache.invalidate("providers")
+
+    return {"id": str(booking.id), "status": booking.status}
@@ -1,24 +1,31 @@
-from typing import Any, List
+from typing import Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.api import deps
 from app.models.user import User
 from app.models.job_request import JobRequest
 from app.api.v1.endpoints.auth import get_current_user
+from app.services.provider_locator import provider_locator
 
 router = APIRouter()
 
+# How many nearby providers an SOS is fanned out to
+EMERGENCY_NOTIFY_COUNT = 5
+
 class EmergencyRequest(BaseModel):
     category: str
     location_description: str
-    # Latitude/Longitude would go here in real app
+    lat: Optional[float] = Field(None, ge=-90, le=90)
+    lng: Optional[float] = Field(None, ge=-180, le=180)
+    suburb: Optional[str] = None
 
 class EmergencyResponse(BaseModel):
     job_id: str
     message: str
     providers_notified: int
+    provider_ids: List[str] = []
 
 @router.post("/request", response_model=EmergencyResponse)
 async def create_emergency_request(
@@ -36,7 +43,9 @@ async def create_emergency_request(
         category=request.category,
         title=f"SOS: {request.category}",
         description=f"Emergency request at {request.location_description}",
-        suburb="Unknown", # Would be derived from lat/long
+        lat=request.lat,
+        lng=request.lng,
+        suburb=request.suburb or request.location_description,
         urgency="emergency",
         is_emergency=True,
         emergency_fee=500.0, # Fixed fee or calculated
@@ -47,12 +56,14 @@ async def create_emergency_request(
     await db.commit()
     await db.refresh(job)
     
-    # 2. Mock finding nearest providers
-    # In real app: POSTGIS query to find within 5km
-    providers_found_count = 3
+    # 2. Nearest available providers whose operating radius covers the caller (in-memory index)
+    nearby = []
+    if request.lat is not None and request.lng is not None:
+        nearby = provider_locator.nearest(request.category, request.lat, request.lng, k=EMERGENCY_NOTIFY_COUNT)
     
     return {
         "job_id": str(job.id),
         "message": f"SOS Signal sent! Finding nearest {request.category} experts...",
-        "providers_notified": providers_found_count
+        "providers_notified": len(nearby),
+        "provider_ids": [p.provider_id for p in nearby],
     }
@@ -1,30 +1,38 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 from app.api import deps
+from app.core import response_cache
+from app.core.pagination import keyset, finish_page
+from app.core.serialization import json_list
 from app.models.jifunze import DIYGuide
 from app.schemas import jifunze as schemas
 from app.models.user import User
 
-router = APIRouter()
+router = APIRouter(route_class=response_cache.CachedRoute)
 
 @router.get("/guides", response_model=List[schemas.DIYGuideOut])
-def read_guides(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+@response_cache.cache_response("guides", ttl_seconds=300)
+async def read_guides(
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=100),
 ) -> Any:
     """
-    Retrieve DIY guides.
+    Retrieve DIY guides in title order.
+    Pass the `X-Next-Cursor` response header back as `cursor` for the next page.
     """
-    # Simply return all guides for now
-    guides = db.query(DIYGuide).offset(skip).limit(limit).all()
-    return guides
+    sort_keys = [DIYGuide.title, DIYGuide.id]
+    result = await db.execute(keyset(select(DIYGuide), sort_keys, cursor, limit, descending=False))
+    guides = finish_page(response, result.scalars().all(), limit, key=lambda g: (g.title, g.id))
+    return json_list(schemas.DIYGuideListAdapter, guides, response)
 
 @router.post("/guides", response_model=schemas.DIYGuideOut)
-def create_guide(
+async def create_guide(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     guide_in: schemas.DIYGuideCreate,
     # In a real app, restrict this to admin users
     current_user: User = Depends(deps.get_current_active_user),
@@ -42,6 +50,7 @@ def create_guide(
         estimated_time_minutes=guide_in.estimated_time_minutes
     )
     db.add(guide)
-    db.commit()
-    db.refresh(guide)
+    await db.commit()
+    await db.refresh(guide)
+    response_cache.invalidate("guides")
     return guide
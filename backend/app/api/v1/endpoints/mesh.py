@@ -1,46 +1,48 @@
+import uuid
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
 from app.api import deps
 from app.models.mesh import MeshTeam, MeshMember
 from app.models.user import User
 from app.schemas import mesh as schemas
+from app.services.mesh_membership import mesh_membership
 
 router = APIRouter()
 
 @router.get("/my-teams", response_model=List[schemas.MeshTeam])
-def read_my_teams(
-    db: Session = Depends(deps.get_db),
+async def read_my_teams(
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
     """
-    Retrieve teams the current user belongs to (as leader or member).
+    Retrieve teams the current user belongs to (as leader or member), newest first.
     """
-    # Simple query: find teams where user is leader OR member
-    # For now, let's just return teams where they are leader for simplicity or join on members
-    # A better query would be:
-    # teams = db.query(MeshTeam).join(MeshMember).filter(MeshMember.user_id == current_user.id).all()
-    # But since we defined backref 'led_teams', we can start there:
-    
-    # Get teams they lead
-    led_teams = db.query(MeshTeam).filter(MeshTeam.leader_id == current_user.id).all()
-    
-    # Get teams they are a member of
-    member_teams = db.query(MeshTeam).join(MeshMember).filter(
-        MeshMember.user_id == current_user.id,
-        MeshMember.status == "Active"
-    ).all()
-    
-    # Combine and deduplicate
-    all_teams = list({t.id: t for t in (led_teams + member_teams)}.values())
-    return all_teams
+    # Led + active-member team ids come from one UNION query, cached per user
+    team_ids = await mesh_membership.team_ids(db, current_user.id)
+    if not team_ids:
+        return []
+
+    # Members are serialized in the response, so load them up front: one IN query for
+    # every team on the page instead of a lazy load per team
+    result = await db.execute(
+        select(MeshTeam)
+        .where(MeshTeam.id.in_(team_ids))
+        .options(selectinload(MeshTeam.members))
+        .order_by(MeshTeam.created_at.desc(), MeshTeam.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
 
 @router.post("/create", response_model=schemas.MeshTeam)
-def create_team(
+async def create_team(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     team_in: schemas.MeshTeamCreate,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -54,8 +56,7 @@ def create_team(
         leader_id=current_user.id,
     )
     db.add(team)
-    db.commit()
-    db.refresh(team)
+    await db.flush()
     
     # Add creator as a member too (Leader role)
     member = MeshMember(
@@ -65,15 +66,19 @@ def create_team(
         status="Active"
     )
     db.add(member)
-    db.commit()
+    await db.commit()
+    mesh_membership.invalidate(current_user.id)
     
-    return team
+    result = await db.execute(
+        select(MeshTeam).where(MeshTeam.id == team.id).options(selectinload(MeshTeam.members))
+    )
+    return result.scalars().one()
 
 @router.post("/{team_id}/invite", response_model=schemas.MeshMemberSchema)
-def invite_member(
+async def invite_member(
     *,
-    db: Session = Depends(deps.get_db),
-    team_id: str,
+    db: AsyncSession = Depends(deps.get_db),
+    team_id: uuid.UUID,
     invite: schemas.TeamInvite,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -81,33 +86,70 @@ def invite_member(
     Invite a user to the team by email.
     """
     # 1. Verify team exists and user is leader
-    team = db.query(MeshTeam).filter(MeshTeam.id == team_id).first()
+    result = await db.execute(select(MeshTeam).where(MeshTeam.id == team_id))
+    team = result.scalars().first()
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     if team.leader_id != current_user.id:
         raise HTTPException(status_code=403, detail="Only the team leader can invite members")
         
     # 2. Find user by email
-    user_to_invite = db.query(User).filter(User.email == invite.email).first()
+    result = await db.execute(select(User).where(User.email == invite.email))
+    user_to_invite = result.scalars().first()
     if not user_to_invite:
         raise HTTPException(status_code=404, detail="User with this email not found")
         
-    # 3. Check if already member
-    existing = db.query(MeshMember).filter(
-        MeshMember.team_id == team_id, 
-        MeshMember.user_id == user_to_invite.id
-    ).first()
-    if existing:
+    # 3. Check if already member; someone who left is re-invited on their old row
+    result = await db.execute(
+        select(MeshMember).where(
+            MeshMember.team_id == team_id,
+            MeshMember.user_id == user_to_invite.id
+        )
+    )
+    member = result.scalars().first()
+    if member and member.status in ("Active", "Invited"):
          raise HTTPException(status_code=400, detail="User is already in the team")
 
     # 4. Add member
-    member = MeshMember(
-        team_id=team_id,
-        user_id=user_to_invite.id,
-        role=invite.role,
-        status="Invited" # They would need to accept, but for now we auto-add or set as Invited
-    )
+    if member is None:
+        member = MeshMember(team_id=team_id, user_id=user_to_invite.id)
+    member.role = invite.role
+    member.status = "Invited" # They would need to accept, but for now we auto-add or set as Invited
     db.add(member)
-    db.commit()
-    db.refresh(member)
+    await db.commit()
+    mesh_membership.invalidate(user_to_invite.id)
+    await db.refresh(member)
+    return member
+
+@router.post("/{team_id}/leave", response_model=schemas.MeshMemberSchema)
+async def leave_team(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    team_id: uuid.UUID,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Leave a team (or decline an invitation to it). The leader cannot leave their own team.
+    """
+    result = await db.execute(
+        select(MeshMember)
+        .join(MeshTeam)
+        .where(
+            MeshMember.team_id == team_id,
+            MeshMember.user_id == current_user.id,
+            MeshMember.status.in_(("Active", "Invited")),
+        )
+        .add_columns(MeshTeam.leader_id)
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="You are not in this team")
+    member, leader_id = row
+    if leader_id == current_user.id:
+        raise HTTPException(status_code=400, detail="The team leader cannot leave the team")
+
+    member.status = "Left"
+    await db.commit()
+    mesh_membership.invalidate(current_user.id)
+    await db.refresh(member)
     return member
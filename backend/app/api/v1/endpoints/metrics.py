@@ -0,0 +1,68 @@
+from typing import Any
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core.cache import cache_stats
+from app.core.security import password_hasher
+from app.services.alert_stream import alert_stream
+from app.services.counters import counter_buffer
+from app.services.inference import inference_engine
+from app.services.payment_queue import payment_queue
+from app.services.payment_reconciler import payment_reconciler
+from app.models.user import User
+
+router = APIRouter()
+
+@router.get("/caches", response_model=dict)
+async def read_cache_metrics(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Hit/miss/eviction counters for this worker's in-process caches.
+    """
+    return cache_stats()
+
+@router.get("/password-hashing", response_model=dict)
+async def read_password_hashing_metrics(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Concurrency, queue depth and timing of this worker's bcrypt pool.
+    """
+    return password_hasher.stats()
+
+@router.get("/payments", response_model=dict)
+async def read_payment_queue_metrics(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    STK push queue depth, outcomes and retries, and reconciliation batching, for this worker.
+    """
+    return {"stk_push": payment_queue.stats(), "reconciliation": payment_reconciler.stats()}
+
+@router.get("/inference", response_model=dict)
+async def read_inference_metrics(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Scan model micro-batching: batch sizes, queue wait and model latency for this worker.
+    """
+    return inference_engine.stats()
+
+@router.get("/alert-stream", response_model=dict)
+async def read_alert_stream_metrics(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Live alert subscribers, fan-out and slow consumers dropped by this worker.
+    """
+    return alert_stream.stats()
+
+@router.get("/counters", response_model=dict)
+async def read_counter_metrics(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Buffered vote counters: pending rows, flushes and batches retried for this worker.
+    """
+    return counter_buffer.stats()
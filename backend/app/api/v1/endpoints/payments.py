@@ -1,29 +1,125 @@
+import logging
+import secrets
+import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.schemas.payment import PaymentCreate, PaymentResponse
-from app.services.mpesa import mpesa_service
-from app.core.security import get_current_user
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.api import deps
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.models.booking import Booking
+from app.models.payment import PaymentRequest, OPEN_PAYMENT_STATUSES
 from app.models.user import User
+from app.schemas.payment import PaymentCreate, PaymentRequestOut, PaymentCallbackBody
+from app.services.payment_queue import payment_queue
+from app.services.payment_reconciler import Confirmation, payment_reconciler, parse_transaction_date
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/stk-push", response_model=PaymentResponse)
+@router.post("/stk-push", response_model=PaymentRequestOut, status_code=status.HTTP_202_ACCEPTED)
 async def initiate_payment(
     payment_in: PaymentCreate,
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(get_current_user),
 ):
     """
     Initiate M-Pesa STK Push payment.
-    Use this endpoint to trigger a payment request to the user's phone.
+    Returns immediately with a `queued` request; the push is sent in the background and
+    settled by Daraja's callback. Poll GET /payments/{id} for the outcome. Repeating the
+    call while a push for the booking is in flight returns that same request.
     """
-    try:
-        response = await mpesa_service.initiate_stk_push(
-            phone_number=payment_in.phone_number,
-            amount=payment_in.amount,
-            booking_id=payment_in.booking_id
+    result = await db.execute(select(Booking.consumer_id).where(Booking.id == payment_in.booking_id))
+    consumer_id = result.scalar()
+    if consumer_id is None or consumer_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+
+    stmt = insert(PaymentRequest).values(
+        id=uuid.uuid4(),
+        booking_id=payment_in.booking_id,
+        user_id=current_user.id,
+        phone_number=payment_in.phone_number,
+        amount=payment_in.amount,
+        status="queued",
+        attempts=0,
+    ).on_conflict_do_nothing(
+        index_elements=[PaymentRequest.booking_id],
+        index_where=PaymentRequest.status.in_(OPEN_PAYMENT_STATUSES),
+    ).returning(PaymentRequest)
+    payment = (await db.execute(stmt)).scalars().first()
+    if payment is None:
+        result = await db.execute(
+            select(PaymentRequest).where(
+                PaymentRequest.booking_id == payment_in.booking_id,
+                PaymentRequest.status.in_(OPEN_PAYMENT_STATUSES),
+            )
         )
-        return response
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Payment initiation failed: {str(e)}"
+        return result.scalars().first()
+    await db.commit()
+
+    payment_queue.enqueue(payment.id)
+    return payment
+
+@router.post("/callback", response_model=dict)
+async def payment_callback(
+    callback_in: PaymentCallbackBody,
+    token: str = "",
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Daraja STK callback. Successful payments go through the reconciliation buffer, which
+    settles the request and the booking balance in batches; failures settle the request
+    directly. Always acknowledged so Daraja does not keep retrying a callback we cannot use.
+    """
+    # Fail closed: only the local mock (no Daraja credentials, no token) accepts unauthenticated callbacks
+    expected = settings.MPESA_CALLBACK_TOKEN
+    if (expected or settings.MPESA_CONSUMER_KEY) and not secrets.compare_digest(token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid callback token")
+
+    callback = callback_in.Body.stkCallback
+    receipt = callback.metadata("MpesaReceiptNumber")
+    if callback.ResultCode == 0 and receipt:
+        # Returns once the confirmation is committed
+        await payment_reconciler.submit(Confirmation(
+            receipt=str(receipt),
+            checkout_request_id=callback.CheckoutRequestID,
+            amount=float(callback.metadata("Amount") or 0),
+            phone_number=str(callback.metadata("PhoneNumber") or "") or None,
+            transaction_date=parse_transaction_date(callback.metadata("TransactionDate")),
+        ))
+        return {"ResultCode": 0, "ResultDesc": "Accepted"}
+
+    result = await db.execute(
+        update(PaymentRequest)
+        .where(
+            PaymentRequest.checkout_request_id == callback.CheckoutRequestID,
+            # Any in-flight push with this id; one that beat the worker's write of the
+            # checkout id matches nothing here and is released by the expiry sweep
+            PaymentRequest.status.in_(("sending", "sent")),
         )
+        .values(status="failed", result_code=callback.ResultCode, result_desc=callback.ResultDesc)
+        .returning(PaymentRequest.id)
+    )
+    if result.first() is None:
+        logger.warning("stk callback for unknown or settled checkout %s", callback.CheckoutRequestID)
+    await db.commit()
+    return {"ResultCode": 0, "ResultDesc": "Accepted"}
+
+@router.get("/{payment_id}", response_model=PaymentRequestOut)
+async def read_payment(
+    payment_id: uuid.UUID,
+    db: AsyncSession = Depends(deps.get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Status of an STK push started by the current user.
+    """
+    result = await db.execute(select(PaymentRequest).where(PaymentRequest.id == payment_id))
+    payment = result.scalars().first()
+    if not payment or payment.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Payment not found")
+    return payment
@@ -1,30 +1,40 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import or_
 
 from app.api import deps
 from app.api.v1.endpoints import auth
+from app.core import response_cache
+from app.core.pagination import keyset, finish_page
+from app.core.serialization import json_list
 from app.models.provider import Provider
 from app.models.user import User
-from app.schemas.provider import ProviderCreate, ProviderResponse, ProviderUpdate
+from app.schemas.provider import ProviderCreate, ProviderResponse, ProviderUpdate, ProviderListAdapter
+from app.services.provider_search import provider_search_service
+from app.services.provider_locator import provider_locator
 
-router = APIRouter()
+router = APIRouter(route_class=response_cache.CachedRoute)
 
 @router.get("/", response_model=List[ProviderResponse])
+@response_cache.cache_response("providers", ttl_seconds=60)
 async def read_providers(
-    db: AsyncSession = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
     search: Optional[str] = None,
     location: Optional[str] = None,
     category: Optional[str] = None,
 ) -> Any:
     """
     Retrieve providers with optional search filters.
+    When `search` is given, results are ranked by text relevance blended with trust score,
+    otherwise by trust score. Pass the `X-Next-Cursor` response header back as `cursor`
+    to fetch the next page.
     """
     query = select(Provider)
+    sort_key = Provider.trust_score
     
     if category:
         query = query.filter(Provider.trade_category.ilike(f"%{category}%"))
@@ -36,25 +46,22 @@ async def read_providers(
         query = query.filter(Provider.service_locations.contains([location]))
         
     if search:
-        query = query.filter(
-            or_(
-                Provider.business_name.ilike(f"%{search}%"),
-                Provider.trade_category.ilike(f"%{search}%"),
-                Provider.verification_notes.ilike(f"%{search}%")
-            )
-        )
+        # Indexed full-text + trigram match (see ProviderSearchService)
+        query = provider_search_service.filter(query, search)
+        sort_key = provider_search_service.score(search)
         
-    query = query.offset(skip).limit(limit)
+    # (sort_key, user_id) keyset; the browse path is served by ix_providers_trust_score_user_id
+    query = keyset(query.add_columns(sort_key), [sort_key, Provider.user_id], cursor, limit)
     result = await db.execute(query)
-    providers = result.scalars().all()
+    rows = finish_page(response, result.all(), limit, key=lambda row: (row[1], row[0].user_id))
     
     # Map to response (handling the derived is_verified logic here or in schema config)
     results = []
-    for p in providers:
+    for p, _ in rows:
         p.is_verified = p.verification_status == "verified"
         results.append(p)
         
-    return results
+    return json_list(ProviderListAdapter, results, response)
 
 @router.post("/", response_model=ProviderResponse)
 async def create_provider_profile(
@@ -82,6 +89,8 @@ async def create_provider_profile(
         specialization_tags=provider_in.specialization_tags,
         service_locations=provider_in.service_locations,
         operating_radius_km=provider_in.operating_radius_km,
+        lat=provider_in.lat,
+        lng=provider_in.lng,
         id_number=provider_in.id_number,
         kra_pin=provider_in.kra_pin,
         mpesa_business_number=provider_in.mpesa_business_number,
@@ -89,12 +98,15 @@ async def create_provider_profile(
     db.add(provider)
     await db.commit()
     await db.refresh(provider)
+    provider_locator.upsert_provider(provider)
+    response_cache.invalidate("providers")
     
     # Update user type? Optional, but good practice
     if current_user.user_type != "provider":
         current_user.user_type = "provider"
         db.add(current_user)
         await db.commit()
+        deps.invalidate_user(current_user.id)
 
     provider.is_verified = provider.verification_status == "verified"
     return provider
@@ -115,10 +127,49 @@ async def read_own_provider_profile(
     provider.is_verified = provider.verification_status == "verified"
     return provider
 
+# Fields only an admin may change through PATCH /providers/me
+ADMIN_ONLY_FIELDS = {"verification_status", "verification_notes"}
+# Fields that may be explicitly cleared with null
+NULLABLE_FIELDS = {"lat", "lng", "mpesa_business_number", "verification_notes"}
+
+@router.patch("/me", response_model=ProviderResponse)
+async def update_own_provider_profile(
+    *,
+    db: AsyncSession = Depends(deps.get_db),
+    provider_in: ProviderUpdate,
+    current_user: User = Depends(auth.get_current_user),
+) -> Any:
+    """
+    Update the current user's provider profile (location, availability, services...).
+    Location and availability changes reach the emergency SOS index immediately.
+    """
+    updates = {
+        field: value for field, value in provider_in.model_dump(exclude_unset=True).items()
+        if value is not None or field in NULLABLE_FIELDS
+    }
+    if ADMIN_ONLY_FIELDS & updates.keys() and current_user.user_type != "admin":
+        raise HTTPException(status_code=403, detail="Only an admin can change verification fields")
+
+    result = await db.execute(select(Provider).where(Provider.user_id == current_user.id))
+    provider = result.scalars().first()
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider profile not found")
+
+    for field, value in updates.items():
+        setattr(provider, field, value)
+    await db.commit()
+    await db.refresh(provider)
+    provider_locator.upsert_provider(provider)
+    response_cache.invalidate("providers")
+
+    provider.is_verified = provider.verification_status == "verified"
+    return provider
+
 @router.get("/{provider_id}", response_model=ProviderResponse)
+@response_cache.cache_response("providers", ttl_seconds=60)
 async def read_provider_by_id(
     provider_id: str, # UUID passed as str
-    db: AsyncSession = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
 ) -> Any:
     """
     Get a specific provider by ID (user_id).
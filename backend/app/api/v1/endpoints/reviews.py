@@ -1,12 +1,17 @@
+import uuid
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_current_user
-# from app.api.deps import get_db # Commented out as DB is down, using mock response
+from sqlalchemy.future import select
+from app.api.deps import get_current_user, get_db
+from app.core import response_cache
 from app.schemas.review import ReviewCreate, ReviewResponse
 from app.services.trust_score import trust_score_service
+from app.services.counters import counter_buffer
+from app.models.booking import Booking
+from app.models.review import Review
 from app.models.user import User
-from datetime import datetime
-import uuid
+from app.models.vote import ReviewHelpfulVote
 
 router = APIRouter()
 
@@ -14,29 +19,70 @@ router = APIRouter()
 async def create_review(
     review_in: ReviewCreate,
     current_user: User = Depends(get_current_user),
-    # db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Submit a review for a provider.
-    Triggers a Trust Score recount.
+    Updates the provider's Trust Score incrementally (no recount over all reviews).
     """
-    # 1. Save dummy review (DB skipped)
-    # db_review = Review(**review_in.model_dump(), user_id=current_user.id)
-    # db.add(db_review)
-    # await db.commit()
-    
-    # 2. Recalculate Trust Score
-    # new_score = await trust_score_service.calculate_score(review_in.provider_id, db)
-    # provider.trust_score = new_score
-    # await db.commit()
-    
-    # Return mock response
+    result = await db.execute(select(Booking).where(Booking.id == review_in.booking_id))
+    booking = result.scalars().first()
+    if not booking or booking.consumer_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    if booking.provider_id != review_in.provider_id:
+        raise HTTPException(status_code=400, detail="Booking is not with this provider")
+
+    result = await db.execute(select(Review.id).where(Review.booking_id == review_in.booking_id))
+    if result.first():
+        raise HTTPException(status_code=400, detail="This booking has already been reviewed")
+
+    # 1. Save review
+    db_review = Review(
+        booking_id=review_in.booking_id,
+        reviewer_id=current_user.id,
+        reviewee_id=review_in.provider_id,
+        overall_rating=review_in.rating,
+        comment=review_in.comment,
+    )
+    db.add(db_review)
+    await db.flush()
+
+    # 2. Fold the rating into the provider's running aggregates and Trust Score
+    await trust_score_service.record_review(db, review_in.provider_id, review_in.rating)
+    await db.commit()
+    await db.refresh(db_review)
+    response_cache.invalidate("providers")
+
     return ReviewResponse(
-        id=uuid.uuid4(),
+        id=db_review.id,
         provider_id=review_in.provider_id,
         user_id=current_user.id,
-        rating=review_in.rating,
-        comment=review_in.comment,
-        booking_id=review_in.booking_id,
-        created_at=datetime.utcnow()
+        rating=db_review.overall_rating,
+        comment=db_review.comment,
+        booking_id=db_review.booking_id,
+        created_at=db_review.created_at,
+    )
+
+@router.post("/{review_id}/helpful", response_model=dict)
+async def mark_review_helpful(
+    review_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Mark a review as helpful, once per user. The count is buffered and written in the
+    next batched flush; `helpful_count` includes it already.
+    """
+    result = await db.execute(select(Review.helpful_count).where(Review.id == review_id))
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
+    voted = await db.scalar(
+        insert(ReviewHelpfulVote).values(review_id=review_id, user_id=current_user.id)
+        .on_conflict_do_nothing()
+        .returning(ReviewHelpfulVote.review_id)
     )
+    await db.commit()
+    if voted is not None:
+        counter_buffer.increment("review_helpful", review_id)
+    return {"id": review_id, "helpful_count": counter_buffer.live("review_helpful", review_id, row.helpful_count)}
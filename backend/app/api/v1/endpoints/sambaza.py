@@ -1,14 +1,17 @@
-from typing import Any, List
+import uuid
+from typing import Any, List, Optional
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 from pydantic import BaseModel
 
 from app.api import deps
-from app.models.sambaza import SambazaGroup
+from app.models.sambaza import SambazaGroup, SambazaParticipant
 from app.api.v1.endpoints.auth import get_current_user
+from app.core.pagination import keyset, finish_page
 from app.models.user import User
+from app.services.sambaza import sambaza_service
 
 router = APIRouter()
 
@@ -51,6 +54,8 @@ async def create_sambaza(
     )
     
     db.add(group)
+    await db.flush()
+    await sambaza_service.add_organizer(db, group, current_user.id)
     await db.commit()
     await db.refresh(group)
     
@@ -67,14 +72,26 @@ async def create_sambaza(
 
 @router.get("/active", response_model=List[SambazaResponse])
 async def list_active_sambazas(
-    db: AsyncSession = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_read_db),
+    suburb: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
 ) -> Any:
     """
-    List active Sambaza groups.
+    List open Sambaza groups (optionally in one suburb), soonest to expire first.
+    Pass the `X-Next-Cursor` response header back as `cursor` for the next page.
     """
-    # In real app, filter by user suburb. For now, list all active.
-    result = await db.execute(select(SambazaGroup).where(SambazaGroup.status == "forming"))
-    groups = result.scalars().all()
+    # Served by ix_sambaza_groups_status_expires_at; expired rows are closed by the sweeper
+    query = select(SambazaGroup).where(
+        SambazaGroup.status == "forming",
+        SambazaGroup.expires_at > func.now(),
+    )
+    if suburb:
+        query = query.where(func.lower(SambazaGroup.suburb) == suburb.lower())
+    sort_keys = [SambazaGroup.expires_at, SambazaGroup.id]
+    result = await db.execute(keyset(query, sort_keys, cursor, limit, descending=False))
+    groups = finish_page(response, result.scalars().all(), limit, key=lambda g: (g.expires_at, g.id))
     
     return [
         {
@@ -92,32 +109,30 @@ async def list_active_sambazas(
 
 @router.post("/{group_id}/join", response_model=dict)
 async def join_sambaza(
-    group_id: str,
+    group_id: uuid.UUID,
     db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(get_current_user),
 ) -> Any:
     """
     Join an existing Sambaza group.
+    One round trip: records the participant and bumps the count/discount tier atomically.
     """
-    result = await db.execute(select(SambazaGroup).where(SambazaGroup.id == group_id))
-    group = result.scalars().first()
-    
-    if not group:
-        raise HTTPException(status_code=404, detail="Group not found")
-        
-    # Logic to add user to participant list (omitted, assuming just count increment for MVP)
-    group.participant_count += 1
-    
-    # Update discount tier logic (simplified)
-    ratio = group.participant_count / group.target_count
-    if ratio >= 1.0:
-        group.discount_tier = "25%"
-        group.status = "active" # Ready to execute
-    elif ratio >= 0.5:
-        group.discount_tier = "15%"
-    elif ratio >= 0.2:
-        group.discount_tier = "5%"
-        
+    joined = await sambaza_service.join(db, group_id, current_user.id)
+    if joined is None:
+        # Slow path only for the error message
+        result = await db.execute(select(SambazaGroup).where(SambazaGroup.id == group_id))
+        group = result.scalars().first()
+        if not group:
+            raise HTTPException(status_code=404, detail="Group not found")
+        result = await db.execute(
+            select(SambazaParticipant.user_id).where(
+                SambazaParticipant.group_id == group_id,
+                SambazaParticipant.user_id == current_user.id,
+            )
+        )
+        if result.first():
+            raise HTTPException(status_code=400, detail="You have already joined this group")
+        raise HTTPException(status_code=400, detail="This group is no longer open")
     await db.commit()
     
-    return {"message": f"Successfully joined {group.title}! Current discount: {group.discount_tier}"}
+    return {"message": f"Successfully joined {joined.title}! Current discount: {joined.discount_tier}"}
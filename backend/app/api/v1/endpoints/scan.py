@@ -1,22 +1,21 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from app.core.config import settings
+from app.core.uploads import LimitedUploadRoute, limit_upload, hash_upload
 from app.schemas.scan import ScanResult
-from app.services.scan_service import ScanService
-import shutil
-import os
+from app.services.scan_service import scan_service
 
-router = APIRouter()
+router = APIRouter(route_class=LimitedUploadRoute)
 
 @router.post("/analyze", response_model=ScanResult)
+@limit_upload(settings.SCAN_MAX_UPLOAD_BYTES)
 async def analyze_image(file: UploadFile = File(...)):
     """
     Upload an image for AI diagnosis.
     Returns detected issue, price estimate, and materials.
+    Re-uploading the same image returns the cached result.
     """
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
 
-    # In a real app, save the file or process bytes directly
-    # For now, we just pass the filename to our mock service
-    
-    result = await ScanService.analyze_image(file.filename)
-    return result
+    digest = await hash_upload(file, settings.SCAN_MAX_UPLOAD_BYTES)
+    return await scan_service.analyze(file.file, digest)
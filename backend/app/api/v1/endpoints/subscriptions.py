@@ -1,6 +1,7 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 from app.api import deps
 from app.models.subscription import MaintenanceSubscription
 from app.schemas import subscription as schemas
@@ -9,9 +10,9 @@ from app.models.user import User
 router = APIRouter()
 
 @router.post("/create", response_model=schemas.SubscriptionOut)
-def create_subscription(
+async def create_subscription(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
     sub_in: schemas.SubscriptionCreate,
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -27,17 +28,19 @@ def create_subscription(
         status="Active"
     )
     db.add(sub)
-    db.commit()
-    db.refresh(sub)
+    await db.commit()
+    await db.refresh(sub)
     return sub
 
 @router.get("/me", response_model=List[schemas.SubscriptionOut])
-def read_my_subscriptions(
-    db: Session = Depends(deps.get_db),
+async def read_my_subscriptions(
+    db: AsyncSession = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     List my subscriptions.
     """
-    subs = db.query(MaintenanceSubscription).filter(MaintenanceSubscription.user_id == current_user.id).all()
-    return subs
+    result = await db.execute(
+        select(MaintenanceSubscription).where(MaintenanceSubscription.user_id == current_user.id)
+    )
+    return result.scalars().all()
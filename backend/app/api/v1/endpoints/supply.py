@@ -3,8 +3,9 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from app.api import deps
+from app.core import response_cache
 
-router = APIRouter()
+router = APIRouter(route_class=response_cache.CachedRoute)
 
 class SupplyStoreSchema(BaseModel):
     id: str
@@ -16,6 +17,7 @@ class SupplyStoreSchema(BaseModel):
     logo_url: str | None
 
 @router.get("/stores", response_model=List[SupplyStoreSchema])
+@response_cache.cache_response("supply_stores", ttl_seconds=600)
 async def list_supply_stores(
     category: str | None = None,
     location: str | None = None
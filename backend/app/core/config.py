@@ -30,10 +30,112 @@ class Settings(BaseSettings):
             return v
         return f"postgresql+asyncpg://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}/{values.get('POSTGRES_DB')}"
 
+    # Read replica for safe GET handlers (unset = everything on the primary).
+    # Locally, a second Postgres container or a second SQLite file
+    # (sqlite+aiosqlite:///./replica.db) can stand in.
+    DATABASE_REPLICA_URL: str | None = None
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_SECONDS: float = 2.0
+    # How long a client's reads stick to the primary after it writes
+    READ_YOUR_WRITES_SECONDS: int = 10
+    READ_YOUR_WRITES_MAX_USERS: int = 100_000
+
+    # Cached GET responses per namespace (see core/response_cache.py)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1_000
+
+    # Sambaza expiry sweeper
+    SAMBAZA_SWEEP_INTERVAL_SECONDS: int = 60
+    SAMBAZA_SWEEP_BATCH_SIZE: int = 1_000
+    SAMBAZA_SWEEP_MAX_BATCHES: int = 100
+
+    # Maintenance subscription scheduler
+    SUBSCRIPTION_SCHEDULER_INTERVAL_SECONDS: int = 30
+    SUBSCRIPTION_SCHEDULER_BATCH_SIZE: int = 1_000
+    SUBSCRIPTION_SCHEDULER_MAX_BATCHES: int = 100
+
+    # M-Pesa Daraja (STK push). Without a consumer key a local mock is used;
+    # point MPESA_BASE_URL at tests/fake_daraja.py for load tests.
+    MPESA_BASE_URL: str = "https://sandbox.safaricom.co.ke"
+    MPESA_CONSUMER_KEY: str = ""
+    MPESA_CONSUMER_SECRET: str = ""
+    MPESA_SHORTCODE: str = "174379"
+    MPESA_PASSKEY: str = ""
+    MPESA_CALLBACK_URL: str = "http://localhost:8000/api/v1/payments/callback"
+    MPESA_CALLBACK_TOKEN: str = "" # Callbacks must carry ?token=<value>; required with Daraja credentials
+
+    @validator("MPESA_CALLBACK_TOKEN")
+    def require_callback_token(cls, v: str, values: dict) -> str:
+        # Callbacks credit bookings: with real Daraja credentials they must be authenticated
+        if values.get("MPESA_CONSUMER_KEY") and not v:
+            raise ValueError("MPESA_CALLBACK_TOKEN must be set when MPESA_CONSUMER_KEY is")
+        return v
+
+    MPESA_TIMEOUT_SECONDS: float = 10.0
+    MPESA_MAX_CONNECTIONS: int = 50
+    MPESA_WORKERS: int = 8
+    MPESA_QUEUE_SIZE: int = 10_000
+    MPESA_MAX_ATTEMPTS: int = 5
+    MPESA_BACKOFF_BASE_SECONDS: float = 0.5
+    MPESA_BACKOFF_MAX_SECONDS: float = 10.0
+    MPESA_REQUEUE_INTERVAL_SECONDS: int = 30
+    # Pushes still `sending`/`sent` this long after their last update are expired,
+    # freeing the booking for a new push (covers lost callbacks and the local mock)
+    MPESA_PUSH_EXPIRY_SECONDS: int = 180
+
+    # M-Pesa confirmation reconciliation (group-committed batches)
+    RECONCILE_BATCH_SIZE: int = 1_000
+    RECONCILE_FLUSH_INTERVAL_MS: int = 50
+    RECONCILE_APPLY_INTERVAL_SECONDS: int = 10
+
+    # Scan uploads and the content-hash result cache
+    SCAN_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    SCAN_RESULT_CACHE_MAX_SIZE: int = 5_000
+    SCAN_RESULT_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Scan model inference: micro-batches run in a process pool (see services/inference.py)
+    SCAN_MODEL: str = "app.services.inference:ByteHistogramModel" # "module:factory"
+    SCAN_INFERENCE_WORKERS: int = 2
+    SCAN_BATCH_MAX_SIZE: int = 16
+    SCAN_BATCH_MAX_WAIT_MS: float = 5.0
+    SCAN_INFERENCE_MAX_QUEUE: int = 256
+
+    # Near-me alert feed (radius is rounded up to whole ~5 km geohash tiles)
+    ALERTS_NEAR_DEFAULT_RADIUS_KM: float = 3.0
+    ALERTS_NEAR_MAX_RADIUS_KM: float = 15.0
+
+    # Duplicate report clustering: same type, this close, this recent and this similar in wording
+    ALERT_CLUSTER_RADIUS_KM: float = 0.5
+    ALERT_CLUSTER_WINDOW_MINUTES: int = 180
+    ALERT_CLUSTER_MIN_SIMILARITY: float = 0.3 # Jaccard over title + description words
+    ALERT_CLUSTER_MAX_CANDIDATES: int = 20
+
+    # Live alert push over SSE (per worker)
+    ALERT_STREAM_BUFFER_SIZE: int = 32 # Frames a client may fall behind before it is dropped
+    ALERT_STREAM_HEARTBEAT_SECONDS: float = 25.0
+
+    # Write-combined vote counters (alert upvotes, review helpful votes)
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 2.0
+
+    # Mesh team ids per user (per worker). A change drops the entry only on the worker that
+    # made it; other workers can serve the old set for up to the TTL
+    MESH_MEMBERSHIP_CACHE_MAX_SIZE: int = 10_000
+    MESH_MEMBERSHIP_CACHE_TTL_SECONDS: int = 30
+
+    # Emergency SOS provider index
+    PROVIDER_LOCATOR_REFRESH_SECONDS: int = 300
+
     # JWT
     SECRET_KEY: str = "CHANGE_THIS_SECRET_KEY_IN_PRODUCTION" 
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # bcrypt runs on its own thread pool; sign-ins beyond workers + queue get a 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Authenticated-user cache (per worker)
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: int = 60
     
     class Config:
         case_sensitive = True
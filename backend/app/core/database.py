@@ -7,6 +7,15 @@ AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Read replica for safe GET traffic; falls back to the primary when not configured
+replica_engine = (
+    create_async_engine(settings.DATABASE_REPLICA_URL, echo=True)
+    if settings.DATABASE_REPLICA_URL else engine
+)
+ReplicaSessionLocal = sessionmaker(
+    replica_engine, class_=AsyncSession, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 async def get_db():
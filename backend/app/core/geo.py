@@ -0,0 +1,104 @@
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 110.574
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Great-circle distance between two points in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def km_per_degree_lng(lat: float) -> float:
+    return 111.320 * math.cos(math.radians(lat))
+
+
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Alert tiles: precision 5 cells are ~4.9 km x 4.9 km at the equator
+GEOTILE_PRECISION = 5
+# Upper bound on tiles per query; a 15 km radius needs ~50 at the equator
+GEOTILE_MAX_CELLS = 256
+
+
+def geohash(lat: float, lng: float, precision: int = GEOTILE_PRECISION) -> str:
+    """
+    Standard base32 geohash of a point (longitude bit first).
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                value, lng_lo = value * 2 + 1, mid
+            else:
+                value, lng_hi = value * 2, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                value, lat_lo = value * 2 + 1, mid
+            else:
+                value, lat_hi = value * 2, mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_cell_degrees(precision: int) -> Tuple[float, float]:
+    """
+    (lat, lng) edge lengths in degrees of a geohash cell.
+    """
+    total_bits = 5 * precision
+    return 180.0 / 2 ** (total_bits // 2), 360.0 / 2 ** ((total_bits + 1) // 2)
+
+
+def geohash_cells_within(
+    lat: float, lng: float, radius_km: float, precision: int = GEOTILE_PRECISION, max_cells: int = GEOTILE_MAX_CELLS,
+) -> List[str]:
+    """
+    Geohash cells of `precision` that intersect the circle of `radius_km` around
+    (lat, lng), nearest first and at most `max_cells` of them. Longitudes wrap, so
+    circles over the antimeridian or a pole list each cell once.
+    """
+    lat = min(max(lat, -90.0), 90.0)
+    lat_step, lng_step = geohash_cell_degrees(precision)
+    columns = round(360.0 / lng_step)
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    # Columns either side of the centre the circle can reach at its most poleward latitude.
+    # Distance grows with the column offset along a row, so a cell `max_cells` columns out
+    # can never make the cut: that bounds the scan near the poles.
+    edge_lat = min(abs(lat) + dlat, 90.0)
+    reach = math.ceil(radius_km / km_per_degree_lng(edge_lat) / lng_step) + 1 if edge_lat < 90.0 else columns
+    reach = min(reach, max_cells, columns // 2)
+    centre_col = math.floor((lng + 180) / lng_step)
+
+    cells = {}
+    for i in range(math.floor((lat - dlat + 90) / lat_step), math.floor((lat + dlat + 90) / lat_step) + 1):
+        cell_lat_lo = i * lat_step - 90
+        if cell_lat_lo >= 90 or cell_lat_lo + lat_step <= -90:
+            continue
+        near_lat = min(max(lat, cell_lat_lo), cell_lat_lo + lat_step)
+        for j in range(centre_col - reach, centre_col + reach + 1):
+            cell_lng_lo = (j % columns) * lng_step - 180
+            # Closest point of the cell to the centre, taking the shorter way round
+            offset = (lng - cell_lng_lo + 180) % 360 - 180
+            near_lng = lng - offset + min(max(offset, 0.0), lng_step)
+            distance = haversine_km(lat, lng, near_lat, near_lng)
+            if distance <= radius_km:
+                key = (i, j % columns)
+                cells[key] = min(distance, cells.get(key, distance))
+    nearest = sorted(cells, key=cells.get)[:max_cells]
+    return [geohash((i + 0.5) * lat_step - 90, (j + 0.5) * lng_step - 180, precision) for i, j in nearest]
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from jose import jwt, JWTError
+from sqlalchemy import text
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import engine, replica_engine
+
+logger = logging.getLogger(__name__)
+
+# Set on responses to writes; while present, reads from that client go to the primary.
+# Covers anonymous browser clients; Bearer clients are tracked in `recent_writers`.
+LAST_WRITE_COOKIE = "mtaa_last_write"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Replica is caught up when it has replayed everything it received; otherwise lag is
+# the age of the last replayed transaction.
+PG_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaHealth:
+    """
+    Cached replica lag, probed at most every REPLICA_LAG_CHECK_SECONDS.
+    An unreachable or lagging replica routes reads back to the primary.
+    """
+
+    def __init__(self):
+        self.lag_seconds: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return replica_engine is not engine
+
+    async def usable(self) -> bool:
+        if not self.configured:
+            return False
+        if time.monotonic() - self._checked_at > settings.REPLICA_LAG_CHECK_SECONDS and not self._lock.locked():
+            async with self._lock:
+                await self._probe()
+        return self.lag_seconds is not None and self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+
+    async def _probe(self) -> None:
+        try:
+            async with replica_engine.connect() as conn:
+                if conn.dialect.name == "postgresql":
+                    self.lag_seconds = float((await conn.execute(PG_LAG_SQL)).scalar())
+                else:
+                    # e.g. a second SQLite file standing in for a replica locally
+                    await conn.execute(text("SELECT 1"))
+                    self.lag_seconds = 0.0
+        except Exception:
+            logger.warning("replica probe failed; reading from primary", exc_info=True)
+            self.lag_seconds = None
+        self._checked_at = time.monotonic()
+
+
+replica_health = ReplicaHealth()
+
+
+# Users (token subjects) who wrote within READ_YOUR_WRITES_SECONDS, for clients that
+# don't send cookies back (mobile apps, cross-origin SPAs). Per worker.
+recent_writers = TTLCache("recent-writers", settings.READ_YOUR_WRITES_MAX_USERS, settings.READ_YOUR_WRITES_SECONDS)
+
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    """
+    User id of a valid Bearer token in an Authorization header, else None.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+
+def wrote_recently(request: Request) -> bool:
+    subject = token_subject(request.headers.get("authorization"))
+    if subject is not None and recent_writers.get(subject):
+        return True
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.READ_YOUR_WRITES_SECONDS
+
+
+class ReadYourWritesMiddleware:
+    """
+    Records successful non-GET requests against the Bearer token's user and stamps the
+    response with a short-lived cookie, so the same client's follow-up reads are served
+    by the primary until the replica has caught up.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_health.configured:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                subject = token_subject(Headers(scope=scope).get("authorization"))
+                if subject is not None:
+                    recent_writers.set(subject, True)
+                cookie = (
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={settings.READ_YOUR_WRITES_SECONDS}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
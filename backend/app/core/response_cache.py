@@ -0,0 +1,111 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+# Response headers replayed from the cache alongside the body
+CACHED_HEADERS = ("content-type", NEXT_CURSOR_HEADER.lower())
+
+_caches: Dict[str, TTLCache] = {}
+_generations: Dict[str, int] = {}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Tuple[Tuple[str, str], ...]
+
+
+def cache_response(namespace: str, ttl_seconds: float):
+    """
+    Mark a GET endpoint as cacheable under `namespace`. Only takes effect on routers
+    created with `APIRouter(route_class=CachedRoute)`; writes to the underlying data
+    must call `invalidate(namespace)` after they commit.
+    """
+    if namespace not in _caches:
+        _caches[namespace] = TTLCache(f"response:{namespace}", settings.RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds)
+        _generations[namespace] = 0
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.response_cache_namespace = namespace
+        return endpoint
+    return decorator
+
+
+def invalidate(namespace: str) -> None:
+    """
+    Drop every cached response in `namespace` (this worker only; other workers
+    catch up within the namespace TTL).
+    """
+    if namespace not in _caches:
+        return
+    _generations[namespace] += 1
+    _caches[namespace].clear()
+
+
+def _cache_key(request: Request) -> Tuple:
+    # Same filters in any order (and blank params) share one entry
+    params = tuple(sorted((k, v) for k, v in request.query_params.multi_items() if v != ""))
+    return (request.url.path, params)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+class CachedRoute(APIRoute):
+    """
+    Serves endpoints marked with `cache_response` from pre-serialized bytes, with an
+    ETag so clients that already hold the current body get an empty 304. Misses are
+    read from the primary (see `deps.get_read_db`).
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        namespace = getattr(self.endpoint, "response_cache_namespace", None)
+        if namespace is None:
+            return handler
+        cache = _caches[namespace]
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+
+            key = _cache_key(request)
+            entry = cache.get(key)
+            if entry is None:
+                generation = _generations[namespace]
+                # The miss fills the entry every client is served for the TTL, so it must not
+                # come from a replica still behind the write that just invalidated it
+                request.state.read_from_primary = True
+                response = await handler(request)
+                body = getattr(response, "body", None)
+                if response.status_code != 200 or body is None:
+                    return response
+                entry = CachedResponse(
+                    body=body,
+                    etag='"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest(),
+                    headers=tuple((k, v) for k, v in response.headers.items() if k in CACHED_HEADERS),
+                )
+                # Skip the store if a write invalidated the namespace while we were querying
+                if generation == _generations[namespace]:
+                    cache.set(key, entry)
+
+            headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+            if _etag_matches(request, entry.etag):
+                return Response(status_code=304, headers=headers)
+            headers.update(entry.headers)
+            return Response(content=entry.body, headers=headers)
+
+        return cached_handler
@@ -1,6 +1,11 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, Union
 from jose import jwt
+from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -17,8 +22,76 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so a hash (~100-300 ms of CPU, GIL released)
+    never blocks the event loop. At most `max_workers` hashes run at once and up to
+    `max_queue` wait; beyond that callers get a 503 instead of an ever-growing backlog.
+    """
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.hash_seconds = 0.0
+
+    async def run(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in attempts in progress, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+            self.peak_queued = max(self.peak_queued, self.in_flight - self.max_workers)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, fn, time.perf_counter(), *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _timed(self, fn: Callable, submitted_at: float, *args) -> Any:
+        started_at = time.perf_counter()
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.wait_seconds += started_at - submitted_at
+                self.hash_seconds += finished_at - started_at
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.in_flight - self.running,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+                "avg_hash_ms": round(self.hash_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            }
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.run(pwd_context.hash, password)
@@ -0,0 +1,20 @@
+from typing import Any, Iterable
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_list(adapter: TypeAdapter, items: Iterable[Any], response: Response) -> Response:
+    """
+    Validate `items` (ORM objects, rows or dicts) and render them straight to JSON bytes
+    with a precompiled `TypeAdapter`, skipping FastAPI's response_model pass, which
+    re-validates, builds an intermediate list of dicts and then runs it through a JSON
+    encoder. Keep `response_model` on the route for the OpenAPI schema.
+
+    Headers the endpoint set on its injected `response` (e.g. X-Next-Cursor) are
+    carried over, since FastAPI does not merge them into a returned Response.
+    """
+    body = adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+    out = Response(content=body, media_type="application/json")
+    out.headers.raw.extend(response.headers.raw)
+    return out
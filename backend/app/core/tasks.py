@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+logger = logging.getLogger(__name__)
+
+_tasks: List[asyncio.Task] = []
+
+
+def start_periodic(name: str, interval_seconds: float, job: Callable[[], Awaitable[object]]) -> asyncio.Task:
+    """
+    Run `job` every `interval_seconds` in the background for the life of the worker.
+    Failures are logged and retried on the next tick, never propagated.
+    """
+    async def loop() -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("periodic task %s failed", name)
+
+    task = asyncio.create_task(loop(), name=name)
+    _tasks.append(task)
+    return task
+
+
+def start_worker(name: str, job: Callable[[], Awaitable[object]]) -> asyncio.Task:
+    """
+    Run a long-lived coroutine (e.g. a queue consumer) for the life of the worker.
+    """
+    task = asyncio.create_task(job(), name=name)
+    _tasks.append(task)
+    return task
+
+
+async def stop_all() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
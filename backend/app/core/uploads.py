@@ -0,0 +1,97 @@
+import hashlib
+import shutil
+import tempfile
+from typing import BinaryIO, Callable
+
+from fastapi import HTTPException, Request, Response, UploadFile, status
+from fastapi.routing import APIRoute
+from starlette.types import Message
+
+CHUNK_SIZE = 64 * 1024
+# Multipart boundaries, part headers and any small form fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload exceeds {max_bytes // (1024 * 1024)} MB",
+    )
+
+
+def limit_upload(max_bytes: int):
+    """
+    Cap the request body of an upload endpoint. Only takes effect on routers created
+    with `APIRouter(route_class=LimitedUploadRoute)`; the endpoint should still pass
+    each file through `hash_upload`, which enforces the exact cap on the file itself.
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.max_upload_bytes = max_bytes
+        return endpoint
+    return decorator
+
+
+class LimitedUploadRoute(APIRoute):
+    """
+    Rejects uploads over the endpoint's cap before FastAPI parses (and spools) the
+    multipart body: up front on a declared Content-Length, and otherwise (chunked or
+    understated bodies) as soon as the bytes actually received pass it.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        max_bytes = getattr(self.endpoint, "max_upload_bytes", None)
+        if max_bytes is None:
+            return handler
+
+        limit = max_bytes + MULTIPART_OVERHEAD_BYTES
+
+        async def limited_handler(request: Request) -> Response:
+            declared = request.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > limit:
+                raise _too_large(max_bytes)
+
+            received = 0
+            receive = request.receive
+
+            async def counting_receive() -> Message:
+                nonlocal received
+                message = await receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > limit:
+                        raise _too_large(max_bytes)
+                return message
+
+            return await handler(Request(request.scope, counting_receive, request._send))
+
+        return limited_handler
+
+
+async def hash_upload(upload: UploadFile, max_bytes: int) -> str:
+    """
+    Stream `upload` in chunks, enforcing `max_bytes`, and return its sha256 hex digest.
+
+    Starlette already spools multipart files to a temporary file on disk past 1 MB,
+    so the image never has to sit in memory whole; the file is rewound for the reader.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await upload.read(CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        digest.update(chunk)
+    await upload.seek(0)
+    return digest.hexdigest()
+
+
+def spool_to_path(file: BinaryIO) -> str:
+    """
+    Copy `file` (from its current position) into a named temporary file in CHUNK_SIZE
+    pieces and return its path, so another process can read it without the bytes being
+    held in memory or pickled here. Blocking: run it in a thread. The caller deletes it.
+    """
+    with tempfile.NamedTemporaryFile(prefix="upload-", delete=False) as spooled:
+        shutil.copyfileobj(file, spooled, CHUNK_SIZE)
+    return spooled.name
@@ -1,13 +1,30 @@
+import logging
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.database import AsyncSessionLocal
+from app.core import tasks
+from app.core.replica import ReadYourWritesMiddleware
+from app.services.provider_locator import provider_locator
+from app.services.sambaza import sambaza_service
+from app.services.subscription_scheduler import subscription_scheduler
+from app.services.payment_queue import payment_queue
+from app.services.payment_reconciler import payment_reconciler
+from app.services.inference import inference_engine
+from app.services.counters import counter_buffer
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     description="MtaaTrust API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Set all CORS enabled origins
@@ -18,7 +35,57 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
+    )
+
+app.add_middleware(ReadYourWritesMiddleware)
+
+@app.on_event("startup")
+async def start_background_services():
+    try:
+        await provider_locator.load(AsyncSessionLocal)
+    except Exception:
+        # Boot without the index (SOS lookups find nothing); the periodic reload fills it
+        logger.exception("provider locator initial load failed")
+    tasks.start_periodic(
+        "provider-locator-refresh",
+        settings.PROVIDER_LOCATOR_REFRESH_SECONDS,
+        lambda: provider_locator.load(AsyncSessionLocal),
     )
+    tasks.start_periodic(
+        "sambaza-expiry-sweeper",
+        settings.SAMBAZA_SWEEP_INTERVAL_SECONDS,
+        lambda: sambaza_service.close_expired(
+            AsyncSessionLocal, settings.SAMBAZA_SWEEP_BATCH_SIZE, settings.SAMBAZA_SWEEP_MAX_BATCHES,
+        ),
+    )
+    await payment_queue.start(AsyncSessionLocal)
+    tasks.start_periodic(
+        "stk-push-requeue", settings.MPESA_REQUEUE_INTERVAL_SECONDS, payment_queue.requeue_pending,
+    )
+    tasks.start_periodic("stk-push-expiry", settings.MPESA_REQUEUE_INTERVAL_SECONDS, payment_queue.expire_stale)
+    payment_reconciler.start(AsyncSessionLocal)
+    inference_engine.start()
+    counter_buffer.start(AsyncSessionLocal)
+    tasks.start_periodic("counter-flush", settings.COUNTER_FLUSH_INTERVAL_SECONDS, counter_buffer.flush)
+    tasks.start_periodic(
+        "payment-reconciliation", settings.RECONCILE_APPLY_INTERVAL_SECONDS, payment_reconciler.apply_pending,
+    )
+    tasks.start_periodic(
+        "subscription-scheduler",
+        settings.SUBSCRIPTION_SCHEDULER_INTERVAL_SECONDS,
+        lambda: subscription_scheduler.run_due(
+            AsyncSessionLocal, settings.SUBSCRIPTION_SCHEDULER_BATCH_SIZE, settings.SUBSCRIPTION_SCHEDULER_MAX_BATCHES,
+        ),
+    )
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await tasks.stop_all()
+    # Votes still buffered (or caught mid-flush by the cancel above)
+    await counter_buffer.flush()
+    await payment_queue.close()
+    await inference_engine.close()
 
 @app.get("/")
 def root():
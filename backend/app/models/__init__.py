@@ -1,5 +1,6 @@
 from .user import User
 from .provider import Provider
+from .provider_stats import ProviderStats
 from .job_request import JobRequest
 from .booking import Booking
 from .review import Review
@@ -11,3 +12,8 @@ from .mesh import MeshTeam, MeshMember
 from .subscription import MaintenanceSubscription
 from .alert import CommunityAlert
 from .jifunze import DIYGuide
+from .sambaza import SambazaGroup, SambazaParticipant
+from .payment import PaymentRequest
+from .payment_confirmation import PaymentConfirmation
+from .counter_flush import CounterFlush
+from .vote import AlertUpvote, ReviewHelpfulVote
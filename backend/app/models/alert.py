@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -7,6 +7,15 @@ from app.core.database import Base
 
 class CommunityAlert(Base):
     __tablename__ = "community_alerts"
+    __table_args__ = (
+        # Feeds only read incidents (incident_id IS NULL); duplicate reports stay out of both indexes.
+        # Keyset pagination of the feed: ORDER BY created_at DESC, id DESC
+        Index("ix_community_alerts_incidents_created_at_id", "created_at", "id",
+              postgresql_where=text("incident_id IS NULL")),
+        # Near-me feed and incident matching: newest incidents per geohash tile
+        Index("ix_community_alerts_incidents_geotile_created_at_id", "geotile", "created_at", "id",
+              postgresql_where=text("incident_id IS NULL")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
@@ -18,7 +27,12 @@ class CommunityAlert(Base):
     # In a real app we'd use PostGIS geometry types
     lat = Column(Float, nullable=True)
     lng = Column(Float, nullable=True)
+    geotile = Column(String(5), nullable=True) # geohash(lat, lng, GEOTILE_PRECISION), set on write
     
+    # Set on duplicate reports: the alert (incident) they were merged into, see AlertClusterer
+    incident_id = Column(UUID(as_uuid=True), ForeignKey("community_alerts.id"), nullable=True, index=True)
+    report_count = Column(Integer, default=1, server_default="1", nullable=False) # Reports merged into this incident
+
     upvotes = Column(Integer, default=0)
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
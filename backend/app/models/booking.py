@@ -1,15 +1,20 @@
 import uuid
-from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Time, func
+from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Time, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # "My bookings" history: WHERE consumer_id = ? ORDER BY scheduled_date DESC, id DESC
+        Index("ix_bookings_consumer_scheduled", "consumer_id", "scheduled_date", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_request_id = Column(UUID(as_uuid=True), ForeignKey("job_requests.id"), nullable=True)
-    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.user_id"), nullable=False)
+    subscription_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_subscriptions.id"), nullable=True) # Generated by the subscription scheduler
+    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.user_id"), nullable=False, index=True)
     consumer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     
     # Financials
@@ -31,6 +36,7 @@ class Booking(Base):
     scheduled_time = Column(Time, nullable=False)
     actual_start = Column(DateTime(timezone=True), nullable=True)
     actual_end = Column(DateTime(timezone=True), nullable=True)
+    responded_at = Column(DateTime(timezone=True), nullable=True) # Provider's first accept/decline
     
     # Status
     status = Column(String, default="quoted", index=True)
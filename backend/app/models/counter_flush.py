@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+class CounterFlush(Base):
+    """
+    Ledger of counter batches already applied (see CounterBuffer). A batch retried
+    after an unknown outcome finds its id here and is skipped, so a vote is never
+    counted twice. Rows are pruned after a day.
+    """
+    __tablename__ = "counter_flushes"
+
+    batch_id = Column(UUID(as_uuid=True), primary_key=True)
+    flushed_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -1,10 +1,13 @@
 import uuid
-from sqlalchemy import Column, String, Text, Integer, ARRAY
+from sqlalchemy import Column, String, Text, Integer, ARRAY, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
 
 class DIYGuide(Base):
     __tablename__ = "diy_guides"
+    __table_args__ = (
+        Index("ix_diy_guides_title_id", "title", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String, index=True, nullable=False)
@@ -9,6 +9,7 @@ class JobRequest(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     consumer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    subscription_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_subscriptions.id"), nullable=True) # Generated by the subscription scheduler
     category = Column(String, nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
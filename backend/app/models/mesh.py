@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -12,7 +12,7 @@ class MeshTeam(Base):
     name = Column(String, index=True)
     description = Column(String, nullable=True)
     specialization = Column(String, nullable=True) # e.g. "Construction", "Events"
-    leader_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    leader_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -21,9 +21,13 @@ class MeshTeam(Base):
 
 class MeshMember(Base):
     __tablename__ = "mesh_members"
+    __table_args__ = (
+        # "Teams this user is active in": index-only scan
+        Index("ix_mesh_members_user_id_status_team_id", "user_id", "status", "team_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    team_id = Column(UUID(as_uuid=True), ForeignKey("mesh_teams.id"))
+    team_id = Column(UUID(as_uuid=True), ForeignKey("mesh_teams.id"), index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     role = Column(String, default="Member") # "Leader", "Admin", "Member"
     status = Column(String, default="Active") # "Active", "Invited", "Left"
@@ -0,0 +1,41 @@
+import uuid
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+# Requests still in flight; at most one per booking (see ix_payment_requests_open_booking)
+OPEN_PAYMENT_STATUSES = ("queued", "sending", "sent")
+
+class PaymentRequest(Base):
+    """
+    One STK push, from the moment the API accepts it until Daraja's callback settles it.
+    queued -> sending -> sent -> completed | failed | expired
+    """
+    __tablename__ = "payment_requests"
+    __table_args__ = (
+        # Idempotency: repeat taps for the same booking reuse the open request
+        Index(
+            "ix_payment_requests_open_booking", "booking_id", unique=True,
+            postgresql_where=text("status IN ('queued', 'sending', 'sent')"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    phone_number = Column(String, nullable=False)
+    amount = Column(Float, nullable=False)
+
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+
+    # Daraja identifiers and outcome
+    merchant_request_id = Column(String, nullable=True)
+    checkout_request_id = Column(String, nullable=True, unique=True)
+    result_code = Column(Integer, nullable=True)
+    result_desc = Column(String, nullable=True)
+    mpesa_receipt = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
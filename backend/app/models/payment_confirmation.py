@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, Float, ForeignKey, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+class PaymentConfirmation(Base):
+    """
+    Successful M-Pesa payments as reported by Daraja callbacks, keyed by receipt and
+    unique per checkout so duplicate callbacks collapse to one row. Rows with
+    `applied_at` NULL are the reconciliation backlog (see PaymentReconciler);
+    `booking_id` is filled in once the payment has been applied to a booking's balance.
+    """
+    __tablename__ = "payment_confirmations"
+    __table_args__ = (
+        # Reconciliation backlog scan, oldest first
+        Index("ix_payment_confirmations_unapplied", "received_at", postgresql_where=text("applied_at IS NULL")),
+    )
+
+    receipt = Column(String, primary_key=True) # MpesaReceiptNumber
+    checkout_request_id = Column(String, nullable=False, unique=True, index=True) # one confirmation per STK push
+    amount = Column(Float, nullable=False)
+    phone_number = Column(String, nullable=True)
+    transaction_date = Column(DateTime(timezone=True), nullable=True)
+
+    booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id"), nullable=True)
+    received_at = Column(DateTime(timezone=True), server_default=func.now())
+    applied_at = Column(DateTime(timezone=True), nullable=True)
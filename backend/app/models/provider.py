@@ -1,14 +1,35 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Boolean, Date, Text, ARRAY, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Boolean, Date, Text, ARRAY, JSON, Computed, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 # Import association model to ensure it's registered
 from app.models.provider_badge import ProviderBadge
 from app.models.badge import Badge
 
+# Weighted full-text document used by provider search: name > category > notes.
+# The 'simple' config avoids English stemming on Swahili/Sheng business names.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', coalesce(business_name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(trade_category, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(verification_notes, '')), 'C')"
+)
+
 class Provider(Base):
     __tablename__ = "providers"
+    __table_args__ = (
+        # Keyset pagination of the directory: ORDER BY trust_score DESC, user_id DESC
+        Index("ix_providers_trust_score_user_id", "trust_score", "user_id"),
+        Index("ix_providers_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_providers_business_name_trgm", "business_name",
+            postgresql_using="gin", postgresql_ops={"business_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_providers_trade_category_trgm", "trade_category",
+            postgresql_using="gin", postgresql_ops={"trade_category": "gin_trgm_ops"},
+        ),
+    )
 
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
     business_name = Column(String, nullable=False)
@@ -26,13 +47,16 @@ class Provider(Base):
     # Location
     service_locations = Column(ARRAY(String), default=[]) # Array of suburbs
     operating_radius_km = Column(Integer, default=10)
+    lat = Column(Float, nullable=True) # Base location, indexed in memory by ProviderLocator
+    lng = Column(Float, nullable=True)
+    is_available = Column(Boolean, default=True) # Taking new / emergency jobs
     
     # Subscription
     subscription_tier = Column(String, default="free")
     subscription_expiry = Column(Date, nullable=True)
     
     # Stats
-    trust_score = Column(Integer, default=0, index=True)
+    trust_score = Column(Integer, nullable=False, default=0, server_default="0", index=True) # Keyset sort key: never NULL
     rehire_rate = Column(Float, default=0.0)
     response_time_avg = Column(Integer, default=0) # minutes
     jobs_completed = Column(Integer, default=0)
@@ -44,6 +68,9 @@ class Provider(Base):
     # Status
     verification_status = Column(String, default="pending", index=True)
     verification_notes = Column(Text, nullable=True)
+
+    # Search (generated by Postgres, never written by the app)
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True)
     
     user = relationship("User", backref="provider_profile")
     badges = relationship("Badge", secondary="provider_badges", backref="providers")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+class ProviderStats(Base):
+    """
+    Running aggregates behind Provider.trust_score, maintained incrementally by
+    TrustScoreService so scoring never scans `reviews` or `bookings`.
+    """
+    __tablename__ = "provider_stats"
+
+    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.user_id"), primary_key=True)
+
+    # Reviews & vouches
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    vouch_weight_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+
+    # Bookings
+    bookings_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    bookings_cancelled = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Time from booking creation to the provider's first response
+    response_minutes_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    response_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
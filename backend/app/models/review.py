@@ -10,7 +10,7 @@ class Review(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id"), unique=True)
     reviewer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    reviewee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    reviewee_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), index=True)
     
     # Ratings (1-5 scale)
     overall_rating = Column(Integer, nullable=False)
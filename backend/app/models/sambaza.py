@@ -1,10 +1,14 @@
 import uuid
-from sqlalchemy import Column, String, Integer, DateTime, func, Float
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, func, Float
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
 
 class SambazaGroup(Base):
     __tablename__ = "sambaza_groups"
+    __table_args__ = (
+        # Expiry sweeper and the open-groups listing: WHERE status = ? AND expires_at <op> now()
+        Index("ix_sambaza_groups_status_expires_at", "status", "expires_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -23,3 +27,13 @@ class SambazaGroup(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class SambazaParticipant(Base):
+    """
+    Who joined which group; the composite key makes each join count once.
+    """
+    __tablename__ = "sambaza_participants"
+
+    group_id = Column(UUID(as_uuid=True), ForeignKey("sambaza_groups.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True, index=True)
+    joined_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -14,6 +14,10 @@ class Frequency(str, enum.Enum):
 
 class MaintenanceSubscription(Base):
     __tablename__ = "maintenance_subscriptions"
+    __table_args__ = (
+        # Scheduler's due scan: WHERE status = 'Active' AND next_run_date <= now ORDER BY next_run_date
+        Index("ix_maintenance_subscriptions_status_next_run", "status", "next_run_date"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
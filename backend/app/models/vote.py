@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+class AlertUpvote(Base):
+    """
+    Who upvoted which incident; the composite key makes each user's upvote count once.
+    """
+    __tablename__ = "alert_upvotes"
+
+    alert_id = Column(UUID(as_uuid=True), ForeignKey("community_alerts.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ReviewHelpfulVote(Base):
+    """
+    Who marked which review helpful; the composite key makes each user's vote count once.
+    """
+    __tablename__ = "review_helpful_votes"
+
+    review_id = Column(UUID(as_uuid=True), ForeignKey("reviews.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
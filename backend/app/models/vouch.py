@@ -7,7 +7,7 @@ class Vouch(Base):
     __tablename__ = "vouches"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.user_id"))
+    provider_id = Column(UUID(as_uuid=True), ForeignKey("providers.user_id"), index=True)
     voucher_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id"), unique=True)
     
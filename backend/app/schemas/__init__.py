@@ -1,5 +1,5 @@
 from .user import UserCreate, UserLogin, UserResponse, Token, TokenData
 from .provider import ProviderCreate, ProviderUpdate, ProviderResponse
 from .provider import ProviderCreate, ProviderUpdate, ProviderResponse
-from .payment import PaymentCreate, PaymentResponse, PaymentCallbackBody
+from .payment import PaymentCreate, PaymentResponse, PaymentRequestOut, PaymentCallbackBody
 from .review import ReviewCreate, ReviewResponse
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -13,14 +13,21 @@ class AlertBase(BaseModel):
     lng: Optional[float] = None
 
 class AlertCreate(AlertBase):
-    pass
+    # Bounded on input only, so rows stored before validation still serialize
+    lat: Optional[float] = Field(None, ge=-90, le=90)
+    lng: Optional[float] = Field(None, ge=-180, le=180)
 
 class AlertOut(AlertBase):
     id: UUID
-    user_id: int
+    user_id: Optional[UUID] = None
     upvotes: int
     is_verified: bool
     created_at: datetime
+    incident_id: Optional[UUID] = None # Set when this report was merged into an existing incident
+    report_count: int = 1
     
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+# Compiled once; used with app.core.serialization.json_list
+AlertListAdapter = TypeAdapter(List[AlertOut])
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, TypeAdapter
+from typing import List, Optional
+from datetime import datetime
+
+class BookingCreate(BaseModel):
+    provider_id: str
+    service_id: Optional[str] = None # Or just service name/type
+    service_name: str
+    scheduled_date: datetime
+    quoted_price: float
+    payment_plan: str = "full" # 'full' or 'installments'
+
+class BookingResponse(BaseModel):
+    id: str
+    status: str
+    total_amount: float
+    amount_due_now: float
+    message: str
+
+class BookingListSchema(BaseModel):
+    id: str
+    provider_name: str
+    service_name: str
+    date: str
+    amount: str
+    status: str
+    image: str
+
+# Compiled once; used with app.core.serialization.json_list
+BookingListAdapter = TypeAdapter(List[BookingListSchema])
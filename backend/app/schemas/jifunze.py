@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional
 from uuid import UUID
 
@@ -18,4 +18,7 @@ class DIYGuideOut(DIYGuideBase):
     id: UUID
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+# Compiled once; used with app.core.serialization.json_list
+DIYGuideListAdapter = TypeAdapter(List[DIYGuideOut])
@@ -20,23 +20,23 @@ class MeshTeamUpdate(MeshTeamBase):
 # Member Schema
 class MeshMemberSchema(BaseModel):
     id: UUID
-    user_id: int
+    user_id: UUID
     role: str
     status: str
     joined_at: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 # Properties to return to client
 class MeshTeam(MeshTeamBase):
     id: UUID
-    leader_id: int
+    leader_id: UUID
     created_at: datetime
     members: List[MeshMemberSchema] = []
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class TeamInvite(BaseModel):
     email: str
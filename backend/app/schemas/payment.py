@@ -1,11 +1,12 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, List, Optional
 from datetime import datetime
+from uuid import UUID
 
 class PaymentCreate(BaseModel):
     phone_number: str = Field(..., description="M-Pesa phone number (e.g., 254712345678)")
     amount: float = Field(..., gt=0, description="Amount to pay in KES")
-    booking_id: str = Field(..., description="ID of the booking being paid for")
+    booking_id: UUID = Field(..., description="ID of the booking being paid for")
 
 class PaymentResponse(BaseModel):
     CheckoutRequestID: str
@@ -14,9 +15,39 @@ class PaymentResponse(BaseModel):
     ResponseDescription: str
     CustomerMessage: str
 
-class PaymentCallbackBody(BaseModel):
-    # Simplified schema for the callback stub
+class PaymentRequestOut(BaseModel):
+    id: UUID
+    booking_id: UUID
+    amount: float
+    status: str # queued, sending, sent, completed, failed, expired
+    result_desc: Optional[str] = None
+    mpesa_receipt: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# Daraja STK callback: {"Body": {"stkCallback": {...}}}
+class CallbackMetadataItem(BaseModel):
+    Name: str
+    Value: Optional[Any] = None
+
+class CallbackMetadata(BaseModel):
+    Item: List[CallbackMetadataItem] = []
+
+class StkCallback(BaseModel):
     MerchantRequestID: str
     CheckoutRequestID: str
     ResultCode: int
     ResultDesc: str
+    CallbackMetadata: Optional[CallbackMetadata] = None
+
+    def metadata(self, name: str) -> Any:
+        items = self.CallbackMetadata.Item if self.CallbackMetadata else []
+        return next((item.Value for item in items if item.Name == name), None)
+
+class StkCallbackBody(BaseModel):
+    stkCallback: StkCallback
+
+class PaymentCallbackBody(BaseModel):
+    Body: StkCallbackBody
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import date
 import uuid
 
@@ -9,6 +9,8 @@ class ProviderBase(BaseModel):
     specialization_tags: List[str] = []
     service_locations: List[str] = []
     operating_radius_km: Optional[int] = 10
+    lat: Optional[float] = Field(None, ge=-90, le=90)
+    lng: Optional[float] = Field(None, ge=-180, le=180)
     verification_status: Optional[str] = "pending"
 
 class ProviderCreate(ProviderBase):
@@ -21,17 +23,24 @@ class ProviderUpdate(BaseModel):
     trade_category: Optional[str] = None
     specialization_tags: Optional[List[str]] = None
     service_locations: Optional[List[str]] = None
-    operating_radius_km: Optional[int] = None
-    verification_status: Optional[str] = None # Admin only ideally
+    operating_radius_km: Optional[int] = Field(None, ge=0)
+    lat: Optional[float] = Field(None, ge=-90, le=90) # Send null for both to clear the location
+    lng: Optional[float] = Field(None, ge=-180, le=180)
+    is_available: Optional[bool] = None
+    verification_status: Optional[str] = None # Admin only
     mpesa_business_number: Optional[str] = None
-    verification_notes: Optional[str] = None
+    verification_notes: Optional[str] = None # Admin only
 
 class ProviderResponse(ProviderBase):
     user_id: uuid.UUID
     subscription_tier: str
     trust_score: int
     jobs_completed: int
+    is_available: Optional[bool] = True
     is_verified: bool = False # Derived from verification_status
 
     class Config:
         from_attributes = True
+
+# Compiled once; used with app.core.serialization.json_list
+ProviderListAdapter = TypeAdapter(List[ProviderResponse])
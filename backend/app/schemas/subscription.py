@@ -7,7 +7,7 @@ class SubscriptionBase(BaseModel):
     service_type: str
     frequency: str
     next_run_date: datetime
-    provider_id: Optional[int] = None
+    provider_id: Optional[UUID] = None
 
 class SubscriptionCreate(SubscriptionBase):
     pass
@@ -18,4 +18,4 @@ class SubscriptionOut(SubscriptionBase):
     created_at: datetime
     
     class Config:
-        orm_mode = True
+        from_attributes = True
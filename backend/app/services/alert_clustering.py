@@ -0,0 +1,107 @@
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import FrozenSet, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.geo import geohash_cells_within, haversine_km
+from app.models.alert import CommunityAlert
+
+WORD = re.compile(r"[a-z0-9]+")
+# Too common in reports to say anything about which incident they describe
+STOPWORDS = frozenset({
+    "the", "and", "for", "with", "from", "this", "that", "there", "near", "at", "in", "on", "of", "is", "are",
+    "has", "have", "was", "our", "kwa", "na", "ya", "wa", "za", "la", "katika", "hii", "kuna",
+})
+
+
+def tokens(*texts: Optional[str]) -> FrozenSet[str]:
+    words = set()
+    for text in texts:
+        words.update(w for w in WORD.findall((text or "").lower()) if len(w) > 2 and w not in STOPWORDS)
+    return frozenset(words)
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass(frozen=True)
+class IncidentMatch:
+    incident_id: uuid.UUID
+    distance_km: float
+    similarity: float
+
+
+class AlertClusterer:
+    """
+    Folds duplicate reports of one incident into a single feed entry.
+
+    An incident is an alert with `incident_id` NULL; later reports of it point at it via
+    `incident_id` and bump its `report_count`, and the feeds only read incidents. A new
+    report joins the most similar incident of the same type reported within the time
+    window, within `radius_km`, whose title + description share enough words (Jaccard).
+    Candidates come from the geohash tiles around the report through the partial tile
+    index, newest first and capped, so matching costs a fixed number of index rows per
+    report however large the table grows.
+    """
+
+    def __init__(self, radius_km: float, window_minutes: int, min_similarity: float, max_candidates: int):
+        self.radius_km = radius_km
+        self.window = timedelta(minutes=window_minutes)
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+
+    async def find_incident(self, db: AsyncSession, report: CommunityAlert) -> Optional[IncidentMatch]:
+        if report.lat is None or report.lng is None:
+            return None
+        result = await db.execute(
+            select(
+                CommunityAlert.id, CommunityAlert.lat, CommunityAlert.lng,
+                CommunityAlert.title, CommunityAlert.description,
+            )
+            .where(
+                CommunityAlert.geotile.in_(geohash_cells_within(report.lat, report.lng, self.radius_km)),
+                CommunityAlert.incident_id.is_(None),
+                CommunityAlert.created_at >= datetime.utcnow() - self.window,
+                CommunityAlert.type == report.type,
+            )
+            .order_by(CommunityAlert.created_at.desc())
+            .limit(self.max_candidates)
+        )
+        words = tokens(report.title, report.description)
+        best = None
+        for candidate in result.all():
+            distance = haversine_km(report.lat, report.lng, candidate.lat, candidate.lng)
+            if distance > self.radius_km:
+                continue
+            similarity = jaccard(words, tokens(candidate.title, candidate.description))
+            if similarity >= self.min_similarity and (best is None or similarity > best.similarity):
+                best = IncidentMatch(candidate.id, distance, similarity)
+        return best
+
+    async def attach(self, db: AsyncSession, report: CommunityAlert, match: IncidentMatch) -> None:
+        """
+        Link `report` to the matched incident (not committed).
+        """
+        report.incident_id = match.incident_id
+        await db.execute(
+            update(CommunityAlert)
+            .where(CommunityAlert.id == match.incident_id)
+            .values(report_count=CommunityAlert.report_count + 1),
+            execution_options={"synchronize_session": False},
+        )
+
+
+alert_clusterer = AlertClusterer(
+    settings.ALERT_CLUSTER_RADIUS_KM,
+    settings.ALERT_CLUSTER_WINDOW_MINUTES,
+    settings.ALERT_CLUSTER_MIN_SIMILARITY,
+    settings.ALERT_CLUSTER_MAX_CANDIDATES,
+)
@@ -0,0 +1,127 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Set
+
+from app.core.config import settings
+from app.schemas.alert import AlertOut
+
+CONNECTED_FRAME = b"retry: 5000\n: connected\n\n"
+KEEPALIVE_FRAME = b": keepalive\n\n"
+# Sent to a client that fell too far behind, just before its stream ends; it should
+# refetch /alerts/near and reconnect
+OVERFLOW_FRAME = b"event: overflow\ndata: {}\n\n"
+
+
+class Subscriber:
+    __slots__ = ("topics", "buffer", "wakeup", "dropped")
+
+    def __init__(self, topics: List[str]):
+        self.topics = topics
+        self.buffer: Deque[bytes] = deque()
+        self.wakeup = asyncio.Event()
+        self.dropped = False
+
+
+class AlertStream:
+    """
+    In-process pub/sub of new community alerts keyed by geohash tile (see
+    app.core.geo), served to clients as Server-Sent Events.
+
+    Each alert is serialized once into an SSE frame and appended to the bounded buffer
+    of every subscriber of its tile. A subscriber whose buffer is already full is
+    dropped on the spot (sent an `overflow` event, then its stream ends), so one stalled
+    phone never holds memory or slows the publisher. Only this worker's subscribers
+    are reached.
+    """
+
+    def __init__(self, buffer_size: int, heartbeat_seconds: float):
+        self.buffer_size = buffer_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self._topics: Dict[str, Set[Subscriber]] = {}
+        self.subscribers = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, topics: List[str]) -> Subscriber:
+        subscriber = Subscriber(topics)
+        for topic in topics:
+            self._topics.setdefault(topic, set()).add(subscriber)
+        self.subscribers += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        for topic in subscriber.topics:
+            members = self._topics.get(topic)
+            if members is not None and subscriber in members:
+                members.discard(subscriber)
+                if not members:
+                    del self._topics[topic]
+        if subscriber.topics:
+            self.subscribers -= 1
+            subscriber.topics = []
+
+    def publish(self, topic: str, frame: bytes) -> int:
+        """
+        Queue `frame` for every subscriber of `topic`; returns how many received it.
+        """
+        self.published += 1
+        members = self._topics.get(topic)
+        if not members:
+            return 0
+        delivered = 0
+        for subscriber in list(members):
+            if len(subscriber.buffer) >= self.buffer_size:
+                subscriber.dropped = True
+                self.dropped += 1
+                self.unsubscribe(subscriber)
+            else:
+                subscriber.buffer.append(frame)
+                delivered += 1
+            subscriber.wakeup.set()
+        self.delivered += delivered
+        return delivered
+
+    def publish_alert(self, alert) -> int:
+        if not alert.geotile:
+            return 0
+        data = AlertOut.model_validate(alert).model_dump_json()
+        frame = f"id: {alert.id}\nevent: alert\ndata: {data}\n\n".encode()
+        return self.publish(alert.geotile, frame)
+
+    async def events(self, topics: List[str]) -> AsyncIterator[bytes]:
+        """
+        SSE byte stream for one client. Subscribes on first iteration, so a response
+        that never starts leaves nothing registered, and unsubscribes when the client
+        disconnects (the generator is closed).
+        """
+        subscriber = self.subscribe(topics)
+        try:
+            yield CONNECTED_FRAME
+            while True:
+                while subscriber.buffer:
+                    yield subscriber.buffer.popleft()
+                if subscriber.dropped:
+                    yield OVERFLOW_FRAME
+                    return
+                subscriber.wakeup.clear()
+                try:
+                    await asyncio.wait_for(subscriber.wakeup.wait(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    # Keeps proxies and mobile NATs from closing an idle stream
+                    yield KEEPALIVE_FRAME
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscribers,
+            "topics": len(self._topics),
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_slow_consumers": self.dropped,
+        }
+
+
+alert_stream = AlertStream(settings.ALERT_STREAM_BUFFER_SIZE, settings.ALERT_STREAM_HEARTBEAT_SECONDS)
@@ -0,0 +1,247 @@
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.core import tasks
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Recent samples kept for the latency percentiles in stats()
+SAMPLE_WINDOW = 1_024
+
+
+class ByteHistogramModel:
+    """
+    Stand-in CPU model: a small fixed-weight MLP over the normalized byte histogram of
+    the upload. Deterministic per image, so it exercises the same batching path a real
+    model would. Any class with `predict(images: List[bytes]) -> ndarray` of shape
+    (len(images), num_classes) can be plugged in through SCAN_MODEL, e.g. a wrapper
+    around an onnxruntime.InferenceSession that decodes and resizes the images.
+    """
+
+    def __init__(self, num_classes: int = 3, hidden: int = 512, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.w1 = rng.standard_normal((256, hidden)).astype(np.float32) * 4
+        self.w2 = rng.standard_normal((hidden, num_classes)).astype(np.float32) / np.sqrt(hidden)
+
+    def predict(self, images: List[bytes]) -> np.ndarray:
+        features = np.stack([
+            np.bincount(np.frombuffer(image, dtype=np.uint8), minlength=256) / max(len(image), 1)
+            for image in images
+        ]).astype(np.float32)
+        logits = np.maximum(features @ self.w1, 0) @ self.w2
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        return probs / probs.sum(axis=1, keepdims=True)
+
+
+# Per-process model, loaded once by the pool initializer
+_model = None
+
+
+def load_model(spec: str) -> None:
+    """
+    Import and instantiate `spec` ("package.module:factory").
+    """
+    global _model
+    module_name, _, attr = spec.partition(":")
+    _model = getattr(importlib.import_module(module_name), attr)()
+
+
+def run_batch(paths: List[str]) -> Tuple[List[Optional[np.ndarray]], float]:
+    """
+    Predict a batch of image files. Runs in a pool worker, which reads the files itself
+    so the API process never holds or pickles the image bytes. Rows line up with `paths`;
+    a file that no longer exists gets None instead of failing the rest of the batch.
+    """
+    if _model is None:
+        load_model(settings.SCAN_MODEL)
+    images, present = [], []
+    for i, path in enumerate(paths):
+        try:
+            with open(path, "rb") as f:
+                images.append(f.read())
+        except FileNotFoundError:
+            # Its scan was cancelled while queued and the caller already deleted the file
+            continue
+        present.append(i)
+    rows: List[Optional[np.ndarray]] = [None] * len(paths)
+    started = time.perf_counter()
+    if images:
+        for i, row in zip(present, _model.predict(images)):
+            rows[i] = row
+    return rows, time.perf_counter() - started
+
+
+def _percentile_ms(samples: Sequence[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] * 1000, 2)
+
+
+class InferenceEngine:
+    """
+    Micro-batching front end for the scan model.
+
+    `predict` enqueues one image file path and awaits its own future. A batcher task waits for a
+    free worker, then takes whatever has queued up (at most `max_batch_size`, lingering
+    up to `max_wait_ms` for stragglers) and runs the batch in a process pool, so model
+    CPU never runs on the event loop and its per-call overhead is shared by the batch.
+    Beyond `max_queue` waiting images callers get a 503.
+    """
+
+    def __init__(self, model: str, workers: int, max_batch_size: int, max_wait_ms: float, max_queue: int):
+        self.model = model
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatches: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+        self.failed_batches = 0
+        self.rejected = 0
+        self.max_batch_seen = 0
+        self._batch_sizes = deque(maxlen=SAMPLE_WINDOW)
+        self._queue_wait = deque(maxlen=SAMPLE_WINDOW)
+        self._model_latency = deque(maxlen=SAMPLE_WINDOW)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the parent is a running event loop with threads
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=load_model,
+            initargs=(self.model,),
+        )
+
+    def start(self) -> None:
+        self._executor = self._new_executor()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(self.workers)
+        tasks.start_worker("scan-inference-batcher", self._run)
+
+    async def close(self) -> None:
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future, _ = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def predict(self, image: str) -> np.ndarray:
+        """
+        Class probabilities for the image file at path `image` (which must outlive the call).
+        """
+        if self._queue is None:
+            # Not started (scripts): run in this process, off the loop
+            rows, _ = await asyncio.to_thread(run_batch, [image])
+            if rows[0] is None:
+                raise FileNotFoundError(image)
+            return rows[0]
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((image, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many scans in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            # Give concurrent requests a moment to join unless the batch is already full
+            if self._queue.qsize() < self.max_batch_size - 1 and self.max_wait_ms > 0:
+                await asyncio.sleep(self.max_wait_ms / 1000)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        try:
+            started = time.perf_counter()
+            for _, _, enqueued_at in batch:
+                self._queue_wait.append(started - enqueued_at)
+            executor = self._executor
+            try:
+                loop = asyncio.get_running_loop()
+                rows, model_seconds = await loop.run_in_executor(
+                    executor, run_batch, [image for image, _, _ in batch],
+                )
+            except Exception as exc:
+                self.failed_batches += 1
+                logger.exception("scan inference batch of %d failed", len(batch))
+                # A worker died (OOM, segfault in native code); later batches get a fresh pool.
+                # Only the first batch to see this pool break replaces it.
+                if isinstance(exc, BrokenProcessPool) and self._executor is executor:
+                    self._executor = self._new_executor()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                return
+            self.batches += 1
+            self.items += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            self._batch_sizes.append(len(batch))
+            self._model_latency.append(model_seconds)
+            for (image, future, _), row in zip(batch, rows):
+                if future.done():
+                    continue
+                if row is None:
+                    future.set_exception(FileNotFoundError(image))
+                else:
+                    future.set_result(row)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "workers": self.workers,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self.batches,
+            "items": self.items,
+            "failed_batches": self.failed_batches,
+            "rejected": self.rejected,
+            "avg_batch_size": round(sum(self._batch_sizes) / len(self._batch_sizes), 2) if self._batch_sizes else 0.0,
+            "max_batch_size_seen": self.max_batch_seen,
+            "queue_wait_p50_ms": _percentile_ms(self._queue_wait, 50),
+            "queue_wait_p95_ms": _percentile_ms(self._queue_wait, 95),
+            "model_latency_p50_ms": _percentile_ms(self._model_latency, 50),
+            "model_latency_p95_ms": _percentile_ms(self._model_latency, 95),
+        }
+
+
+inference_engine = InferenceEngine(
+    settings.SCAN_MODEL,
+    settings.SCAN_INFERENCE_WORKERS,
+    settings.SCAN_BATCH_MAX_SIZE,
+    settings.SCAN_BATCH_MAX_WAIT_MS,
+    settings.SCAN_INFERENCE_MAX_QUEUE,
+)
@@ -0,0 +1,53 @@
+import uuid
+from typing import Tuple
+
+from sqlalchemy import select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.mesh import MeshTeam, MeshMember
+
+
+class MeshMembershipService:
+    """
+    Which teams a user leads or is an active member of, cached per user. Team rows and
+    member lists are always read fresh; only the id set is cached. The worker handling a
+    membership change (create, invite, leave) drops that user's set at once; every other
+    worker may keep serving the old set until MESH_MEMBERSHIP_CACHE_TTL_SECONDS expire.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache(
+            "mesh-memberships", settings.MESH_MEMBERSHIP_CACHE_MAX_SIZE, settings.MESH_MEMBERSHIP_CACHE_TTL_SECONDS,
+        )
+        # Bumped by every invalidation, as in response_cache
+        self._generation = 0
+
+    @staticmethod
+    def team_ids_query(user_id: uuid.UUID):
+        # Two index scans (ix_mesh_teams_leader_id, ix_mesh_members_user_id_status_team_id),
+        # deduplicated by UNION in the database
+        return union(
+            select(MeshTeam.id).where(MeshTeam.leader_id == user_id),
+            select(MeshMember.team_id).where(MeshMember.user_id == user_id, MeshMember.status == "Active"),
+        )
+
+    async def team_ids(self, db: AsyncSession, user_id: uuid.UUID) -> Tuple[uuid.UUID, ...]:
+        key = str(user_id)
+        ids = self._cache.get(key)
+        if ids is None:
+            generation = self._generation
+            result = await db.execute(self.team_ids_query(user_id))
+            ids = tuple(result.scalars().all())
+            # Skip the store if a membership changed while we were querying
+            if generation == self._generation:
+                self._cache.set(key, ids)
+        return ids
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._generation += 1
+        self._cache.invalidate(str(user_id))
+
+
+mesh_membership = MeshMembershipService()
@@ -1,20 +1,36 @@
-
+import base64
+import math
+import time
 import uuid
 import asyncio
+from datetime import datetime
+from typing import Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from app.core.config import settings
 from app.schemas.payment import PaymentResponse
 
 class MockMpesaService:
     """
     Simulates M-Pesa Daraja API interactions.
+    Used when no Daraja credentials are configured; no callback ever arrives.
     """
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
     async def initiate_stk_push(self, phone_number: str, amount: float, booking_id: str) -> PaymentResponse:
         # Simulate network delay available in real world
         await asyncio.sleep(1)
-        
+
         # Generate mock IDs
         checkout_request_id = str(uuid.uuid4())
         merchant_request_id = str(uuid.uuid4())
-        
+
         # Return success response simulation
         return PaymentResponse(
             CheckoutRequestID=checkout_request_id,
@@ -24,4 +40,87 @@ class MockMpesaService:
             CustomerMessage=f"Success. Request accepted for processing for {amount} KES to {phone_number}"
         )
 
-mpesa_service = MockMpesaService()
+class DarajaClient:
+    """
+    Daraja (M-Pesa Express) client on one persistent, pooled httpx.AsyncClient per worker,
+    with the OAuth token cached until shortly before it expires.
+    Point MPESA_BASE_URL at tests/fake_daraja.py for local load tests.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=settings.MPESA_BASE_URL,
+            timeout=settings.MPESA_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.MPESA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MPESA_MAX_CONNECTIONS,
+            ),
+        )
+
+    async def close(self) -> None:
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _access_token(self) -> str:
+        if self._token and time.monotonic() < self._token_expires_at:
+            return self._token
+        async with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+            response = await self._client.get(
+                "/oauth/v1/generate",
+                params={"grant_type": "client_credentials"},
+                auth=(settings.MPESA_CONSUMER_KEY, settings.MPESA_CONSUMER_SECRET),
+            )
+            response.raise_for_status()
+            payload = response.json()
+            self._token = payload["access_token"]
+            # Refresh a minute early so in-flight requests never carry an expired token
+            self._token_expires_at = time.monotonic() + int(payload.get("expires_in", 3599)) - 60
+            return self._token
+
+    def invalidate_token(self) -> None:
+        self._token = None
+
+    @staticmethod
+    def callback_url() -> str:
+        # The shared secret the callback endpoint checks (see payments.payment_callback)
+        separator = "&" if "?" in settings.MPESA_CALLBACK_URL else "?"
+        return settings.MPESA_CALLBACK_URL + separator + urlencode({"token": settings.MPESA_CALLBACK_TOKEN})
+
+    async def initiate_stk_push(self, phone_number: str, amount: float, booking_id: str) -> PaymentResponse:
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        password = base64.b64encode(
+            f"{settings.MPESA_SHORTCODE}{settings.MPESA_PASSKEY}{timestamp}".encode()
+        ).decode()
+        token = await self._access_token()
+        response = await self._client.post(
+            "/mpesa/stkpush/v1/processrequest",
+            headers={"Authorization": f"Bearer {token}"},
+            json={
+                "BusinessShortCode": settings.MPESA_SHORTCODE,
+                "Password": password,
+                "Timestamp": timestamp,
+                "TransactionType": "CustomerPayBillOnline",
+                "Amount": math.ceil(amount),
+                "PartyA": phone_number,
+                "PartyB": settings.MPESA_SHORTCODE,
+                "PhoneNumber": phone_number,
+                "CallBackURL": self.callback_url(),
+                "AccountReference": str(booking_id)[:12],
+                "TransactionDesc": "MtaaTrust booking",
+            },
+        )
+        if response.status_code == 401:
+            self.invalidate_token()
+        response.raise_for_status()
+        return PaymentResponse(**response.json())
+
+mpesa_service = DarajaClient() if settings.MPESA_CONSUMER_KEY else MockMpesaService()
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import random
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+import httpx
+from sqlalchemy import func, select, update
+
+from app.core import tasks
+from app.core.config import settings
+from app.models.payment import PaymentRequest
+from app.services.mpesa import mpesa_service
+
+logger = logging.getLogger(__name__)
+
+
+def _retryable(exc: Exception) -> bool:
+    # Only failures where Daraja provably never accepted the push: no connection, no pool
+    # slot, an expired token, throttling or an unavailable gateway. Anything else may
+    # already have put a PIN prompt on the customer's phone, and a retry would add another.
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in (401, 429, 503)
+    return False
+
+
+def _ambiguous(exc: Exception) -> bool:
+    # The request went out but the reply was lost (read timeout, dropped connection,
+    # gateway error): the push may or may not have been accepted.
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return False
+
+
+class PaymentQueue:
+    """
+    In-process queue of STK pushes. The API only records a `queued` PaymentRequest and
+    enqueues its id; MPESA_WORKERS background workers call Daraja with retries and
+    exponential backoff, and the callback endpoint settles the request later.
+
+    Rows are the source of truth: a worker claims a request by moving it queued -> sending,
+    so a request is never pushed twice even if several processes pick up the same id, and
+    `requeue_pending` re-enqueues anything left queued (full queue, restart).
+
+    A push whose outcome is unknown (the reply was lost) is never repeated: it waits as
+    `sent` for a callback. `expire_stale` moves requests stuck in `sending` (worker died
+    mid-push) or `sent` (no callback came) to `expired`, so the booking can start a new one.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._session_factory = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.unconfirmed = 0
+        self.expired = 0
+
+    async def start(self, session_factory) -> None:
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=settings.MPESA_QUEUE_SIZE)
+        await mpesa_service.start()
+        for i in range(settings.MPESA_WORKERS):
+            tasks.start_worker(f"stk-push-worker-{i}", self._worker)
+        try:
+            await self.requeue_pending()
+        except Exception:
+            # The periodic requeue retries; don't keep the app from booting
+            logger.exception("initial stk push requeue failed")
+
+    async def close(self) -> None:
+        await mpesa_service.close()
+
+    def enqueue(self, request_id: uuid.UUID) -> bool:
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(request_id)
+        except asyncio.QueueFull:
+            # Stays `queued` in the table; the periodic requeue picks it up
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    async def requeue_pending(self) -> int:
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(PaymentRequest.id)
+                .where(
+                    PaymentRequest.status == "queued",
+                    # Fresh rows are already in some worker's queue
+                    PaymentRequest.created_at < func.now() - timedelta(seconds=settings.MPESA_REQUEUE_INTERVAL_SECONDS),
+                )
+                .order_by(PaymentRequest.created_at)
+                .limit(settings.MPESA_QUEUE_SIZE - self._queue.qsize())
+            )
+            ids = result.scalars().all()
+        return sum(self.enqueue(request_id) for request_id in ids)
+
+    async def _worker(self) -> None:
+        while True:
+            request_id = await self._queue.get()
+            try:
+                await self._process(request_id)
+            except Exception:
+                logger.exception("stk push %s failed unexpectedly", request_id)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, request_id: uuid.UUID) -> None:
+        async with self._session_factory() as db:
+            claimed = await db.execute(
+                update(PaymentRequest)
+                .where(PaymentRequest.id == request_id, PaymentRequest.status == "queued")
+                .values(status="sending")
+                .returning(PaymentRequest.phone_number, PaymentRequest.amount, PaymentRequest.booking_id)
+            )
+            request = claimed.first()
+            await db.commit()
+        if request is None:
+            return  # Already handled (duplicate enqueue or another process)
+
+        values: Dict[str, Any] = {}
+        for attempt in range(1, settings.MPESA_MAX_ATTEMPTS + 1):
+            try:
+                response = await mpesa_service.initiate_stk_push(
+                    request.phone_number, request.amount, str(request.booking_id)
+                )
+                values = {
+                    "status": "sent",
+                    "merchant_request_id": response.MerchantRequestID,
+                    "checkout_request_id": response.CheckoutRequestID,
+                    "last_error": None,
+                }
+                self.sent += 1
+                break
+            except Exception as exc:
+                values = {"status": "failed", "last_error": repr(exc)[:500]}
+                if _ambiguous(exc) and not _retryable(exc):
+                    # Without a CheckoutRequestID there is nothing to query; the callback or expiry settles it
+                    values["status"] = "sent"
+                    self.unconfirmed += 1
+                    logger.warning("stk push %s outcome unknown, awaiting callback: %r", request_id, exc)
+                    break
+                if not _retryable(exc) or attempt == settings.MPESA_MAX_ATTEMPTS:
+                    self.failed += 1
+                    logger.warning("stk push %s failed after %d attempts: %r", request_id, attempt, exc)
+                    break
+                self.retries += 1
+                delay = min(settings.MPESA_BACKOFF_MAX_SECONDS, settings.MPESA_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+        async with self._session_factory() as db:
+            await db.execute(
+                update(PaymentRequest)
+                .where(PaymentRequest.id == request_id, PaymentRequest.status == "sending")
+                .values(attempts=attempt, **values)
+            )
+            await db.commit()
+
+    async def expire_stale(self) -> int:
+        async with self._session_factory() as db:
+            result = await db.execute(
+                update(PaymentRequest)
+                .where(
+                    PaymentRequest.status.in_(("sending", "sent")),
+                    PaymentRequest.updated_at < func.now() - timedelta(seconds=settings.MPESA_PUSH_EXPIRY_SECONDS),
+                )
+                .values(status="expired", result_desc="No callback received")
+                .returning(PaymentRequest.id)
+            )
+            expired = len(result.all())
+            await db.commit()
+        if expired:
+            self.expired += expired
+            logger.warning("expired %d stk pushes without a callback", expired)
+        return expired
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": settings.MPESA_WORKERS,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_queue": settings.MPESA_QUEUE_SIZE,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "unconfirmed": self.unconfirmed,
+            "expired": self.expired,
+        }
+
+
+payment_queue = PaymentQueue()
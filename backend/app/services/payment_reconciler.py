@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import bindparam, text, DateTime, Float, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.core import tasks
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Daraja reports TransactionDate as local (EAT) YYYYMMDDHHMMSS
+EAT = timezone(timedelta(hours=3))
+
+# Duplicate callbacks collapse here: one row per receipt and at most one per STK push
+# (unique checkout_request_id), so a push is never credited twice
+INSERT_SQL = text("""
+    INSERT INTO payment_confirmations (receipt, checkout_request_id, amount, phone_number, transaction_date, received_at)
+    SELECT v.*, now()
+    FROM unnest(:receipts, :checkout_request_ids, :amounts, :phone_numbers, :transaction_dates) AS v
+    ON CONFLICT DO NOTHING
+""").bindparams(
+    bindparam("receipts", type_=ARRAY(String)),
+    bindparam("checkout_request_ids", type_=ARRAY(String)),
+    bindparam("amounts", type_=ARRAY(Float)),
+    bindparam("phone_numbers", type_=ARRAY(String)),
+    bindparam("transaction_dates", type_=ARRAY(DateTime(timezone=True))),
+)
+
+# Apply up to :batch_size unapplied confirmations in one statement: claim them (SKIP LOCKED,
+# so concurrent reconcilers split the backlog), mark them applied, settle their STK
+# requests and fold the per-booking sums into the booking balances. Sums commute, so
+# callbacks may arrive in any order; confirmations whose STK request has no checkout id
+# yet simply wait for a later pass. Bookings are credited the amount the push asked
+# for (pr.amount), never the amount claimed in the callback.
+APPLY_SQL = text("""
+    WITH batch AS (
+        SELECT c.receipt, c.checkout_request_id, pr.amount, c.transaction_date, pr.booking_id
+        FROM payment_confirmations c
+        JOIN payment_requests pr ON pr.checkout_request_id = c.checkout_request_id
+        WHERE c.applied_at IS NULL
+        ORDER BY c.received_at
+        LIMIT :batch_size
+        FOR UPDATE OF c SKIP LOCKED
+    ),
+    marked AS (
+        UPDATE payment_confirmations c
+        SET applied_at = now(), booking_id = batch.booking_id
+        FROM batch
+        WHERE c.receipt = batch.receipt
+    ),
+    settled AS (
+        UPDATE payment_requests pr
+        SET status = 'completed', result_code = 0, mpesa_receipt = batch.receipt, updated_at = now()
+        FROM batch
+        WHERE pr.checkout_request_id = batch.checkout_request_id
+          AND pr.status IN ('sending', 'sent', 'expired')  -- a late success still settles
+    ),
+    per_booking AS (
+        SELECT booking_id,
+               SUM(amount) AS amount,
+               COUNT(*) AS payments,
+               (array_agg(receipt ORDER BY transaction_date DESC NULLS LAST))[1] AS last_receipt
+        FROM batch
+        GROUP BY booking_id
+    )
+    -- Balances are computed from the target row itself, not a snapshot CTE: when another
+    -- transaction updated the booking first, READ COMMITTED re-reads the row after its lock
+    -- and the new payment is added on top of the committed one instead of overwriting it.
+    UPDATE bookings b
+    SET paid_amount = COALESCE(b.paid_amount, 0) + p.amount,
+        remaining_amount = GREATEST(COALESCE(b.accepted_price, b.quoted_price) - (COALESCE(b.paid_amount, 0) + p.amount), 0),
+        payment_status = CASE
+            WHEN COALESCE(b.accepted_price, b.quoted_price) - (COALESCE(b.paid_amount, 0) + p.amount) <= 0 THEN 'paid'
+            ELSE 'partial'
+        END,
+        mpesa_transaction_id = p.last_receipt,
+        next_payment_due = CASE
+            WHEN COALESCE(b.accepted_price, b.quoted_price) - (COALESCE(b.paid_amount, 0) + p.amount) <= 0 THEN NULL
+            -- Every payment after the deposit settles one installment
+            WHEN b.payment_plan = 'installments'
+                 AND p.payments - CASE WHEN COALESCE(b.paid_amount, 0) = 0 THEN 1 ELSE 0 END > 0
+                THEN b.next_payment_due
+                     + (p.payments - CASE WHEN COALESCE(b.paid_amount, 0) = 0 THEN 1 ELSE 0 END) * interval '30 days'
+            ELSE b.next_payment_due
+        END
+    FROM per_booking p
+    WHERE b.id = p.booking_id
+    RETURNING b.id
+""")
+
+
+@dataclass(frozen=True)
+class Confirmation:
+    receipt: str
+    checkout_request_id: str
+    amount: float
+    phone_number: Optional[str] = None
+    transaction_date: Optional[datetime] = None
+
+
+def parse_transaction_date(value) -> Optional[datetime]:
+    try:
+        return datetime.strptime(str(value), "%Y%m%d%H%M%S").replace(tzinfo=EAT)
+    except (TypeError, ValueError):
+        return None
+
+
+class PaymentReconciler:
+    """
+    Buffers payment confirmations from Daraja callbacks and writes them in batches.
+
+    Callbacks `await submit(...)`: the confirmation joins the current buffer and the
+    call returns once the batch holding it is committed (group commit), so Daraja is
+    only acknowledged for durable confirmations while a month-end burst of thousands
+    costs a handful of round trips. Each flush also applies the backlog to bookings;
+    `apply_pending` runs periodically for confirmations that arrived before their STK
+    request was known.
+    """
+
+    def __init__(self):
+        self._session_factory = None
+        self._pending: List[Tuple[Confirmation, asyncio.Future]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.flushes = 0
+        self.received = 0
+        self.applied_bookings = 0
+
+    def start(self, session_factory) -> None:
+        self._session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        tasks.start_worker("payment-reconciler", self._run)
+
+    async def submit(self, confirmation: Confirmation) -> None:
+        self.received += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((confirmation, future))
+        if self._wakeup is None:
+            # Not started (scripts, tests): flush inline
+            await self._flush(self._take_batch())
+        else:
+            self._wakeup.set()
+        await future
+
+    def _take_batch(self) -> List[Tuple[Confirmation, asyncio.Future]]:
+        batch = self._pending[:settings.RECONCILE_BATCH_SIZE]
+        del self._pending[:settings.RECONCILE_BATCH_SIZE]
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Let the burst accumulate unless the batch is already full
+            if len(self._pending) < settings.RECONCILE_BATCH_SIZE:
+                await asyncio.sleep(settings.RECONCILE_FLUSH_INTERVAL_MS / 1000)
+            batch = self._take_batch()
+            if not self._pending:
+                self._wakeup.clear()
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Confirmation, asyncio.Future]]) -> None:
+        if not batch:
+            return
+        confirmations = [c for c, _ in batch]
+        try:
+            async with self._session_factory() as db:
+                await db.execute(INSERT_SQL, {
+                    "receipts": [c.receipt for c in confirmations],
+                    "checkout_request_ids": [c.checkout_request_id for c in confirmations],
+                    "amounts": [c.amount for c in confirmations],
+                    "phone_numbers": [c.phone_number for c in confirmations],
+                    "transaction_dates": [c.transaction_date for c in confirmations],
+                })
+                result = await db.execute(APPLY_SQL, {"batch_size": settings.RECONCILE_BATCH_SIZE})
+                self.applied_bookings += len(result.all())
+                await db.commit()
+            self.flushes += 1
+        except Exception as exc:
+            logger.exception("payment reconciliation flush of %d confirmations failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def apply_pending(self) -> int:
+        """
+        Drain the unapplied backlog, one batch per transaction.
+        """
+        applied = 0
+        while True:
+            async with self._session_factory() as db:
+                result = await db.execute(APPLY_SQL, {"batch_size": settings.RECONCILE_BATCH_SIZE})
+                count = len(result.all())
+                await db.commit()
+            applied += count
+            if count == 0:
+                break
+        self.applied_bookings += applied
+        return applied
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._pending),
+            "received": self.received,
+            "flushes": self.flushes,
+            "applied_bookings": self.applied_bookings,
+        }
+
+
+payment_reconciler = PaymentReconciler()
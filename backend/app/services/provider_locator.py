@@ -0,0 +1,201 @@
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.geo import haversine_km, km_per_degree_lng, KM_PER_DEGREE_LAT
+from app.models.provider import Provider
+
+# Grid cell edge in degrees (~2.2 km at Nairobi's latitude)
+CELL_DEGREES = 0.02
+# Hard cap on how far any provider is considered to travel
+MAX_RADIUS_KM = 50
+# Floor on the km one search ring is assumed to cover; near the poles a cell's width
+# shrinks towards zero and the ring count would grow without bound
+MIN_RING_KM = 0.5
+
+Cell = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class ProviderLocation:
+    provider_id: str
+    category: str
+    lat: float
+    lng: float
+    radius_km: float
+
+
+@dataclass(frozen=True)
+class NearbyProvider:
+    provider_id: str
+    distance_km: float
+
+
+def _cell(lat: float, lng: float) -> Cell:
+    return (math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES))
+
+
+class _CategoryGrid:
+    """
+    Uniform lat/lng grid for one trade category, plus the largest operating radius
+    in it (bounds how far out a search ring can still find a provider that covers us).
+    """
+
+    def __init__(self):
+        self.cells: Dict[Cell, Dict[str, ProviderLocation]] = {}
+        self.radius_counts: Dict[float, int] = {}
+        self.max_radius_km = 0.0
+
+    def add(self, loc: ProviderLocation) -> None:
+        self.cells.setdefault(_cell(loc.lat, loc.lng), {})[loc.provider_id] = loc
+        self.radius_counts[loc.radius_km] = self.radius_counts.get(loc.radius_km, 0) + 1
+        self.max_radius_km = max(self.max_radius_km, loc.radius_km)
+
+    def remove(self, loc: ProviderLocation) -> None:
+        cell = _cell(loc.lat, loc.lng)
+        bucket = self.cells.get(cell, {})
+        bucket.pop(loc.provider_id, None)
+        if not bucket:
+            self.cells.pop(cell, None)
+        self.radius_counts[loc.radius_km] -= 1
+        if not self.radius_counts[loc.radius_km]:
+            del self.radius_counts[loc.radius_km]
+            self.max_radius_km = max(self.radius_counts, default=0.0)
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.cells.values())
+
+
+class ProviderLocator:
+    """
+    In-memory spatial index of available providers, answering "k nearest providers of
+    category X whose operating radius covers (lat, lng)" without touching the database.
+
+    Searches expand ring by ring around the query cell and stop as soon as no farther
+    ring can beat the current k-th match or lies within any provider's radius, so a
+    query only inspects the few cells around the point.
+
+    Each worker holds its own copy: loaded at startup, updated on local writes and
+    reloaded periodically to pick up changes made by other workers.
+    """
+
+    def __init__(self):
+        self._grids: Dict[str, _CategoryGrid] = {}
+        self._by_id: Dict[str, ProviderLocation] = {}
+
+    # Maintenance
+
+    def upsert(
+        self,
+        provider_id: str,
+        category: str,
+        lat: Optional[float],
+        lng: Optional[float],
+        radius_km: Optional[float],
+        available: bool = True,
+    ) -> None:
+        """
+        Insert, move or drop a provider. Providers without a location or marked
+        unavailable are removed from the index.
+        """
+        self.remove(provider_id)
+        if lat is None or lng is None or not available:
+            return
+        loc = ProviderLocation(
+            provider_id=str(provider_id),
+            category=category.strip().lower(),
+            lat=lat,
+            lng=lng,
+            radius_km=float(min(radius_km or 0, MAX_RADIUS_KM)),
+        )
+        self._grids.setdefault(loc.category, _CategoryGrid()).add(loc)
+        self._by_id[loc.provider_id] = loc
+
+    def upsert_provider(self, provider: Provider) -> None:
+        self.upsert(
+            provider.user_id, provider.trade_category, provider.lat, provider.lng,
+            provider.operating_radius_km, provider.is_available,
+        )
+
+    def remove(self, provider_id: str) -> None:
+        loc = self._by_id.pop(str(provider_id), None)
+        if loc:
+            self._grids[loc.category].remove(loc)
+
+    async def load(self, session_factory) -> int:
+        """
+        (Re)build the index from the providers table and swap it in atomically.
+        """
+        fresh = ProviderLocator()
+        async with session_factory() as db:
+            result = await db.stream(
+                select(
+                    Provider.user_id, Provider.trade_category, Provider.lat,
+                    Provider.lng, Provider.operating_radius_km,
+                ).where(
+                    Provider.is_available.is_(True),
+                    Provider.lat.is_not(None),
+                    Provider.lng.is_not(None),
+                ).execution_options(yield_per=10_000)
+            )
+            async for row in result:
+                fresh.upsert(*row)
+        self._grids, self._by_id = fresh._grids, fresh._by_id
+        return len(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    # Queries
+
+    def nearest(self, category: str, lat: float, lng: float, k: int = 5) -> List[NearbyProvider]:
+        """
+        Up to `k` providers of `category` whose operating radius covers (lat, lng),
+        closest first.
+        """
+        grid = self._grids.get(category.strip().lower())
+        if not grid or k <= 0:
+            return []
+
+        ci, cj = _cell(lat, lng)
+        # Conservative km covered by one ring step at this latitude
+        ring_km = max(CELL_DEGREES * min(KM_PER_DEGREE_LAT, km_per_degree_lng(lat)), MIN_RING_KM)
+        max_ring = math.ceil(grid.max_radius_km / ring_km) + 1
+        best: List[Tuple[float, str]] = []  # max-heap of (-distance, id) holding the k best
+
+        for ring in range(max_ring + 1):
+            # Any point in ring r is at least (r - 1) cell widths away
+            ring_min_km = max(ring - 1, 0) * ring_km
+            if ring_min_km > grid.max_radius_km:
+                break
+            if len(best) == k and ring_min_km > -best[0][0]:
+                break
+
+            for cell in self._ring_cells(ci, cj, ring):
+                for loc in grid.cells.get(cell, {}).values():
+                    distance = haversine_km(lat, lng, loc.lat, loc.lng)
+                    if distance > loc.radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, loc.provider_id))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, loc.provider_id))
+
+        return [NearbyProvider(provider_id, -neg) for neg, provider_id in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ring_cells(ci: int, cj: int, ring: int):
+        if ring == 0:
+            yield (ci, cj)
+            return
+        for dj in range(-ring, ring + 1):
+            yield (ci - ring, cj + dj)
+            yield (ci + ring, cj + dj)
+        for di in range(-ring + 1, ring):
+            yield (ci + di, cj - ring)
+            yield (ci + di, cj + ring)
+
+provider_locator = ProviderLocator()
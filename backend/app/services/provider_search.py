@@ -0,0 +1,50 @@
+from sqlalchemy import Select, or_, func, cast, Float
+from app.models.provider import Provider
+
+# Must match the config used to build Provider.search_vector
+SEARCH_CONFIG = "simple"
+
+# Share of the final ordering that comes from text relevance; the rest is trust_score.
+RELEVANCE_WEIGHT = 0.7
+
+
+class ProviderSearchService:
+    """
+    Ranked provider search backed by the GIN indexes on `providers`:
+    - full-text match on the weighted `search_vector` (name, category, notes)
+    - trigram match on `business_name` for typos and partial words ("plumb", "juma elec")
+    """
+
+    def relevance(self, term: str):
+        """
+        Text relevance in [0, 1]: the better of the normalised full-text rank
+        and the trigram similarity of the business name.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, term)
+        # Normalisation flag 32 maps ts_rank_cd to rank / (rank + 1)
+        text_rank = func.ts_rank_cd(Provider.search_vector, tsquery, 32)
+        name_similarity = func.similarity(Provider.business_name, term)
+        return func.greatest(text_rank, name_similarity)
+
+    def score(self, term: str):
+        """
+        Final ordering key: relevance blended with the provider's trust score (0-100).
+        """
+        trust = cast(func.coalesce(Provider.trust_score, 0), Float) / 100.0
+        return (self.relevance(term) * RELEVANCE_WEIGHT) + (trust * (1 - RELEVANCE_WEIGHT))
+
+    def filter(self, query: Select, term: str) -> Select:
+        """
+        Restrict `query` to providers matching `term`. Order by `score(term)` for ranking.
+        Every branch of the OR is served by a GIN index (BitmapOr), so no sequential scan.
+        """
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, term)
+        return query.filter(
+            or_(
+                Provider.search_vector.op("@@")(tsquery),
+                Provider.business_name.op("%")(term),
+                Provider.trade_category.ilike(f"%{term}%"),
+            )
+        )
+
+provider_search_service = ProviderSearchService()
@@ -0,0 +1,99 @@
+import logging
+import uuid
+from typing import Optional
+
+from sqlalchemy import Float, case, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sambaza import SambazaGroup, SambazaParticipant
+
+# (fill ratio reached, discount unlocked), best first
+DISCOUNT_TIERS = [(1.0, "25%"), (0.5, "15%"), (0.2, "5%")]
+JOINABLE_STATUSES = ("forming", "active")
+
+logger = logging.getLogger(__name__)
+
+
+class SambazaService:
+    async def close_expired(self, session_factory, batch_size: int, max_batches: int) -> int:
+        """
+        Close forming groups past `expires_at`, `batch_size` rows per transaction.
+        Walks ix_sambaza_groups_status_expires_at from the oldest expiry; SKIP LOCKED lets
+        every worker's sweeper run at once without blocking each other or live joins.
+        """
+        expired = (
+            select(SambazaGroup.id)
+            .where(SambazaGroup.status == "forming", SambazaGroup.expires_at <= func.now())
+            .order_by(SambazaGroup.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = update(SambazaGroup).where(SambazaGroup.id.in_(expired)).values(status="closed")
+
+        closed = 0
+        for _ in range(max_batches):
+            async with session_factory() as db:
+                result = await db.execute(stmt, execution_options={"synchronize_session": False})
+                await db.commit()
+            closed += result.rowcount
+            if result.rowcount < batch_size:
+                break
+        if closed:
+            logger.info("sambaza sweeper closed %d expired groups", closed)
+        return closed
+
+    async def join(self, db: AsyncSession, group_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Row]:
+        """
+        Add `user_id` to an open group in one statement: the participant insert and the
+        counter/tier update run as a single CTE, so concurrent joins queue on the group
+        row instead of overwriting each other's counts.
+
+        Returns (title, participant_count, discount_tier, status), or None when nothing
+        was joined (missing/closed/expired group, or the user is already a member).
+        """
+        joined = (
+            insert(SambazaParticipant)
+            .from_select(
+                ["group_id", "user_id"],
+                select(SambazaGroup.id, literal(user_id, type_=SambazaParticipant.user_id.type)).where(
+                    SambazaGroup.id == group_id,
+                    SambazaGroup.status.in_(JOINABLE_STATUSES),
+                    SambazaGroup.expires_at > func.now(),
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(SambazaParticipant.group_id)
+            .cte("joined")
+        )
+
+        new_count = SambazaGroup.participant_count + 1
+        ratio = cast(new_count, Float) / func.nullif(SambazaGroup.target_count, 0)
+        stmt = (
+            update(SambazaGroup)
+            .where(SambazaGroup.id == joined.c.group_id)
+            .values(
+                participant_count=new_count,
+                discount_tier=case(
+                    *[(ratio >= threshold, tier) for threshold, tier in DISCOUNT_TIERS],
+                    else_=SambazaGroup.discount_tier,
+                ),
+                status=case((ratio >= 1.0, "active"), else_=SambazaGroup.status),
+            )
+            .returning(
+                SambazaGroup.title, SambazaGroup.participant_count,
+                SambazaGroup.discount_tier, SambazaGroup.status,
+            )
+        )
+        return (await db.execute(stmt)).first()
+
+    async def add_organizer(self, db: AsyncSession, group: SambazaGroup, user_id: uuid.UUID) -> None:
+        # The organizer is the group's first participant (participant_count starts at 1)
+        await db.execute(
+            insert(SambazaParticipant).values(group_id=group.id, user_id=user_id).on_conflict_do_nothing()
+        )
+
+
+sambaza_service = SambazaService()
@@ -1,64 +1,115 @@
-import random
+import asyncio
+import os
+from typing import BinaryIO, Dict
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.uploads import spool_to_path
 from app.schemas.scan import ScanResult, MaterialEstimate
+from app.services.inference import inference_engine
+
+# One per model output class, in class-index order
+SCENARIOS = [
+    {
+        "issue": "Leaking Pipe Joint",
+        "category": "Plumbing",
+        "price_min": 1500,
+        "price_max": 2500,
+        "urgency": "High",
+        "materials": [
+            {"name": "PVC Elbow Joint", "estimated_price": 150},
+            {"name": "Teflon Tape", "estimated_price": 50},
+            {"name": "PVC Glue", "estimated_price": 300}
+        ],
+        "desc": "Water leakage detected at the elbow joint. Requires immediate replacement to prevent water damage."
+    },
+    {
+        "issue": "Burnt Power Socket",
+        "category": "Electrical",
+        "price_min": 1000,
+        "price_max": 1800,
+        "urgency": "Critical",
+        "materials": [
+            {"name": "Double Wall Socket", "estimated_price": 450},
+            {"name": "Wire Nut Connectors", "estimated_price": 100}
+        ],
+        "desc": "Signs of arcing and heat damage on the socket faceplate. Fire hazard - replace immediately."
+    },
+    {
+        "issue": "Peeling Paint",
+        "category": "Painting",
+        "price_min": 3500,
+        "price_max": 5000,
+        "urgency": "Low",
+        "materials": [
+            {"name": "Primer (1L)", "estimated_price": 800},
+            {"name": "Interior Paint (4L)", "estimated_price": 2500},
+            {"name": "Sandpaper", "estimated_price": 200}
+        ],
+        "desc": "Moisture infiltration causing paint adhesion failure. Surface preparation and repainting required."
+    }
+]
+
 
 class ScanService:
+    """
+    Diagnoses uploaded photos. Results are cached by the image's sha256, so a client
+    retrying the same upload gets the stored ScanResult, and concurrent uploads of the
+    same image share a single analysis.
+    """
+
+    def __init__(self):
+        self._results = TTLCache(
+            "scan-results", settings.SCAN_RESULT_CACHE_MAX_SIZE, settings.SCAN_RESULT_CACHE_TTL_SECONDS,
+        )
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def analyze(self, image: BinaryIO, digest: str) -> ScanResult:
+        """
+        `image` is the spooled upload, rewound; `digest` its sha256 hex digest.
+        """
+        result = self._results.get(digest)
+        if result is not None:
+            return result
+        pending = self._in_flight.get(digest)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[digest] = future
+        try:
+            result = await self.analyze_image(image, digest)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception() # Waiters re-raise it; don't warn when there are none
+            raise
+        finally:
+            del self._in_flight[digest]
+        self._results.set(digest, result)
+        future.set_result(result)
+        return result
+
     @staticmethod
-    async def analyze_image(filename: str) -> ScanResult:
+    async def analyze_image(image: BinaryIO, digest: str) -> ScanResult:
         """
-        Mock AI analysis based on randomness or keywords in filename for demo.
-        In production, this would call a TensorFlow model.
+        Run the scan model (batched with concurrent scans, see InferenceEngine) and map
+        its most likely class to a scenario.
         """
-        
-        # Simulate processing time
-        # await asyncio.sleep(2) 
-        
-        scenarios = [
-            {
-                "issue": "Leaking Pipe Joint",
-                "category": "Plumbing",
-                "price_min": 1500,
-                "price_max": 2500,
-                "urgency": "High",
-                "materials": [
-                    {"name": "PVC Elbow Joint", "estimated_price": 150},
-                    {"name": "Teflon Tape", "estimated_price": 50},
-                    {"name": "PVC Glue", "estimated_price": 300}
-                ],
-                "desc": "Water leakage detected at the elbow joint. Requires immediate replacement to prevent water damage."
-            },
-            {
-                "issue": "Burnt Power Socket",
-                "category": "Electrical",
-                "price_min": 1000,
-                "price_max": 1800,
-                "urgency": "Critical",
-                "materials": [
-                    {"name": "Double Wall Socket", "estimated_price": 450},
-                    {"name": "Wire Nut Connectors", "estimated_price": 100}
-                ],
-                "desc": "Signs of arcing and heat damage on the socket faceplate. Fire hazard - replace immediately."
-            },
-            {
-                "issue": "Peeling Paint",
-                "category": "Painting",
-                "price_min": 3500,
-                "price_max": 5000,
-                "urgency": "Low",
-                "materials": [
-                    {"name": "Primer (1L)", "estimated_price": 800},
-                    {"name": "Interior Paint (4L)", "estimated_price": 2500},
-                    {"name": "Sandpaper", "estimated_price": 200}
-                ],
-                "desc": "Moisture infiltration causing paint adhesion failure. Surface preparation and repainting required."
-            }
-        ]
+        # Hand the pool a file path: the upload is never read whole or pickled in this process
+        path = await asyncio.to_thread(spool_to_path, image)
+        try:
+            probs = await inference_engine.predict(path)
+        finally:
+            await asyncio.to_thread(os.unlink, path)
+        best = int(probs.argmax())
+        scenario = SCENARIOS[best]
 
-        # Randomly select a scenario
-        scenario = random.choice(scenarios)
-        
         return ScanResult(
             issue_detected=scenario["issue"],
-            confidence=round(random.uniform(0.85, 0.98), 2),
+            confidence=round(float(probs[best]), 2),
             category=scenario["category"],
             estimated_price_min=scenario["price_min"],
             estimated_price_max=scenario["price_max"],
@@ -66,3 +117,5 @@ class ScanService:
             materials_needed=[MaterialEstimate(**m) for m in scenario["materials"]],
             description=scenario["desc"]
         )
+
+scan_service = ScanService()
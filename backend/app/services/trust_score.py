@@ -1,49 +1,130 @@
+from datetime import datetime, timezone
+from typing import Any, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from app.models.review import Review
-# Assuming models exist based on file list (review.py was seen in open files list earlier or assumed created in Phase 2)
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.models.provider import Provider
+from app.models.provider_stats import ProviderStats
+
+# Component weights (sum to 1.0)
+RATING_WEIGHT = 0.40
+SOCIAL_PROOF_WEIGHT = 0.20
+COMPLETION_WEIGHT = 0.20
+RESPONSE_WEIGHT = 0.20
+
+# Reviews + weighted vouches needed for full social-proof points
+SOCIAL_PROOF_CAP = 50
+# Full response points at or under an hour, none beyond a day (linear in between)
+RESPONSE_FULL_MINUTES = 60
+RESPONSE_ZERO_MINUTES = 24 * 60
+
+# Booking statuses that count as the provider having responded to the request
+RESPONDED_STATUSES = {"confirmed", "declined", "in_progress", "completed"}
+
+
+def score_from_stats(stats: Any) -> float:
+    """
+    Trust Score (0-100) from running aggregates, weighted as:
+    - Average Rating (40%)
+    - Social proof (20%) - reviews plus weighted vouches, capped at 50
+    - Completion Rate (20%) - completed / (completed + cancelled)
+    - Response Time (20%) - average minutes to first response
+    Components with no data yet score 0.
+    """
+    if stats is None:
+        return 0.0
+
+    rating_score = 0.0
+    if stats.rating_count:
+        rating_score = (stats.rating_sum / stats.rating_count) / 5 * 100
+
+    social_proof = stats.rating_count + stats.vouch_weight_sum
+    social_score = min(social_proof, SOCIAL_PROOF_CAP) / SOCIAL_PROOF_CAP * 100
+
+    completion_score = 0.0
+    finished = stats.bookings_completed + stats.bookings_cancelled
+    if finished:
+        completion_score = stats.bookings_completed / finished * 100
+
+    response_score = 0.0
+    if stats.response_count:
+        avg_minutes = stats.response_minutes_sum / stats.response_count
+        span = RESPONSE_ZERO_MINUTES - RESPONSE_FULL_MINUTES
+        response_score = min(max((RESPONSE_ZERO_MINUTES - avg_minutes) / span, 0.0), 1.0) * 100
+
+    final_score = (
+        (rating_score * RATING_WEIGHT) +
+        (social_score * SOCIAL_PROOF_WEIGHT) +
+        (completion_score * COMPLETION_WEIGHT) +
+        (response_score * RESPONSE_WEIGHT)
+    )
+    return round(final_score, 1)
+
 
 class TrustScoreService:
+    """
+    Event-driven trust scoring. Each review or booking state change applies an
+    O(1) delta to the provider's `provider_stats` row and writes the new score back to
+    `Provider.trust_score` in the caller's transaction. Vouches have no write path
+    yet; the nightly rebuild (trust_score_rebuild) folds them into the aggregates.
+    """
+
     async def calculate_score(self, provider_id: str, db: AsyncSession) -> float:
         """
-        Calculate Trust Score (0-100) based on weighted factors:
-        - Average Rating (40%)
-        - Review Count (20%) - Capped at 50 reviews for max points
-        - Completion Rate (20%) - Mocked for now
-        - Response Time (20%) - Mocked for now
+        Current Trust Score (0-100) from the provider's aggregates (a primary-key lookup).
+        """
+        result = await db.execute(select(ProviderStats).where(ProviderStats.provider_id == provider_id))
+        return score_from_stats(result.scalars().first())
+
+    async def record_review(self, db: AsyncSession, provider_id: str, rating: int) -> float:
+        return await self._apply(db, provider_id, {"rating_sum": rating, "rating_count": 1})
+
+    async def record_booking_transition(self, db: AsyncSession, booking: Any, old_status: str, new_status: str) -> float:
+        """
+        Apply a booking status change. Call after `booking.status` is set; stamps
+        `booking.responded_at` on the provider's first response.
         """
-        
-        # 1. Average Rating (0-5 -> 0-100 scale)
-        # Using a dummy query for now as I can't confirm exact model structure without viewing it, 
-        # but standard SQLAlchemy select is safe if model exists.
-        # Fallback to pure math if DB interaction fails in this mock environment.
-        
-        # Mocking the calculation logic for demonstration as DB is down
-        # In real implementation: 
-        # result = await db.execute(select(func.avg(Review.rating)).where(Review.provider_id == provider_id))
-        # avg_rating = result.scalar() or 0
-        
-        avg_rating = 4.5 # Mock
-        rating_score = (avg_rating / 5) * 100
-        
-        # 2. Review Count (Linear growth up to 50 reviews)
-        review_count = 12 # Mock
-        review_score = min(review_count, 50) / 50 * 100
-        
-        # 3. Completion Rate (Mock 95%)
-        completion_score = 95
-        
-        # 4. Response Time (Mock 90% - i.e. within 1 hr)
-        response_score = 90
-        
-        # Weighted Average
-        final_score = (
-            (rating_score * 0.40) +
-            (review_score * 0.20) +
-            (completion_score * 0.20) +
-            (response_score * 0.20)
+        deltas: Dict[str, Any] = {}
+        for status, column in (("completed", "bookings_completed"), ("cancelled", "bookings_cancelled")):
+            if new_status == status and old_status != status:
+                deltas[column] = 1
+            elif old_status == status and new_status != status:
+                deltas[column] = -1  # e.g. a disputed completion being reopened
+
+        if booking.responded_at is None and new_status in RESPONDED_STATUSES:
+            booking.responded_at = datetime.now(timezone.utc)
+            if booking.created_at is not None:
+                minutes = (booking.responded_at - booking.created_at).total_seconds() / 60
+                deltas["response_minutes_sum"] = max(minutes, 0.0)
+                deltas["response_count"] = 1
+
+        if not deltas:
+            return await self.calculate_score(booking.provider_id, db)
+        return await self._apply(db, booking.provider_id, deltas)
+
+    async def _apply(self, db: AsyncSession, provider_id: str, deltas: Dict[str, Any]) -> float:
+        # Atomic increment: concurrent events on the same provider never lose updates
+        stmt = insert(ProviderStats).values(provider_id=provider_id, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProviderStats.provider_id],
+            set_={
+                **{name: getattr(ProviderStats, name) + stmt.excluded[name] for name in deltas},
+                "updated_at": datetime.now(timezone.utc),
+            },
+        ).returning(*ProviderStats.__table__.c)
+        stats = (await db.execute(stmt)).one()
+
+        new_score = score_from_stats(stats)
+        avg_response = stats.response_minutes_sum / stats.response_count if stats.response_count else 0
+        await db.execute(
+            update(Provider)
+            .where(Provider.user_id == provider_id)
+            .values(
+                trust_score=round(new_score),
+                jobs_completed=stats.bookings_completed,
+                response_time_avg=round(avg_response),
+            )
         )
-        
-        return round(final_score, 1)
+        return new_score
 
 trust_score_service = TrustScoreService()
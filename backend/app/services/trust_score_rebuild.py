@@ -0,0 +1,235 @@
+"""
+Nightly full rebuild of provider trust scores.
+
+Recomputes every provider's aggregates from `reviews`, `bookings` and `vouches`,
+overwriting `provider_stats` and `Provider.trust_score`, so any drift in the
+incremental path (see TrustScoreService) is corrected once a day.
+
+    python -m app.services.trust_score_rebuild
+"""
+import asyncio
+import logging
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import select, text, literal_column, bindparam, Float, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.database import engine as default_engine
+from app.models.booking import Booking
+from app.models.provider import Provider
+from app.models.review import Review
+from app.models.vouch import Vouch
+from app.services.trust_score import (
+    RATING_WEIGHT, SOCIAL_PROOF_WEIGHT, COMPLETION_WEIGHT, RESPONSE_WEIGHT,
+    SOCIAL_PROOF_CAP, RESPONSE_FULL_MINUTES, RESPONSE_ZERO_MINUTES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Providers scored (and written back) per transaction
+CHUNK_SIZE = 10_000
+# Rows fetched per round trip from each server-side cursor
+STREAM_BATCH = 50_000
+
+STAT_COLUMNS = (
+    "rating_sum", "rating_count", "vouch_weight_sum",
+    "bookings_completed", "bookings_cancelled",
+    "response_minutes_sum", "response_count",
+)
+
+
+def scores_from_arrays(stats: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Vectorised twin of `score_from_stats`: same weights, caps and no-data rules,
+    applied to whole columns of aggregates at once.
+    """
+    rating_count = stats["rating_count"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rating_score = np.where(rating_count > 0, stats["rating_sum"] / rating_count / 5 * 100, 0.0)
+
+        social_proof = rating_count + stats["vouch_weight_sum"]
+        social_score = np.minimum(social_proof, SOCIAL_PROOF_CAP) / SOCIAL_PROOF_CAP * 100
+
+        finished = stats["bookings_completed"] + stats["bookings_cancelled"]
+        completion_score = np.where(finished > 0, stats["bookings_completed"] / finished * 100, 0.0)
+
+        response_count = stats["response_count"]
+        avg_minutes = np.where(response_count > 0, stats["response_minutes_sum"] / response_count, 0.0)
+        span = RESPONSE_ZERO_MINUTES - RESPONSE_FULL_MINUTES
+        response_score = np.where(
+            response_count > 0,
+            np.clip((RESPONSE_ZERO_MINUTES - avg_minutes) / span, 0.0, 1.0) * 100,
+            0.0,
+        )
+
+    final_score = (
+        (rating_score * RATING_WEIGHT) +
+        (social_score * SOCIAL_PROOF_WEIGHT) +
+        (completion_score * COMPLETION_WEIGHT) +
+        (response_score * RESPONSE_WEIGHT)
+    )
+    return np.round(final_score, 1)
+
+
+WRITE_STATS_SQL = text("""
+    INSERT INTO provider_stats (provider_id, rating_sum, rating_count, vouch_weight_sum,
+                                bookings_completed, bookings_cancelled,
+                                response_minutes_sum, response_count, updated_at)
+    SELECT v.*, now()
+    FROM unnest(:ids, :rating_sum, :rating_count, :vouch_weight_sum,
+                :bookings_completed, :bookings_cancelled,
+                :response_minutes_sum, :response_count) AS v
+    ON CONFLICT (provider_id) DO UPDATE SET
+        rating_sum = EXCLUDED.rating_sum,
+        rating_count = EXCLUDED.rating_count,
+        vouch_weight_sum = EXCLUDED.vouch_weight_sum,
+        bookings_completed = EXCLUDED.bookings_completed,
+        bookings_cancelled = EXCLUDED.bookings_cancelled,
+        response_minutes_sum = EXCLUDED.response_minutes_sum,
+        response_count = EXCLUDED.response_count,
+        updated_at = EXCLUDED.updated_at
+""").bindparams(
+    bindparam("ids", type_=ARRAY(UUID(as_uuid=True))),
+    bindparam("rating_sum", type_=ARRAY(Integer)),
+    bindparam("rating_count", type_=ARRAY(Integer)),
+    bindparam("vouch_weight_sum", type_=ARRAY(Float)),
+    bindparam("bookings_completed", type_=ARRAY(Integer)),
+    bindparam("bookings_cancelled", type_=ARRAY(Integer)),
+    bindparam("response_minutes_sum", type_=ARRAY(Float)),
+    bindparam("response_count", type_=ARRAY(Integer)),
+)
+
+WRITE_PROVIDERS_SQL = text("""
+    UPDATE providers AS p
+    SET trust_score = v.trust_score,
+        jobs_completed = v.jobs_completed,
+        response_time_avg = v.response_time_avg
+    FROM unnest(:ids, :trust_score, :jobs_completed, :response_time_avg)
+         AS v(user_id, trust_score, jobs_completed, response_time_avg)
+    WHERE p.user_id = v.user_id
+""").bindparams(
+    bindparam("ids", type_=ARRAY(UUID(as_uuid=True))),
+    bindparam("trust_score", type_=ARRAY(Integer)),
+    bindparam("jobs_completed", type_=ARRAY(Integer)),
+    bindparam("response_time_avg", type_=ARRAY(Integer)),
+)
+
+
+class TrustScoreRebuildJob:
+    """
+    Streams the source tables chunk by chunk over contiguous ranges of provider ids,
+    so memory is bounded by CHUNK_SIZE providers and STREAM_BATCH rows regardless of
+    table size. Needs the provider-id indexes on reviews, bookings and vouches.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, stream_batch: int = STREAM_BATCH):
+        self.chunk_size = chunk_size
+        self.stream_batch = stream_batch
+
+    async def run(self, engine: AsyncEngine = default_engine) -> int:
+        total = 0
+        last_id = None
+        async with engine.connect() as conn:
+            while True:
+                query = select(Provider.user_id).order_by(Provider.user_id).limit(self.chunk_size)
+                if last_id is not None:
+                    query = query.where(Provider.user_id > last_id)
+                ids = (await conn.execute(query)).scalars().all()
+                if not ids:
+                    break
+
+                await self._rebuild_chunk(conn, ids)
+                await conn.commit()
+
+                total += len(ids)
+                last_id = ids[-1]
+                logger.info("trust score rebuild: %d providers done", total)
+        return total
+
+    async def _rebuild_chunk(self, conn: AsyncConnection, ids: List) -> None:
+        lo, hi = ids[0], ids[-1]
+        # Hold the chunk's stats rows so incremental updates (which lock stats first)
+        # either commit before we read or apply on top of what we write.
+        await conn.execute(text(
+            "SELECT 1 FROM provider_stats WHERE provider_id BETWEEN :lo AND :hi "
+            "ORDER BY provider_id FOR UPDATE"
+        ), {"lo": lo, "hi": hi})
+
+        index = {provider_id: i for i, provider_id in enumerate(ids)}
+        n = len(ids)
+        stats = {name: np.zeros(n) for name in STAT_COLUMNS}
+
+        reviews = select(Review.reviewee_id, Review.overall_rating).where(Review.reviewee_id.between(lo, hi))
+        async for rows in self._stream(conn, reviews):
+            idx, cols = self._columns(rows, index)
+            stats["rating_sum"] += np.bincount(idx, weights=cols[0], minlength=n)
+            stats["rating_count"] += np.bincount(idx, minlength=n)
+
+        vouches = select(Vouch.provider_id, Vouch.weight).where(Vouch.provider_id.between(lo, hi))
+        async for rows in self._stream(conn, vouches):
+            idx, cols = self._columns(rows, index)
+            stats["vouch_weight_sum"] += np.bincount(idx, weights=np.nan_to_num(cols[0]), minlength=n)
+
+        response_minutes = literal_column("EXTRACT(EPOCH FROM bookings.responded_at - bookings.created_at) / 60")
+        bookings = select(
+            Booking.provider_id,
+            (Booking.status == "completed").cast(Integer),
+            (Booking.status == "cancelled").cast(Integer),
+            response_minutes,
+        ).where(Booking.provider_id.between(lo, hi))
+        async for rows in self._stream(conn, bookings):
+            idx, cols = self._columns(rows, index)
+            stats["bookings_completed"] += np.bincount(idx, weights=cols[0], minlength=n)
+            stats["bookings_cancelled"] += np.bincount(idx, weights=cols[1], minlength=n)
+            responded = ~np.isnan(cols[2])
+            stats["response_minutes_sum"] += np.bincount(
+                idx[responded], weights=np.maximum(cols[2][responded], 0.0), minlength=n
+            )
+            stats["response_count"] += np.bincount(idx[responded], minlength=n)
+
+        scores = scores_from_arrays(stats)
+        avg_response = np.where(
+            stats["response_count"] > 0,
+            stats["response_minutes_sum"] / np.maximum(stats["response_count"], 1),
+            0.0,
+        )
+
+        params = {"ids": list(ids)}
+        for name in STAT_COLUMNS:
+            values = stats[name]
+            params[name] = values.tolist() if name in ("vouch_weight_sum", "response_minutes_sum") else values.astype(np.int64).tolist()
+        await conn.execute(WRITE_STATS_SQL, params)
+
+        await conn.execute(WRITE_PROVIDERS_SQL, {
+            "ids": list(ids),
+            "trust_score": np.rint(scores).astype(np.int64).tolist(),
+            "jobs_completed": stats["bookings_completed"].astype(np.int64).tolist(),
+            "response_time_avg": np.rint(avg_response).astype(np.int64).tolist(),
+        })
+
+    async def _stream(self, conn: AsyncConnection, query):
+        # Server-side cursor; rows arrive STREAM_BATCH at a time
+        result = await conn.stream(query.execution_options(yield_per=self.stream_batch))
+        async for rows in result.partitions(self.stream_batch):
+            yield rows
+
+    @staticmethod
+    def _columns(rows, index: Dict):
+        """
+        Map a partition of (provider_id, *values) rows to an index array plus one float
+        array per value column; NULLs become NaN. Ids outside the chunk (e.g. reviews
+        of consumers that fall in the id range) are dropped.
+        """
+        idx = np.fromiter((index.get(r[0], -1) for r in rows), dtype=np.int64, count=len(rows))
+        values = np.array([r[1:] for r in rows], dtype=float).reshape(len(rows), -1)
+        known = idx >= 0
+        return idx[known], values[known].T
+
+
+trust_score_rebuild_job = TrustScoreRebuildJob()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(trust_score_rebuild_job.run())
@@ -0,0 +1,123 @@
+"""
+Duplicate-report clustering during incident bursts.
+
+Seeds a background of older alerts, then files `--incidents` simultaneous incidents
+around Nairobi with `--reports` residents each reporting theirs (worded differently,
+a few hundred metres apart) through AlertClusterer, the way /alerts/report does.
+Reports clustering cost per report, how many incidents the reports collapsed into,
+and the near-me feed's rows and JSON bytes with and without clustering.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_alert_clustering.py [--incidents 50] [--reports 40]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from fastapi import Response
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_utils import bench_database_url, summarize, print_row
+from app.api.v1.endpoints.alerts import near_alerts_query
+from app.core.geo import geohash
+from app.core.serialization import json_list
+from app.models.alert import CommunityAlert
+from app.schemas.alert import AlertListAdapter
+from app.services.alert_clustering import alert_clusterer
+
+KILIMANI = (-1.2921, 36.7836)
+
+INCIDENT_WORDS = {
+    "Utility": ["power", "outage", "blackout", "electricity", "transformer", "kplc", "lights", "stima"],
+    "Security": ["break", "burglary", "thieves", "gate", "stolen", "robbery", "night", "watchman"],
+}
+FILLER = ["please", "help", "again", "since", "evening", "estate", "road", "everyone", "urgent", "today"]
+
+SEED_SQL = """
+INSERT INTO community_alerts (id, title, description, type, severity, location_name, lat, lng, geotile,
+                              report_count, upvotes, is_verified, created_at)
+SELECT gen_random_uuid(), 'Old alert ' || i, 'Background', 'Security', 'Low', 'Nairobi', p.lat, p.lng,
+       ST_GeoHash(ST_SetSRID(ST_MakePoint(p.lng, p.lat), 4326), 5), 1, 0, false,
+       now() - interval '1 day' - (random() * interval '365 days')
+FROM generate_series(1, :background) AS i,
+LATERAL (SELECT -1.40 + random() * 0.25 AS lat, 36.65 + random() * 0.35 AS lng OFFSET 0) p
+"""
+
+
+def report_for(incident: dict) -> CommunityAlert:
+    words = random.sample(incident["words"], 4) + random.sample(FILLER, 2)
+    random.shuffle(words)
+    # Within ~300 m of the incident
+    lat = incident["lat"] + random.uniform(-0.002, 0.002)
+    lng = incident["lng"] + random.uniform(-0.002, 0.002)
+    return CommunityAlert(
+        title=" ".join(words[:3]).capitalize(), description=" ".join(words[3:]), type=incident["type"],
+        severity="High", location_name="Nairobi", lat=lat, lng=lng, geotile=geohash(lat, lng),
+        upvotes=0, is_verified=False, created_at=datetime.utcnow(),
+    )
+
+
+async def main(incidents: int, reports: int, background: int) -> None:
+    engine = create_async_engine(bench_database_url())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE community_alerts CASCADE"))
+        await conn.execute(text(SEED_SQL), {"background": background})
+        await conn.execute(text("ANALYZE community_alerts"))
+
+    spots = []
+    for i in range(incidents):
+        kind = random.choice(list(INCIDENT_WORDS))
+        spots.append({
+            "type": kind,
+            "words": random.sample(INCIDENT_WORDS[kind], 6),
+            "lat": KILIMANI[0] + random.uniform(-0.03, 0.03),
+            "lng": KILIMANI[1] + random.uniform(-0.03, 0.03),
+        })
+    burst = [spot for spot in spots for _ in range(reports)]
+    random.shuffle(burst)
+
+    cluster_ms = []
+    for spot in burst:
+        report = report_for(spot)
+        async with session_factory() as db:
+            start = time.perf_counter()
+            match = await alert_clusterer.find_incident(db, report)
+            if match is not None:
+                await alert_clusterer.attach(db, report, match)
+            cluster_ms.append((time.perf_counter() - start) * 1000)
+            db.add(report)
+            await db.commit()
+    print_row("clustering per report", summarize(cluster_ms))
+
+    async with session_factory() as db:
+        fresh = CommunityAlert.created_at >= func.now() - text("interval '1 hour'")
+        total = await db.scalar(select(func.count()).where(fresh))
+        merged = await db.scalar(select(func.count()).where(fresh, CommunityAlert.incident_id.is_(None)))
+        print(f"{total} reports of {incidents} incidents -> {merged} feed entries")
+
+        # Near-me first page around Kilimani, as served, vs every report being its own row
+        page = (await db.execute(near_alerts_query(*KILIMANI, 5.0, None, 100))).scalars().all()[:100]
+        raw = (await db.execute(
+            select(CommunityAlert).where(fresh).order_by(CommunityAlert.created_at.desc()).limit(100)
+        )).scalars().all()
+        clustered_bytes = len(json_list(AlertListAdapter, page, Response()).body)
+        raw_bytes = len(json_list(AlertListAdapter, raw, Response()).body)
+        incidents_in_raw = len({a.incident_id or a.id for a in raw})
+        print(f"near-me page: {len(page)} incidents in {clustered_bytes:,} B; "
+              f"unclustered: {len(raw)} rows covering {incidents_in_raw} incidents in {raw_bytes:,} B")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--incidents", type=int, default=50)
+    parser.add_argument("--reports", type=int, default=40)
+    parser.add_argument("--background", type=int, default=200_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.incidents, args.reports, args.background))
@@ -0,0 +1,97 @@
+"""
+Live alert fan-out with 50k idle SSE subscribers in one worker.
+
+Runs AlertStream in-process: each subscriber is the same `events()` generator the
+/alerts/stream endpoint serves, consumed by a task standing in for the socket writer
+(a share of them "stalled", i.e. never reading, like a phone in a tunnel). Subscribers
+sit at random points around Nairobi. Reports memory per idle subscriber, then
+publishes alerts to random tiles and reports publish cost, delivery latency and how
+many slow consumers were dropped. Socket buffers are not included: measure those with
+real connections (ulimit -n permitting) against a running server.
+
+    PYTHONPATH=backend python tests/bench_alert_stream.py [--subscribers 50000] [--alerts 2000]
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from bench_utils import summarize, print_row
+from app.core.geo import geohash, geohash_cells_within
+from app.services.alert_stream import AlertStream
+
+
+def random_point():
+    return -1.40 + random.random() * 0.25, 36.65 + random.random() * 0.35
+
+
+async def main(subscribers: int, alerts: int, stalled_rate: float, buffer_size: int, radius_km: float) -> None:
+    stream = AlertStream(buffer_size, heartbeat_seconds=25.0)
+    latencies = []
+    received = [0]
+    stall = asyncio.Event()  # never set
+
+    async def client(stalled: bool) -> None:
+        lat, lng = random_point()
+        events = stream.events(geohash_cells_within(lat, lng, radius_km))
+        await events.__anext__()  # connected
+        if stalled:
+            await stall.wait()
+        async for frame in events:
+            if frame.startswith(b"id: "):
+                received[0] += 1
+                alert_id = frame.split(b"\n", 1)[0][len(b"id: "):]
+                latencies.append((time.perf_counter() - published_at[alert_id]) * 1000)
+
+    published_at = {}
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    stalled = int(subscribers * stalled_rate)
+    tasks = [asyncio.create_task(client(i < stalled)) for i in range(subscribers)]
+    while stream.subscribers < subscribers:
+        await asyncio.sleep(0.05)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{subscribers:,} idle subscribers ({stalled:,} stalled) over {stream.stats()['topics']} tiles: "
+          f"{(after - before) / subscribers / 1024:.2f} KiB each (Python heap)")
+
+    publish_ms = []
+    for i in range(alerts):
+        lat, lng = random_point()
+        alert = SimpleNamespace(
+            id=uuid.uuid4(), user_id=None, title=f"Alert {i}", description="Bench alert", type="Security",
+            severity="High", location_name="Nairobi", lat=lat, lng=lng, geotile=geohash(lat, lng),
+            upvotes=0, is_verified=False, created_at=datetime.utcnow(),
+        )
+        start = time.perf_counter()
+        published_at[str(alert.id).encode()] = start
+        stream.publish_alert(alert)
+        publish_ms.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0)  # let consumers drain between publishes
+    await asyncio.sleep(0.5)
+
+    stats = stream.stats()
+    print_row("publish (serialize + fan-out)", summarize(publish_ms))
+    if latencies:
+        print_row("publish -> consumer", summarize(latencies))
+    print(f"delivered {stats['delivered']:,} frames, consumed {received[0]:,}, "
+          f"dropped {stats['dropped_slow_consumers']:,} slow consumers, {stats['subscribers']:,} still connected")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=50_000)
+    parser.add_argument("--alerts", type=int, default=2_000)
+    parser.add_argument("--stalled-rate", type=float, default=0.01)
+    parser.add_argument("--buffer-size", type=int, default=32)
+    parser.add_argument("--radius-km", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.subscribers, args.alerts, args.stalled_rate, args.buffer_size, args.radius_km))
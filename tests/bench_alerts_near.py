@@ -0,0 +1,97 @@
+"""
+Near-me alert feed latency as the alerts table grows.
+
+Seeds alerts spread across Kenya (a third of them in Nairobi) in steps up to
+`--sizes`, and at each size times a page of the global feed, the first page of the
+near-me feed around Kilimani, and a page ten cursors deep. The near-me numbers should
+stay flat while the table grows. Needs PostGIS for ST_GeoHash, like the migration.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_alerts_near.py [--sizes 100000 1000000 5000000]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_utils import bench_database_url, summarize, print_row, time_async
+from app.api.v1.endpoints.alerts import near_alerts_query
+from app.core.pagination import keyset, encode_cursor
+from app.models.alert import CommunityAlert
+
+KILIMANI = (-1.2921, 36.7836)
+PAGE = 50
+
+# Kenya's bounding box, with every third alert inside Nairobi
+SEED_SQL = """
+INSERT INTO community_alerts (id, title, description, type, severity, location_name, lat, lng, geotile,
+                              upvotes, is_verified, created_at)
+SELECT gen_random_uuid(), 'Alert ' || i, 'Bench alert', 'Security', 'Medium', 'Somewhere', p.lat, p.lng,
+       ST_GeoHash(ST_SetSRID(ST_MakePoint(p.lng, p.lat), 4326), 5), 0, false,
+       now() - (random() * interval '365 days')
+FROM generate_series(:start, :stop) AS i,
+LATERAL (
+    SELECT CASE WHEN i % 3 = 0 THEN -1.40 + random() * 0.25 ELSE -4.7 + random() * 9.3 END AS lat,
+           CASE WHEN i % 3 = 0 THEN 36.65 + random() * 0.35 ELSE 33.9 + random() * 8.0 END AS lng
+    OFFSET 0
+) p
+"""
+
+
+async def main(sizes, radius_km: float, iterations: int) -> None:
+    engine = create_async_engine(bench_database_url())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE community_alerts CASCADE"))
+
+    seeded = 0
+    for size in sorted(sizes):
+        async with engine.begin() as conn:
+            for start in range(seeded + 1, size + 1, 500_000):
+                await conn.execute(text(SEED_SQL), {"start": start, "stop": min(start + 499_999, size)})
+            await conn.execute(text("ANALYZE community_alerts"))
+        seeded = size
+        print(f"{size:,} alerts")
+
+        async with session_factory() as db:
+            # Cursor ten pages into the near-me feed
+            cursor = None
+            for _ in range(10):
+                rows = (await db.execute(near_alerts_query(*KILIMANI, radius_km, cursor, PAGE))).scalars().all()
+                if len(rows) <= PAGE:
+                    break
+                cursor = encode_cursor(rows[PAGE - 1].created_at, rows[PAGE - 1].id)
+
+        async def global_feed():
+            async with session_factory() as db:
+                query = keyset(select(CommunityAlert), [CommunityAlert.created_at, CommunityAlert.id], None, PAGE)
+                return (await db.execute(query)).scalars().all()
+
+        async def near_first_page():
+            async with session_factory() as db:
+                return (await db.execute(near_alerts_query(*KILIMANI, radius_km, None, PAGE))).scalars().all()
+
+        async def near_deep_page():
+            async with session_factory() as db:
+                return (await db.execute(near_alerts_query(*KILIMANI, radius_km, cursor, PAGE))).scalars().all()
+
+        for label, fn in [
+            ("global feed: first page", global_feed),
+            (f"near {radius_km:g} km: first page", near_first_page),
+            (f"near {radius_km:g} km: page 11", near_deep_page),
+        ]:
+            await fn()  # warm up
+            print_row(f"  {label}", summarize(await time_async(fn, iterations)))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--radius-km", type=float, default=3.0)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.radius_km, args.iterations))
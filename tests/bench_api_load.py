@@ -0,0 +1,324 @@
+"""
+In-process HTTP load benchmark for the API.
+
+Boots app.main:app in-process (httpx ASGI transport) against a seeded scratch database
+and drives a weighted mix of realistic requests from concurrent virtual users. Reports
+p50/p95/p99 latency and throughput per route and writes them to a JSON file, so runs
+from different commits can be compared:
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_api_load.py \\
+        --mix mixed --users 50 --duration 30 --out bench_results/$(git rev-parse --short HEAD).json
+
+    PYTHONPATH=backend python tests/bench_api_load.py --compare old.json new.json [--threshold 10]
+
+Mixes: browse (provider directory + guides), book, pay, feed (community alerts) and
+mixed (all of them in rough production proportions). --compare exits non-zero when
+any route's p95 or throughput regressed by more than --threshold percent.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from bench_utils import summarize, print_row
+
+SEED_USERS = 200
+SEED_PROVIDERS = 2_000
+SEED_ALERTS = 20_000
+SEED_GUIDES = 500
+SEARCH_TERMS = ["plumb", "electric", "cleaning", "painting", "kamau", "solar", "carpentry"]
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified)
+SELECT gen_random_uuid(), '+2547' || lpad(i::text, 8, '0'), 'x',
+       CASE WHEN i < :providers THEN 'provider' ELSE 'consumer' END, true, true
+FROM generate_series(0, :providers + :users - 1) AS i;
+
+INSERT INTO providers (user_id, business_name, trade_category, specialization_tags,
+                       service_locations, operating_radius_km, subscription_tier,
+                       trust_score, rehire_rate, response_time_avg, jobs_completed,
+                       verification_status, lat, lng, is_available)
+SELECT u.id,
+       (ARRAY['Juma','Wanjiku','Kamau','Achieng','Otieno','Mwangi','Njeri','Baraka'])[1 + (n % 8)]
+         || ' ' || (ARRAY['Electricals','Plumbing Works','Cleaning','Painters','Fumigation','Motors','Solar','Carpentry'])[1 + ((n / 8) % 8)]
+         || ' ' || n,
+       (ARRAY['Electrical','Plumbing','Cleaning','Painting','Fumigation','Mechanic','Solar','Carpentry'])[1 + ((n / 8) % 8)],
+       ARRAY[]::varchar[], ARRAY['Kilimani']::varchar[], 10, 'free',
+       (n * 37) % 101, 0, 0, 0, 'verified',
+       -1.29 + (n % 100) * 0.002, 36.78 + (n / 100) * 0.002, true
+FROM (SELECT id, substr(phone, 6)::int AS n FROM users WHERE user_type = 'provider') AS u;
+
+INSERT INTO community_alerts (id, user_id, title, description, type, severity, location_name, upvotes, is_verified, created_at)
+SELECT gen_random_uuid(), NULL, 'Alert ' || i, 'Power out on the main road', 'Utility', 'Low',
+       'Kilimani', 0, false, now() - i * interval '1 minute'
+FROM generate_series(1, :alerts) AS i;
+
+INSERT INTO diy_guides (id, title, category, difficulty, content, estimated_time_minutes)
+SELECT gen_random_uuid(), 'Guide ' || i, 'Plumbing', 'Easy', 'Steps...', 30
+FROM generate_series(1, :guides) AS i
+"""
+
+
+class VirtualUser:
+    def __init__(self, client, user_id: str, token: str, provider_ids: List[str], rng: random.Random):
+        self.client = client
+        self.user_id = user_id
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.provider_ids = provider_ids
+        self.rng = rng
+        self.booking_ids: List[str] = []
+
+    def provider(self) -> str:
+        return self.rng.choice(self.provider_ids)
+
+    # One method per benchmarked operation; each returns the response
+
+    async def browse_providers(self):
+        return await self.client.get("/api/v1/providers/", params={"limit": 20})
+
+    async def search_providers(self):
+        return await self.client.get("/api/v1/providers/", params={"search": self.rng.choice(SEARCH_TERMS), "limit": 20})
+
+    async def provider_detail(self):
+        return await self.client.get(f"/api/v1/providers/{self.provider()}")
+
+    async def guides(self):
+        return await self.client.get("/api/v1/jifunze/guides")
+
+    async def create_booking(self):
+        response = await self.client.post("/api/v1/bookings/", headers=self.headers, json={
+            "provider_id": self.provider(),
+            "service_name": "Fix leaking tap",
+            "scheduled_date": (datetime.now(timezone.utc) + timedelta(days=self.rng.randint(1, 30))).isoformat(),
+            "quoted_price": 2500,
+            "payment_plan": self.rng.choice(["full", "installments"]),
+        })
+        if response.status_code == 200:
+            self.booking_ids.append(response.json()["id"])
+        return response
+
+    async def my_bookings(self):
+        return await self.client.get("/api/v1/bookings/", headers=self.headers)
+
+    async def stk_push(self):
+        if not self.booking_ids:
+            return await self.create_booking()
+        return await self.client.post("/api/v1/payments/stk-push", headers=self.headers, json={
+            "phone_number": "254712345678",
+            "amount": 2500,
+            "booking_id": self.rng.choice(self.booking_ids),
+        })
+
+    async def alert_feed(self):
+        return await self.client.get("/api/v1/alerts/feed")
+
+    async def report_alert(self):
+        return await self.client.post("/api/v1/alerts/report", headers=self.headers, json={
+            "title": "Water outage",
+            "description": "No water since morning",
+            "type": "Utility",
+            "severity": "Medium",
+            "location_name": "Kilimani",
+        })
+
+
+# (route label, VirtualUser method name, weight)
+MIXES: Dict[str, List[Tuple[str, str, int]]] = {
+    "browse": [
+        ("GET /providers/", "browse_providers", 40),
+        ("GET /providers/?search", "search_providers", 25),
+        ("GET /providers/{id}", "provider_detail", 25),
+        ("GET /jifunze/guides", "guides", 10),
+    ],
+    "book": [
+        ("GET /providers/{id}", "provider_detail", 30),
+        ("POST /bookings/", "create_booking", 30),
+        ("GET /bookings/", "my_bookings", 40),
+    ],
+    "pay": [
+        ("POST /bookings/", "create_booking", 50),
+        ("POST /payments/stk-push", "stk_push", 50),
+    ],
+    "feed": [
+        ("GET /alerts/feed", "alert_feed", 85),
+        ("POST /alerts/report", "report_alert", 15),
+    ],
+    "mixed": [
+        ("GET /providers/", "browse_providers", 25),
+        ("GET /providers/?search", "search_providers", 15),
+        ("GET /providers/{id}", "provider_detail", 15),
+        ("GET /jifunze/guides", "guides", 5),
+        ("GET /alerts/feed", "alert_feed", 20),
+        ("POST /alerts/report", "report_alert", 2),
+        ("GET /bookings/", "my_bookings", 10),
+        ("POST /bookings/", "create_booking", 5),
+        ("POST /payments/stk-push", "stk_push", 3),
+    ],
+}
+
+
+async def seed(engine) -> Tuple[List[str], List[str]]:
+    from sqlalchemy import text
+
+    params = {"providers": SEED_PROVIDERS, "users": SEED_USERS, "alerts": SEED_ALERTS, "guides": SEED_GUIDES}
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "TRUNCATE community_alerts, diy_guides, bookings, provider_stats, providers, users CASCADE"
+        ))
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                # asyncpg rejects unused bind params, so only pass what the statement names
+                used = {k: v for k, v in params.items() if f":{k}" in statement}
+                await conn.execute(text(statement), used)
+        await conn.execute(text("ANALYZE"))
+        provider_ids = [str(r[0]) for r in await conn.execute(text("SELECT user_id FROM providers"))]
+        consumer_ids = [str(r[0]) for r in await conn.execute(text("SELECT id FROM users WHERE user_type = 'consumer'"))]
+    return provider_ids, consumer_ids
+
+
+async def run_user(user: VirtualUser, mix, deadline: float, samples: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+    labels = [label for label, _, _ in mix]
+    methods = {label: getattr(user, method) for label, method, _ in mix}
+    weights = [weight for _, _, weight in mix]
+    while time.perf_counter() < deadline:
+        label = user.rng.choices(labels, weights)[0]
+        start = time.perf_counter()
+        try:
+            response = await methods[label]()
+            failed = response.status_code >= 400
+        except Exception:
+            failed = True
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if failed:
+            errors[label] = errors.get(label, 0) + 1
+        else:
+            samples.setdefault(label, []).append(elapsed_ms)
+
+
+async def run(args) -> dict:
+    from bench_utils import bench_database_url
+    os.environ["DATABASE_URL"] = bench_database_url()
+
+    import httpx
+    from app.main import app
+    from app.core.database import engine
+    from app.core.security import create_access_token
+
+    provider_ids, consumer_ids = await seed(engine)
+    mix = MIXES[args.mix]
+
+    samples: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        users = [
+            VirtualUser(client, user_id, create_access_token(user_id), provider_ids, random.Random(args.seed + i))
+            for i, user_id in enumerate(consumer_ids[:args.users])
+        ]
+
+        # Warm-up: pools, caches, first-request imports
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*[run_user(u, mix, warmup_deadline, {}, {}) for u in users])
+
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*[run_user(u, mix, deadline, samples, errors) for u in users])
+        wall_s = time.perf_counter() - start
+
+    await engine.dispose()
+
+    routes = {}
+    for label, _, _ in mix:
+        route_samples = samples.get(label, [])
+        stats = summarize(route_samples)
+        stats["errors"] = errors.get(label, 0)
+        stats["throughput_rps"] = round(len(route_samples) / wall_s, 2)
+        routes[label] = stats
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "mix": args.mix,
+            "users": len(users),
+            "duration_s": round(wall_s, 2),
+            "seed": args.seed,
+        },
+        "total_rps": round(sum(len(s) for s in samples.values()) / wall_s, 2),
+        "routes": routes,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def report(results: dict) -> None:
+    meta = results["meta"]
+    print(f"commit {meta['commit']} mix={meta['mix']} users={meta['users']} "
+          f"duration={meta['duration_s']}s total={results['total_rps']} req/s")
+    for label, stats in results["routes"].items():
+        print_row(label, stats)
+        print(f"{'':<40} {stats['throughput_rps']} req/s, {stats['errors']} errors")
+
+
+def compare(old_path: str, new_path: str, threshold_pct: float) -> int:
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']} (mix {new['meta']['mix']})")
+
+    def delta(before: float, after: float) -> float:
+        return (after - before) / before * 100 if before else 0.0
+
+    regressions = 0
+    for label, after in new["routes"].items():
+        before = old["routes"].get(label)
+        if not before:
+            print(f"{label:<40} (new route)")
+            continue
+        p95_delta = delta(before["p95_ms"], after["p95_ms"])
+        rps_delta = delta(before["throughput_rps"], after["throughput_rps"])
+        regressed = p95_delta > threshold_pct or rps_delta < -threshold_pct
+        regressions += regressed
+        print(
+            f"{label:<40} p50 {delta(before['p50_ms'], after['p50_ms']):+6.1f}%  "
+            f"p95 {p95_delta:+6.1f}%  p99 {delta(before['p99_ms'], after['p99_ms']):+6.1f}%  "
+            f"rps {rps_delta:+6.1f}%{'  REGRESSION' if regressed else ''}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--threshold", type=float, default=10, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+
+    results = asyncio.run(run(args))
+    report(results)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.out}")
@@ -0,0 +1,87 @@
+"""
+Concurrency check for the mesh / alerts / jifunze / subscriptions routers.
+
+Boots app.main:app in-process (httpx ASGI transport) against a scratch database and
+fires the same N requests one at a time and then all at once. Handlers that block the
+event loop serialize, so their concurrent wall time stays close to the sequential sum;
+async handlers overlap their database waits.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_async_routers.py [--concurrency 100]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from bench_utils import bench_database_url, summarize, print_row
+
+os.environ["DATABASE_URL"] = bench_database_url()
+
+import httpx  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.database import engine  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+
+ROUTES = ["/api/v1/jifunze/guides", "/api/v1/alerts/feed", "/api/v1/mesh/my-teams", "/api/v1/subscriptions/me"]
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified)
+VALUES ('00000000-0000-0000-0000-000000000001', '+254700000001', 'x', 'consumer', true, true);
+
+INSERT INTO diy_guides (id, title, category, difficulty, content, estimated_time_minutes)
+SELECT gen_random_uuid(), 'Guide ' || i, 'Plumbing', 'Easy', 'Steps...', 30 FROM generate_series(1, 500) AS i;
+
+INSERT INTO community_alerts (id, user_id, title, description, type, severity, location_name, upvotes, is_verified, created_at)
+SELECT gen_random_uuid(), '00000000-0000-0000-0000-000000000001', 'Alert ' || i, 'Power out', 'Utility', 'Low',
+       'Kilimani', 0, false, now() - i * interval '1 minute'
+FROM generate_series(1, 5000) AS i;
+
+INSERT INTO mesh_teams (id, name, leader_id, created_at)
+SELECT gen_random_uuid(), 'Team ' || i, '00000000-0000-0000-0000-000000000001', now() FROM generate_series(1, 20) AS i;
+"""
+
+
+async def fire(client: httpx.AsyncClient, route: str) -> float:
+    start = time.perf_counter()
+    response = await client.get(route)
+    response.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+async def main(concurrency: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE community_alerts, diy_guides, mesh_members, mesh_teams, maintenance_subscriptions, users CASCADE"))
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                await conn.execute(text(statement))
+
+    token = create_access_token("00000000-0000-0000-0000-000000000001")
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for route in ROUTES:
+            await fire(client, route)  # warm up pool and caches
+
+            start = time.perf_counter()
+            sequential = [await fire(client, route) for _ in range(concurrency)]
+            sequential_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            concurrent = await asyncio.gather(*[fire(client, route) for _ in range(concurrency)])
+            concurrent_s = time.perf_counter() - start
+
+            print_row(f"{route} sequential", summarize(sequential))
+            print_row(f"{route} x{concurrency} concurrent", summarize(list(concurrent)))
+            print(f"    wall: sequential {sequential_s:.3f}s, concurrent {concurrent_s:.3f}s "
+                  f"-> overlap factor {sequential_s / concurrent_s:.1f}x")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency))
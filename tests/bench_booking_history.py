@@ -0,0 +1,139 @@
+"""
+Booking history for a heavy user (10k bookings).
+
+Compares the old shape of GET /bookings/ (every Booking hydrated as an ORM object with
+its Provider, then mapped in Python) with the column projection: first page, and a full
+walk through every page via the keyset cursor.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_booking_history.py [--bookings 10000]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from bench_utils import bench_database_url, summarize, print_row, time_async
+from app.core.pagination import keyset, encode_cursor
+from app.models.booking import Booking
+from app.models.provider import Provider
+
+CONSUMER_ID = "00000000-0000-0000-0000-000000000001"
+PAGE = 50
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified)
+SELECT CASE WHEN i = 0 THEN CAST(:consumer_id AS uuid) ELSE gen_random_uuid() END,
+       '+2547' || lpad(i::text, 8, '0'), 'x', CASE WHEN i = 0 THEN 'consumer' ELSE 'provider' END, true, true
+FROM generate_series(0, 200) AS i;
+
+INSERT INTO providers (user_id, business_name, trade_category, specialization_tags, service_locations,
+                       operating_radius_km, subscription_tier, trust_score, rehire_rate,
+                       response_time_avg, jobs_completed, verification_status)
+SELECT id, 'Provider ' || phone, 'Plumbing', ARRAY[]::varchar[], ARRAY['Kilimani']::varchar[],
+       10, 'free', 50, 0, 0, 0, 'verified'
+FROM users WHERE user_type = 'provider';
+
+-- Other consumers' bookings so the index has to do real work
+INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified)
+SELECT gen_random_uuid(), '+2548' || lpad(i::text, 8, '0'), 'x', 'consumer', true, true
+FROM generate_series(1, 1000) AS i;
+
+INSERT INTO bookings (id, provider_id, consumer_id, quoted_price, accepted_price, deposit_amount, payment_plan,
+                      installment_count, paid_amount, remaining_amount, scheduled_date, scheduled_time,
+                      status, payment_status)
+SELECT gen_random_uuid(), p.ids[1 + i % 200],
+       CASE WHEN i <= :bookings THEN CAST(:consumer_id AS uuid) ELSE c.ids[1 + i % 1000] END,
+       1500, 1500, 0, 'full', 1, 0, 1500, now() - i * interval '1 hour', '10:00', 'completed', 'paid'
+FROM generate_series(1, :bookings * 10) AS i,
+     (SELECT array_agg(user_id) AS ids FROM providers) p,
+     (SELECT array_agg(id) AS ids FROM users WHERE phone LIKE '+2548%') c
+"""
+
+
+def legacy_query():
+    return (
+        select(Booking)
+        .where(Booking.consumer_id == CONSUMER_ID)
+        .options(selectinload(Booking.provider))
+    )
+
+
+def projection_query(cursor=None):
+    query = (
+        select(Booking.id, Booking.scheduled_date, Booking.quoted_price, Booking.status, Provider.business_name)
+        .outerjoin(Provider, Provider.user_id == Booking.provider_id)
+        .where(Booking.consumer_id == CONSUMER_ID)
+    )
+    return keyset(query, [Booking.scheduled_date, Booking.id], cursor, PAGE)
+
+
+def to_dict(booking_id, scheduled_date, quoted_price, status, provider_name):
+    return {
+        "id": str(booking_id),
+        "provider_name": provider_name,
+        "service_name": "Service",
+        "date": scheduled_date.strftime("%Y-%m-%d %H:%M"),
+        "amount": f"KES {quoted_price}",
+        "status": status,
+        "image": f"https://api.dicebear.com/7.x/avataaars/svg?seed={provider_name}",
+    }
+
+
+async def main(bookings: int, iterations: int) -> None:
+    engine = create_async_engine(bench_database_url())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE bookings, providers, users CASCADE"))
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                params = {"consumer_id": CONSUMER_ID, "bookings": bookings}
+                used = {k: v for k, v in params.items() if f":{k}" in statement}
+                await conn.execute(text(statement), used)
+        await conn.execute(text("ANALYZE"))
+    print(f"seeded {bookings} bookings for one consumer ({bookings * 10} total)")
+
+    async def legacy():
+        async with session_factory() as db:
+            result = await db.execute(legacy_query())
+            return [
+                to_dict(b.id, b.scheduled_date, b.quoted_price, b.status, b.provider.business_name)
+                for b in result.scalars().all()
+            ]
+
+    async def first_page():
+        async with session_factory() as db:
+            result = await db.execute(projection_query())
+            return [to_dict(*row) for row in result.all()[:PAGE]]
+
+    async def walk_all_pages():
+        cursor = None
+        total = 0
+        async with session_factory() as db:
+            while True:
+                rows = (await db.execute(projection_query(cursor))).all()
+                total += len([to_dict(*row) for row in rows[:PAGE]])
+                if len(rows) <= PAGE:
+                    return total
+                last = rows[PAGE - 1]
+                cursor = encode_cursor(last.scheduled_date, last.id)
+
+    for label, fn, n in [
+        (f"legacy: all {bookings} as ORM", legacy, max(iterations // 10, 5)),
+        (f"projection: first page ({PAGE})", first_page, iterations),
+        (f"projection: all {bookings // PAGE} pages", walk_all_pages, max(iterations // 20, 3)),
+    ]:
+        await fn()  # warm up
+        print_row(label, summarize(await time_async(fn, n)))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.bookings, args.iterations))
@@ -0,0 +1,105 @@
+"""
+Viral alert: a storm of upvotes on a handful of hot rows.
+
+Compares one `UPDATE ... SET upvotes = upvotes + 1` transaction per vote (with
+`--concurrency` votes in flight) against CounterBuffer, which buffers the votes and
+writes them in batched UPDATEs. Then replays a flushed batch, as a flush retried after
+an unknown outcome would, and checks the ledger kept the totals exact.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_counters.py [--votes 20000] [--hot-rows 5]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_utils import bench_database_url
+from app.services.counters import CounterBuffer, _Batch
+
+SEED_SQL = """
+INSERT INTO community_alerts (id, title, description, type, severity, location_name, report_count,
+                              upvotes, is_verified, created_at)
+SELECT gen_random_uuid(), 'Hot alert ' || i, 'Bench', 'Security', 'High', 'Nairobi', 1, 0, false, now()
+FROM generate_series(1, :rows) AS i
+"""
+
+DIRECT_SQL = text("UPDATE community_alerts SET upvotes = upvotes + 1 WHERE id = :id")
+
+
+async def main(votes: int, hot_rows: int, concurrency: int, flush_interval: float) -> None:
+    engine = create_async_engine(bench_database_url(), pool_size=concurrency, max_overflow=0)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE community_alerts, counter_flushes CASCADE"))
+        await conn.execute(text(SEED_SQL), {"rows": hot_rows})
+        ids = [r[0] for r in (await conn.execute(text("SELECT id FROM community_alerts"))).all()]
+    stream = [random.choice(ids) for _ in range(votes)]
+
+    # One transaction per vote: every vote on a row waits for the previous one's row lock
+    queue = iter(stream)
+
+    async def voter() -> None:
+        for alert_id in queue:
+            async with session_factory() as db:
+                await db.execute(DIRECT_SQL, {"id": alert_id})
+                await db.commit()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[voter() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    print(f"row update per vote:  {votes / elapsed:>10,.0f} votes/s ({elapsed:.2f}s)")
+
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE community_alerts SET upvotes = 0"))
+
+    # Buffered: votes only touch memory; a flusher writes batches every interval
+    buffer = CounterBuffer()
+    buffer.start(session_factory)
+    done = asyncio.Event()
+
+    async def flusher() -> None:
+        while not done.is_set():
+            await asyncio.sleep(flush_interval)
+            await buffer.flush()
+
+    flushing = asyncio.create_task(flusher())
+    start = time.perf_counter()
+    for i, alert_id in enumerate(stream):
+        buffer.increment("alert_upvotes", alert_id)
+        if i % 100 == 0:
+            await asyncio.sleep(0)  # requests interleave with the flusher
+    accepted = time.perf_counter() - start
+    done.set()
+    await flushing
+    await buffer.flush()
+    elapsed = time.perf_counter() - start
+    print(f"buffered increments:  {votes / accepted:>10,.0f} votes/s accepted, all durable after {elapsed:.2f}s "
+          f"in {buffer.stats()['flushes']} flushes")
+
+    # A flush whose commit landed but whose acknowledgement was lost is retried as-is
+    async with engine.connect() as conn:
+        batch_id = (await conn.execute(text("SELECT batch_id FROM counter_flushes LIMIT 1"))).scalar()
+    buffer._unconfirmed.append(_Batch(batch_id, {("alert_upvotes", ids[0]): 1_000}))
+    await buffer.flush()
+
+    async with engine.connect() as conn:
+        total = (await conn.execute(text("SELECT sum(upvotes) FROM community_alerts"))).scalar()
+    status = "ok" if total == votes else "MISMATCH"
+    print(f"stored upvotes {total} of {votes} votes, replayed batches skipped: "
+          f"{buffer.stats()['duplicate_batches_skipped']} ({status})")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--votes", type=int, default=20_000)
+    parser.add_argument("--hot-rows", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--flush-interval", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.votes, args.hot_rows, args.concurrency, args.flush_interval))
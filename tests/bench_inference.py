@@ -0,0 +1,75 @@
+"""
+Scan inference under concurrent load: one-at-a-time vs micro-batched.
+
+Fires `--requests` predictions from `--concurrency` clients at an InferenceEngine
+backed by the configured SCAN_MODEL, once with batching off (max batch 1) and once
+per `--batch-sizes` entry, and prints throughput, end-to-end latency and the engine's
+batch/queue/model metrics. No database needed.
+
+    PYTHONPATH=backend python tests/bench_inference.py [--requests 2000] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from bench_utils import summarize, print_row
+from app.core import tasks
+from app.core.config import settings
+from app.services.inference import InferenceEngine
+
+
+async def run(max_batch_size: int, images, requests: int, concurrency: int, workers: int, wait_ms: float) -> None:
+    engine = InferenceEngine(settings.SCAN_MODEL, workers, max_batch_size, wait_ms, max_queue=requests)
+    engine.start()
+    # Spawn the pool and load the model before timing
+    await asyncio.gather(*[engine.predict(images[0]) for _ in range(workers * max_batch_size)])
+
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def client() -> None:
+        for i in remaining:
+            start = time.perf_counter()
+            await engine.predict(images[i % len(images)])
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    stats = engine.stats()
+
+    label = f"batch<={max_batch_size}"
+    print_row(f"{label}: {requests / elapsed:,.0f} scans/s", summarize(latencies))
+    print(f"    avg batch {stats['avg_batch_size']}, queue wait p50/p95 "
+          f"{stats['queue_wait_p50_ms']}/{stats['queue_wait_p95_ms']}ms, model p50/p95 "
+          f"{stats['model_latency_p50_ms']}/{stats['model_latency_p95_ms']}ms")
+    await tasks.stop_all()
+    await engine.close()
+
+
+async def main(args) -> None:
+    # The engine takes file paths, as the scan endpoint passes them
+    spool = tempfile.TemporaryDirectory()
+    images = []
+    for i in range(32):
+        path = os.path.join(spool.name, f"image-{i}")
+        with open(path, "wb") as f:
+            f.write(os.urandom(args.image_kb * 1024))
+        images.append(path)
+    print(f"{args.requests} scans of {args.image_kb} KB, {args.concurrency} concurrent, "
+          f"{args.workers} workers, model {settings.SCAN_MODEL}")
+    for max_batch_size in [1] + args.batch_sizes:
+        await run(max_batch_size, images, args.requests, args.concurrency, args.workers, args.wait_ms)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=settings.SCAN_INFERENCE_WORKERS)
+    parser.add_argument("--image-kb", type=int, default=200)
+    parser.add_argument("--wait-ms", type=float, default=settings.SCAN_BATCH_MAX_WAIT_MS)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 16, 32])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,107 @@
+"""
+Login storm: do bcrypt logins stall everything else on the worker?
+
+Boots app.main:app in-process (httpx ASGI transport) against a scratch database and
+measures a cheap read endpoint on its own, then while N logins hammer /auth/login.
+With hashing on the thread pool the probe latency stays close to its baseline; pass
+--inline to hash on the event loop (the old behaviour) for comparison.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_login_storm.py [--logins 50] [--inline]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from bench_utils import bench_database_url, summarize, print_row
+
+os.environ["DATABASE_URL"] = bench_database_url()
+
+import httpx  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.database import engine  # noqa: E402
+
+PROBE_ROUTE = "/api/v1/jifunze/guides"
+PROBE_INTERVAL_S = 0.02
+PASSWORD = "storm-password"
+
+SEED_SQL = """
+INSERT INTO diy_guides (id, title, category, difficulty, content, estimated_time_minutes)
+SELECT gen_random_uuid(), 'Guide ' || i, 'Plumbing', 'Easy', 'Steps...', 30 FROM generate_series(1, 50) AS i
+"""
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(PROBE_ROUTE)
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(PROBE_INTERVAL_S)
+    return samples
+
+
+async def login(client: httpx.AsyncClient) -> tuple:
+    start = time.perf_counter()
+    response = await client.post("/api/v1/auth/login", json={"login_identifier": "+254700000001", "password": PASSWORD})
+    return (time.perf_counter() - start) * 1000, response.status_code
+
+
+async def main(logins: int, inline: bool) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE diy_guides, users CASCADE"))
+        await conn.execute(text(SEED_SQL))
+        await conn.execute(
+            text("INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified) "
+                 "VALUES (gen_random_uuid(), '+254700000001', :hash, 'consumer', true, true)"),
+            {"hash": security.pwd_context.hash(PASSWORD)},
+        )
+
+    if inline:
+        async def run_inline(fn, *args):
+            return fn(*args)
+        security.password_hasher.run = run_inline
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(PROBE_ROUTE)  # warm up pool
+
+        stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, stop))
+        await asyncio.sleep(2)
+        stop.set()
+        baseline = await baseline_task
+
+        stop = asyncio.Event()
+        storm_probe = asyncio.create_task(probe(client, stop))
+        start = time.perf_counter()
+        results = await asyncio.gather(*[login(client) for _ in range(logins)])
+        storm_s = time.perf_counter() - start
+        stop.set()
+        during = await storm_probe
+
+    statuses = {}
+    for _, code in results:
+        statuses[code] = statuses.get(code, 0) + 1
+
+    mode = "inline (event loop)" if inline else "thread pool"
+    print(f"hashing: {mode}, {logins} concurrent logins in {storm_s:.2f}s, statuses {statuses}")
+    print_row(f"{PROBE_ROUTE} baseline", summarize(baseline))
+    print_row(f"{PROBE_ROUTE} during storm", summarize(during))
+    print_row("login", summarize([ms for ms, code in results if code == 200]))
+    if not inline:
+        print(f"pool: {security.password_hasher.stats()}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop for comparison")
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.inline))
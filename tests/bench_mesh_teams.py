@@ -0,0 +1,107 @@
+"""
+GET /mesh/my-teams for a user in hundreds of teams.
+
+Seeds background teams and one busy user who leads some teams and is an active member
+of many more (each team with ~10 members). Times the old two-query + Python dedupe
+lookup against the UNION membership query, cold (membership cache empty) and warm,
+both returning every team with its members.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_mesh_teams.py [--teams 300] [--led 20]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from bench_utils import bench_database_url, summarize, print_row, time_async
+from app.models.mesh import MeshTeam, MeshMember
+from app.services.mesh_membership import mesh_membership
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified)
+SELECT CASE WHEN i = 0 THEN CAST(:user_id AS uuid) ELSE gen_random_uuid() END,
+       '+2547' || lpad(i::text, 8, '0'), 'x', 'provider', true, true
+FROM generate_series(0, 20000) AS i;
+
+INSERT INTO mesh_teams (id, name, leader_id, created_at)
+SELECT gen_random_uuid(), 'Team ' || i,
+       CASE WHEN i <= :led THEN CAST(:user_id AS uuid) ELSE u.ids[1 + i % 20000] END,
+       now() - i * interval '1 minute'
+FROM generate_series(1, :background) AS i, (SELECT array_agg(id) AS ids FROM users) u;
+
+INSERT INTO mesh_members (id, team_id, user_id, role, status, joined_at)
+SELECT gen_random_uuid(), t.id, u.ids[1 + (abs(hashtext(t.id::text)) + k * 7919) % 20000], 'Member',
+       CASE WHEN k % 10 = 9 THEN 'Left' ELSE 'Active' END, now()
+FROM mesh_teams t, generate_series(1, 10) AS k, (SELECT array_agg(id) AS ids FROM users WHERE phone <> '+254700000000') u;
+
+INSERT INTO mesh_members (id, team_id, user_id, role, status, joined_at)
+SELECT gen_random_uuid(), id, CAST(:user_id AS uuid), 'Member', 'Active', now()
+FROM mesh_teams
+WHERE leader_id <> CAST(:user_id AS uuid)
+ORDER BY id
+LIMIT :member_of
+"""
+
+
+async def main(teams: int, led: int, background: int, iterations: int) -> None:
+    engine = create_async_engine(bench_database_url())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE mesh_members, mesh_teams, users CASCADE"))
+        params = {"user_id": USER_ID, "led": led, "background": background, "member_of": teams - led}
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                used = {k: v for k, v in params.items() if f":{k}" in statement}
+                await conn.execute(text(statement), used)
+        await conn.execute(text("ANALYZE"))
+    print(f"user leads {led} and is an active member of {teams - led} of {background:,} teams")
+
+    async def legacy():
+        async with session_factory() as db:
+            led_teams = (await db.execute(
+                select(MeshTeam).where(MeshTeam.leader_id == USER_ID).options(selectinload(MeshTeam.members))
+            )).scalars().all()
+            member_teams = (await db.execute(
+                select(MeshTeam).join(MeshMember)
+                .where(MeshMember.user_id == USER_ID, MeshMember.status == "Active")
+                .options(selectinload(MeshTeam.members))
+            )).scalars().all()
+            return list({t.id: t for t in (led_teams + member_teams)}.values())
+
+    async def membership_lookup():
+        async with session_factory() as db:
+            team_ids = await mesh_membership.team_ids(db, USER_ID)
+            return (await db.execute(
+                select(MeshTeam).where(MeshTeam.id.in_(team_ids)).options(selectinload(MeshTeam.members))
+                .order_by(MeshTeam.created_at.desc(), MeshTeam.id).limit(teams)
+            )).scalars().all()
+
+    async def cold():
+        mesh_membership.invalidate(USER_ID)
+        return await membership_lookup()
+
+    print(f"legacy returns {len(await legacy())} teams, union lookup {len(await cold())}")
+    for label, fn in [
+        ("legacy: two queries + dedupe", legacy),
+        ("union, membership cache cold", cold),
+        ("union, membership cache warm", membership_lookup),
+    ]:
+        await fn()  # warm up
+        print_row(label, summarize(await time_async(fn, iterations)))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--teams", type=int, default=300)
+    parser.add_argument("--led", type=int, default=20)
+    parser.add_argument("--background", type=int, default=50_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.teams, args.led, args.background, args.iterations))
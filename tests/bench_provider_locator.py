@@ -0,0 +1,54 @@
+"""
+Nearest-provider lookup for Emergency SOS at city scale (in memory, no database).
+
+Builds a ProviderLocator over synthetic providers spread across greater Nairobi and
+reports query latency and incremental update cost.
+
+    PYTHONPATH=backend python tests/bench_provider_locator.py [--providers 50000]
+"""
+import argparse
+import random
+import time
+
+from bench_utils import summarize, print_row, time_sync
+from app.services.provider_locator import ProviderLocator
+
+# Greater Nairobi bounding box
+LAT_RANGE = (-1.45, -1.10)
+LNG_RANGE = (36.65, 37.10)
+CATEGORIES = ["Electrical", "Plumbing", "Cleaning", "Painting", "Fumigation", "Mechanic", "Solar", "Carpentry"]
+
+
+def random_point(rng: random.Random):
+    return rng.uniform(*LAT_RANGE), rng.uniform(*LNG_RANGE)
+
+
+def main(providers: int, queries: int, k: int) -> None:
+    rng = random.Random(42)
+    locator = ProviderLocator()
+
+    start = time.perf_counter()
+    for i in range(providers):
+        lat, lng = random_point(rng)
+        locator.upsert(f"p{i}", rng.choice(CATEGORIES), lat, lng, rng.choice([3, 5, 10, 15, 25]))
+    build_s = time.perf_counter() - start
+    print(f"indexed {len(locator):,} providers in {build_s:.2f}s")
+
+    points = [(rng.choice(CATEGORIES), *random_point(rng)) for _ in range(queries)]
+    it = iter(points)
+    samples = time_sync(lambda: locator.nearest(*next(it), k=k), queries)
+    print_row(f"nearest k={k} @ {providers:,}", summarize(samples))
+
+    moves = [(f"p{rng.randrange(providers)}", rng.choice(CATEGORIES), *random_point(rng)) for _ in range(queries)]
+    it = iter(moves)
+    samples = time_sync(lambda: locator.upsert(*next(it), 10), queries)
+    print_row("upsert (move provider)", summarize(samples))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+    main(args.providers, args.queries, args.k)
@@ -0,0 +1,101 @@
+"""
+Provider search latency at directory scale.
+
+Seeds 100k and then 1M providers into a scratch database and reports p50/p95/p99
+for the ranked search query used by GET /providers/?search=...
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_provider_search.py [--sizes 100000,1000000]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import text, select, desc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from bench_utils import bench_database_url, summarize, print_row, time_async
+from app.models.provider import Provider
+from app.services.provider_search import provider_search_service
+
+SEARCH_TERMS = [
+    "plumb", "juma electric", "wanjiku cleaning", "painting", "fumigation",
+    "mechanic", "kamau", "solar install", "carpentry", "electrcian",  # typo on purpose
+]
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type, is_verified, is_active)
+SELECT gen_random_uuid(), '+2547' || lpad(i::text, 8, '0'), 'x', 'provider', true, true
+FROM generate_series(:start, :stop - 1) AS i;
+
+INSERT INTO providers (user_id, business_name, trade_category, specialization_tags,
+                       service_locations, operating_radius_km, subscription_tier,
+                       trust_score, rehire_rate, response_time_avg, jobs_completed,
+                       verification_status, verification_notes)
+SELECT u.id,
+       (ARRAY['Juma','Wanjiku','Kamau','Achieng','Otieno','Mwangi','Njeri','Baraka'])[1 + (n % 8)]
+         || ' ' || (ARRAY['Electricals','Plumbing Works','Cleaning','Painters','Fumigation','Motors','Solar','Carpentry'])[1 + ((n / 8) % 8)]
+         || ' ' || n,
+       (ARRAY['Electrical','Plumbing','Cleaning','Painting','Fumigation','Mechanic','Solar','Carpentry'])[1 + ((n / 8) % 8)],
+       ARRAY[]::varchar[], ARRAY['Kilimani']::varchar[], 10, 'free',
+       (n * 37) % 101, 0, 0, 0, 'verified',
+       CASE WHEN n % 5 = 0 THEN 'NCA accredited, insured' ELSE NULL END
+FROM (
+    SELECT id, substr(phone, 6)::int AS n FROM users
+    WHERE phone >= :lo_phone AND phone < :hi_phone
+) AS u;
+"""
+
+
+def search_query(term: str):
+    score = provider_search_service.score(term)
+    return (
+        provider_search_service.filter(select(Provider), term)
+        .order_by(desc(score), desc(Provider.user_id))
+        .limit(20)
+    )
+
+
+async def seed(conn, start: int, stop: int) -> None:
+    params = {
+        "start": start,
+        "stop": stop,
+        "lo_phone": f"+2547{start:08d}",
+        "hi_phone": f"+2547{stop:08d}",
+    }
+    for statement in SEED_SQL.split(";"):
+        if statement.strip():
+            # asyncpg rejects unused bind params, so only pass what the statement names
+            used = {k: v for k, v in params.items() if f":{k}" in statement}
+            await conn.execute(text(statement), used)
+
+
+async def main(sizes, iterations: int) -> None:
+    engine = create_async_engine(bench_database_url())
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE providers, users CASCADE"))
+
+    seeded = 0
+    for size in sizes:
+        async with engine.begin() as conn:
+            await seed(conn, seeded, size)
+            await conn.execute(text("ANALYZE providers"))
+        seeded = size
+
+        async with engine.connect() as conn:
+            for term in SEARCH_TERMS[:1]:  # warm caches
+                await conn.execute(search_query(term))
+
+            samples = []
+            for term in SEARCH_TERMS:
+                query = search_query(term)
+                samples += await time_async(lambda: conn.execute(query), iterations)
+            print_row(f"ranked search @ {size:,} providers", summarize(samples))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main([int(s) for s in args.sizes.split(",")], args.iterations))
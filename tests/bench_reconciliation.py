@@ -0,0 +1,120 @@
+"""
+Month-end burst of M-Pesa confirmations through PaymentReconciler.
+
+Seeds bookings with in-flight STK requests, then submits one confirmation per booking
+all at once, shuffled, with a share of duplicate callbacks and a share arriving before
+their STK request has a checkout id (out of order). Reports confirmations/second and
+how many batched round trips it took, then checks every booking balance.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_reconciliation.py [--bookings 10000]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_utils import bench_database_url
+from app.core import tasks
+from app.services.payment_reconciler import Confirmation, payment_reconciler
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified)
+VALUES ('00000000-0000-0000-0000-000000000001', '+254700000001', 'x', 'provider', true, true),
+       ('00000000-0000-0000-0000-000000000002', '+254700000002', 'x', 'consumer', true, true);
+
+INSERT INTO providers (user_id, business_name, trade_category, specialization_tags, service_locations,
+                       operating_radius_km, subscription_tier, trust_score, rehire_rate,
+                       response_time_avg, jobs_completed, verification_status)
+VALUES ('00000000-0000-0000-0000-000000000001', 'Bench Plumbing', 'Plumbing', ARRAY[]::varchar[],
+        ARRAY['Kilimani']::varchar[], 10, 'free', 50, 0, 0, 0, 'verified');
+
+INSERT INTO bookings (id, provider_id, consumer_id, quoted_price, accepted_price, deposit_amount, payment_plan,
+                      installment_count, paid_amount, remaining_amount, next_payment_due,
+                      scheduled_date, scheduled_time, status, payment_status)
+SELECT gen_random_uuid(), '00000000-0000-0000-0000-000000000001', '00000000-0000-0000-0000-000000000002',
+       1000, 1000, 0, CASE WHEN i % 2 = 0 THEN 'installments' ELSE 'full' END,
+       CASE WHEN i % 2 = 0 THEN 2 ELSE 1 END, 0, 1000,
+       CASE WHEN i % 2 = 0 THEN now() + interval '30 days' END,
+       now(), '10:00', 'pending_payment', 'pending'
+FROM generate_series(1, :bookings) AS i;
+
+INSERT INTO payment_requests (id, booking_id, user_id, phone_number, amount, status, attempts, checkout_request_id)
+SELECT gen_random_uuid(), id, consumer_id, '254700000002', 1000, 'sent', 1, 'ws_CO_' || id
+FROM bookings
+"""
+
+
+async def main(bookings: int, duplicate_rate: float, late_rate: float) -> None:
+    engine = create_async_engine(bench_database_url())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "TRUNCATE payment_confirmations, payment_requests, bookings, providers, users CASCADE"
+        ))
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                used = {"bookings": bookings} if ":bookings" in statement else {}
+                await conn.execute(text(statement), used)
+        rows = (await conn.execute(text("SELECT checkout_request_id FROM payment_requests"))).all()
+        checkout_ids = [r[0] for r in rows]
+        # Out of order: these callbacks land before the worker has stored the checkout id
+        late = set(random.sample(checkout_ids, int(len(checkout_ids) * late_rate)))
+        await conn.execute(
+            text("UPDATE payment_requests SET checkout_request_id = NULL, status = 'sending' "
+                 "WHERE checkout_request_id = ANY(:ids)"),
+            {"ids": list(late)},
+        )
+
+    confirmations = [
+        Confirmation(receipt=f"R{i:09d}", checkout_request_id=checkout_id, amount=1000.0, phone_number="254700000002")
+        for i, checkout_id in enumerate(checkout_ids)
+    ]
+    burst = confirmations + random.sample(confirmations, int(len(confirmations) * duplicate_rate))
+    random.shuffle(burst)
+
+    payment_reconciler.start(session_factory)
+    start = time.perf_counter()
+    await asyncio.gather(*[payment_reconciler.submit(c) for c in burst])
+    elapsed = time.perf_counter() - start
+    stats = payment_reconciler.stats()
+    print(f"{len(burst)} callbacks ({len(burst) - len(confirmations)} duplicates, {len(late)} early) "
+          f"in {elapsed:.2f}s -> {len(burst) / elapsed:,.0f}/s over {stats['flushes']} flushes")
+
+    # The STK workers catch up and store the missing checkout ids; the periodic pass applies the rest
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "UPDATE payment_requests SET checkout_request_id = 'ws_CO_' || booking_id, status = 'sent' "
+            "WHERE checkout_request_id IS NULL"
+        ))
+    start = time.perf_counter()
+    await payment_reconciler.apply_pending()
+    print(f"late confirmations applied in {time.perf_counter() - start:.2f}s")
+    await tasks.stop_all()
+
+    async with engine.connect() as conn:
+        check = (await conn.execute(text("""
+            SELECT count(*) FILTER (WHERE paid_amount = 1000 AND remaining_amount = 0
+                                    AND payment_status = 'paid' AND next_payment_due IS NULL),
+                   count(*),
+                   (SELECT count(*) FROM payment_confirmations WHERE applied_at IS NULL),
+                   (SELECT count(*) FROM payment_requests WHERE status <> 'completed')
+            FROM bookings
+        """))).one()
+    settled, total, unapplied, unsettled = check
+    status = "ok" if settled == total and not unapplied and not unsettled else "MISMATCH"
+    print(f"bookings fully paid: {settled}/{total}, unapplied: {unapplied}, unsettled requests: {unsettled} ({status})")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=10_000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--late-rate", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.bookings, args.duplicate_rate, args.late_rate))
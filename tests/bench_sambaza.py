@@ -0,0 +1,114 @@
+"""
+Sambaza expiry sweeper and open-groups listing at 1M historical groups.
+
+Seeds mostly closed history plus a backlog of expired-but-forming groups and a set of
+live ones spread over suburbs, then times:
+  * the sweeper closing the backlog in batches (SambazaService.close_expired)
+  * the GET /sambaza/active query per suburb, before and after the sweep
+
+Pass --without-index to drop ix_sambaza_groups_status_expires_at for comparison.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_sambaza.py [--groups 1000000]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bench_utils import bench_database_url, summarize, print_row, time_async
+from app.core.pagination import keyset
+from app.models.sambaza import SambazaGroup
+from app.services.sambaza import sambaza_service
+
+SUBURBS = [f"Suburb {i}" for i in range(50)]
+
+# 90% closed history, 5% expired but still forming (sweeper backlog), 5% live
+SEED_SQL = """
+INSERT INTO sambaza_groups (id, title, service_category, suburb, organizer_id, participant_count,
+                            target_count, discount_tier, expires_at, status, created_at, updated_at)
+SELECT gen_random_uuid(), 'Group ' || i, 'Fumigation', 'Suburb ' || (i % 50), 'organizer',
+       1 + i % 10, 10, '0%',
+       CASE WHEN i % 20 = 0 THEN now() + (i % 7 + 1) * interval '1 day'
+            ELSE now() - (i % 365 + 1) * interval '1 day' END,
+       CASE WHEN i % 20 IN (0, 1) THEN 'forming' ELSE 'closed' END,
+       now() - (i % 365 + 8) * interval '1 day', now()
+FROM generate_series(1, :groups) AS i
+"""
+
+
+def active_query(suburb: str, limit: int = 50):
+    query = select(SambazaGroup).where(
+        SambazaGroup.status == "forming",
+        SambazaGroup.expires_at > func.now(),
+        func.lower(SambazaGroup.suburb) == suburb.lower(),
+    )
+    return keyset(query, [SambazaGroup.expires_at, SambazaGroup.id], None, limit, descending=False)
+
+
+async def bench_listing(session_factory, label: str, iterations: int) -> None:
+    async with session_factory() as db:
+        async def list_once():
+            await db.execute(active_query(random.choice(SUBURBS)))
+        await list_once()
+        print_row(label, summarize(await time_async(list_once, iterations)))
+
+
+async def main(groups: int, iterations: int, batch_size: int, without_index: bool) -> None:
+    engine = create_async_engine(bench_database_url())
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE sambaza_groups CASCADE"))
+        await conn.execute(text(SEED_SQL), {"groups": groups})
+        if without_index:
+            await conn.execute(text("DROP INDEX IF EXISTS ix_sambaza_groups_status_expires_at"))
+        await conn.execute(text("ANALYZE sambaza_groups"))
+    print(f"seeded {groups} groups ({'without' if without_index else 'with'} (status, expires_at) index)")
+
+    await bench_listing(session_factory, "list active (before sweep)", iterations)
+
+    batch_times = []
+    start = time.perf_counter()
+    closed = 0
+    while True:
+        batch_start = time.perf_counter()
+        n = await sambaza_service.close_expired(session_factory, batch_size, max_batches=1)
+        batch_times.append((time.perf_counter() - batch_start) * 1000)
+        closed += n
+        if n < batch_size:
+            break
+    print(f"sweeper closed {closed} groups in {time.perf_counter() - start:.2f}s")
+    print_row(f"sweep batch ({batch_size} rows)", summarize(batch_times))
+
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE sambaza_groups"))
+    await bench_listing(session_factory, "list active (after sweep)", iterations)
+
+    async with engine.connect() as conn:
+        plan = await conn.execute(text(
+            "EXPLAIN SELECT * FROM sambaza_groups WHERE status = 'forming' AND expires_at > now() "
+            "AND lower(suburb) = 'suburb 7' ORDER BY expires_at, id LIMIT 51"
+        ))
+        print("plan:", " / ".join(row[0].strip() for row in plan))
+
+    if without_index:
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE INDEX ix_sambaza_groups_status_expires_at ON sambaza_groups (status, expires_at)"
+            ))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--groups", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--without-index", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.groups, args.iterations, args.batch_size, args.without_index))
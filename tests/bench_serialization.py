@@ -0,0 +1,105 @@
+"""
+Serialization cost of the list endpoints, per 1,000 rows.
+
+"before" is what FastAPI does with a `response_model` and the stdlib JSONResponse:
+validate the returned objects, dump them to jsonable dicts, then json.dumps.
+"orjson" is the same pass rendered by ORJSONResponse (now the app default), and
+"adapter" is app.core.serialization.json_list: one validate + dump_json through the
+precompiled TypeAdapter. No database needed; rows are attribute objects shaped like
+the ORM rows the endpoints return.
+
+    PYTHONPATH=backend python tests/bench_serialization.py [--rows 1000] [--iterations 200]
+"""
+import argparse
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from bench_utils import summarize, print_row, time_async
+from app.core.serialization import json_list
+from app.schemas.alert import AlertOut, AlertListAdapter
+from app.schemas.booking import BookingListSchema, BookingListAdapter
+from app.schemas.jifunze import DIYGuideOut, DIYGuideListAdapter
+from app.schemas.provider import ProviderResponse, ProviderListAdapter
+
+NOW = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+def providers(n: int) -> list:
+    return [SimpleNamespace(
+        user_id=uuid.uuid4(), business_name=f"Provider {i}", trade_category="Plumbing",
+        specialization_tags=["leaks", "boreholes"], service_locations=["Kilimani", "Kileleshwa"],
+        operating_radius_km=10, lat=-1.29 + i / 1e5, lng=36.78, verification_status="verified",
+        subscription_tier="pro", trust_score=80, jobs_completed=i, is_verified=True,
+    ) for i in range(n)]
+
+
+def alerts(n: int) -> list:
+    return [SimpleNamespace(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), title=f"Water outage {i}", description="No water since morning",
+        type="water", severity="medium", location_name="Kilimani", lat=-1.29, lng=36.78,
+        upvotes=i % 40, is_verified=False, created_at=NOW - timedelta(minutes=i),
+    ) for i in range(n)]
+
+
+def guides(n: int) -> list:
+    return [SimpleNamespace(
+        id=uuid.uuid4(), title=f"Fix a leaking tap {i}", category="Plumbing", difficulty="easy",
+        content="Turn off the supply, then replace the washer. " * 10, video_url=None,
+        tools_required=["spanner", "washer"], estimated_time_minutes=30,
+    ) for i in range(n)]
+
+
+def bookings(n: int) -> list:
+    return [{
+        "id": str(uuid.uuid4()), "provider_name": f"Provider {i}", "service_name": "Service",
+        "date": (NOW - timedelta(hours=i)).strftime("%Y-%m-%d %H:%M"), "amount": "KES 1500.0",
+        "status": "completed", "image": f"https://api.dicebear.com/7.x/avataaars/svg?seed=Provider {i}",
+    } for i in range(n)]
+
+
+def response_model_path(schema, rows, response_class):
+    field = create_response_field(name=f"Response_{schema.__name__}", type_=List[schema])
+
+    async def run():
+        content = await serialize_response(field=field, response_content=rows)
+        return response_class(content).body
+    return run
+
+
+async def main(rows: int, iterations: int) -> None:
+    cases = [
+        ("providers", ProviderResponse, ProviderListAdapter, providers(rows)),
+        ("alerts", AlertOut, AlertListAdapter, alerts(rows)),
+        ("guides", DIYGuideOut, DIYGuideListAdapter, guides(rows)),
+        ("bookings", BookingListSchema, BookingListAdapter, bookings(rows)),
+    ]
+    print(f"{rows} rows per response")
+    for name, schema, adapter, data in cases:
+        before = response_model_path(schema, data, JSONResponse)
+        with_orjson = response_model_path(schema, data, ORJSONResponse)
+
+        async def adapted():
+            return json_list(adapter, data, Response()).body
+
+        # Same document either way
+        assert json.loads(await before()) == json.loads(await adapted()), name
+        for label, fn in [("before", before), ("orjson", with_orjson), ("adapter", adapted)]:
+            await fn()  # warm up
+            print_row(f"{name}: {label}", summarize(await time_async(fn, iterations)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.iterations))
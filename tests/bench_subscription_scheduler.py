@@ -0,0 +1,102 @@
+"""
+Subscription scheduler throughput with several workers draining the same backlog.
+
+Seeds N due subscriptions (half with a preferred provider -> bookings, half without ->
+job requests) plus not-yet-due ones, runs W concurrent schedulers until the backlog is
+empty, and reports subscriptions processed per minute. Also checks that every due
+subscription produced exactly one visit (SKIP LOCKED must never double-claim) and
+none is left due.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_subscription_scheduler.py [--due 100000 --workers 4]
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_utils import bench_database_url, summarize, print_row
+from app.services.subscription_scheduler import subscription_scheduler
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type, is_active, is_verified)
+SELECT gen_random_uuid(), '+2547' || lpad(i::text, 8, '0'), 'x',
+       CASE WHEN i < 1000 THEN 'provider' ELSE 'consumer' END, true, true
+FROM generate_series(0, 10999) AS i;
+
+INSERT INTO providers (user_id, business_name, trade_category, specialization_tags, service_locations,
+                       operating_radius_km, subscription_tier, trust_score, rehire_rate,
+                       response_time_avg, jobs_completed, verification_status)
+SELECT id, 'Provider ' || phone, 'Cleaning', ARRAY[]::varchar[], ARRAY['Kilimani']::varchar[],
+       10, 'free', 50, 0, 0, 0, 'verified'
+FROM users WHERE user_type = 'provider';
+
+INSERT INTO maintenance_subscriptions (id, user_id, provider_id, service_type, frequency, status, next_run_date, created_at)
+SELECT gen_random_uuid(), c.id, CASE WHEN i % 2 = 0 THEN p.user_id END, 'Cleaning',
+       (ARRAY['weekly','biweekly','monthly','quarterly'])[1 + i % 4], 'Active',
+       CASE WHEN i <= :due THEN (now() AT TIME ZONE 'UTC') - (i % 1440) * interval '1 minute'
+            ELSE (now() AT TIME ZONE 'UTC') + interval '1 day' END,
+       now() AT TIME ZONE 'UTC'
+FROM generate_series(1, :total) AS i
+JOIN LATERAL (SELECT id FROM users WHERE user_type = 'consumer' OFFSET (i % 10000) LIMIT 1) c ON true
+JOIN LATERAL (SELECT user_id FROM providers OFFSET (i % 1000) LIMIT 1) p ON true
+"""
+
+
+async def worker(session_factory, batch_size: int, batch_times: list) -> int:
+    total = 0
+    while True:
+        start = time.perf_counter()
+        n = await subscription_scheduler.run_due(session_factory, batch_size, max_batches=1)
+        batch_times.append((time.perf_counter() - start) * 1000)
+        total += n
+        if n == 0:
+            return total
+
+
+async def main(due: int, workers: int, batch_size: int) -> None:
+    engine = create_async_engine(bench_database_url(), pool_size=workers + 2)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    params = {"due": due, "total": due * 2}
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE bookings, job_requests, maintenance_subscriptions, providers, users CASCADE"))
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                used = {k: v for k, v in params.items() if f":{k}" in statement}
+                await conn.execute(text(statement), used)
+        await conn.execute(text("ANALYZE"))
+    print(f"seeded {due} due subscriptions (+{due} not yet due), {workers} workers, batch {batch_size}")
+
+    batch_times: list = []
+    start = time.perf_counter()
+    counts = await asyncio.gather(*[worker(session_factory, batch_size, batch_times) for _ in range(workers)])
+    elapsed = time.perf_counter() - start
+
+    processed = sum(counts)
+    print(f"processed {processed} in {elapsed:.2f}s -> {processed / elapsed * 60:,.0f} subscriptions/minute")
+    print(f"per worker: {counts}")
+    print_row("batch", summarize(batch_times))
+
+    async with engine.connect() as conn:
+        visits = (await conn.execute(text(
+            "SELECT (SELECT count(*) FROM bookings WHERE subscription_id IS NOT NULL)"
+            " + (SELECT count(*) FROM job_requests WHERE subscription_id IS NOT NULL)"
+        ))).scalar()
+        still_due = (await conn.execute(text(
+            "SELECT count(*) FROM maintenance_subscriptions WHERE next_run_date <= now() AT TIME ZONE 'UTC'"
+        ))).scalar()
+    status = "ok" if visits == processed == due and not still_due else "MISMATCH"
+    print(f"visits created: {visits} for {due} due subscriptions, {still_due} still due ({status})")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--due", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.due, args.workers, args.batch_size))
@@ -0,0 +1,103 @@
+"""
+Nightly trust score rebuild vs. scoring providers one at a time.
+
+Seeds providers with reviews, bookings and vouches into a scratch database, then times
+TrustScoreRebuildJob (chunked streaming + NumPy + one bulk UPDATE per chunk) against a
+loop calling TrustScoreService.calculate_score and updating each provider individually.
+
+    BENCH_DATABASE_URL=... PYTHONPATH=backend python tests/bench_trust_score_rebuild.py \
+        [--providers 20000] [--reviews-per-provider 50]
+"""
+import argparse
+import asyncio
+import resource
+import time
+
+from sqlalchemy import text, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from bench_utils import bench_database_url
+from app.models.provider import Provider
+from app.services.trust_score import trust_score_service
+from app.services.trust_score_rebuild import TrustScoreRebuildJob
+
+SEED_SQL = """
+INSERT INTO users (id, phone, password_hash, user_type)
+SELECT gen_random_uuid(), '+2547' || lpad(i::text, 8, '0'), 'x', 'provider'
+FROM generate_series(1, :providers) AS i;
+
+INSERT INTO providers (user_id, business_name, trade_category, trust_score, jobs_completed, response_time_avg)
+SELECT id, 'Bench ' || phone, 'Plumbing', 0, 0, 0 FROM users;
+
+CREATE TEMP TABLE bench_ids AS
+SELECT row_number() OVER (ORDER BY user_id) AS n, user_id FROM providers;
+
+INSERT INTO reviews (id, reviewee_id, overall_rating, is_verified, helpful_count)
+SELECT gen_random_uuid(), b.user_id, 1 + (i % 5), true, 0
+FROM generate_series(1, :providers * :reviews_per_provider) AS i
+JOIN bench_ids b ON b.n = 1 + (i % :providers);
+
+INSERT INTO bookings (id, provider_id, consumer_id, quoted_price, scheduled_date, scheduled_time,
+                      status, created_at, responded_at)
+SELECT gen_random_uuid(), b.user_id, b.user_id, 1000, now(), '09:00',
+       CASE WHEN i % 10 = 0 THEN 'cancelled' ELSE 'completed' END,
+       now() - interval '2 hours', now() - interval '2 hours' + (i % 180) * interval '1 minute'
+FROM generate_series(1, :providers * 5) AS i
+JOIN bench_ids b ON b.n = 1 + (i % :providers);
+
+INSERT INTO vouches (id, provider_id, endorsement_text, weight)
+SELECT gen_random_uuid(), b.user_id, 'Reliable', 1.0
+FROM generate_series(1, :providers * 2) AS i
+JOIN bench_ids b ON b.n = 1 + (i % :providers);
+"""
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def per_provider_baseline(engine, sample: int) -> float:
+    async with AsyncSession(engine) as db:
+        ids = (await db.execute(select(Provider.user_id).limit(sample))).scalars().all()
+        start = time.perf_counter()
+        for provider_id in ids:
+            score = await trust_score_service.calculate_score(provider_id, db)
+            await db.execute(update(Provider).where(Provider.user_id == provider_id).values(trust_score=round(score)))
+        await db.commit()
+        return (time.perf_counter() - start) / len(ids)
+
+
+async def main(providers: int, reviews_per_provider: int, sample: int) -> None:
+    engine = create_async_engine(bench_database_url())
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE reviews, vouches, bookings, provider_stats, providers, users CASCADE"))
+        params = {"providers": providers, "reviews_per_provider": reviews_per_provider}
+        for statement in SEED_SQL.split(";"):
+            if statement.strip():
+                used = {k: v for k, v in params.items() if f":{k}" in statement}
+                await conn.execute(text(statement), used)
+        await conn.execute(text("ANALYZE"))
+    print(f"seeded {providers:,} providers, {providers * reviews_per_provider:,} reviews")
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    done = await TrustScoreRebuildJob().run(engine)
+    elapsed = time.perf_counter() - start
+    print(f"rebuild job:     {done:,} providers in {elapsed:8.2f}s  "
+          f"({elapsed / done * 1e6:8.1f}us/provider, peak RSS +{peak_rss_mb() - rss_before:.0f}MB)")
+
+    per_provider = await per_provider_baseline(engine, min(sample, providers))
+    print(f"per-provider:    {per_provider * 1e6:8.1f}us/provider  "
+          f"(extrapolated {per_provider * providers:8.2f}s for {providers:,}; "
+          f"{per_provider * done / elapsed:.1f}x slower)")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--providers", type=int, default=20_000)
+    parser.add_argument("--reviews-per-provider", type=int, default=50)
+    parser.add_argument("--baseline-sample", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.providers, args.reviews_per_provider, args.baseline_sample))
@@ -0,0 +1,8 @@
+"""
+Unit tests run from the repo root with the backend on the path:
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
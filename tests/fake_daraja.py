@@ -0,0 +1,118 @@
+"""
+Local stand-in for Safaricom's Daraja API, for load-testing the STK push pipeline
+without the sandbox's rate limits.
+
+Implements the two endpoints the app calls (OAuth token and STK push) and, like the
+real thing, POSTs the result to the request's CallBackURL a little later. Latency,
+transient 503s and customer cancellations can be injected to exercise retries.
+
+    python tests/fake_daraja.py --port 8089 [--latency-ms 150] [--error-rate 0.05] [--cancel-rate 0.1]
+
+and run the API with:
+
+    MPESA_BASE_URL=http://localhost:8089 MPESA_CONSUMER_KEY=fake MPESA_CONSUMER_SECRET=fake \\
+        MPESA_PASSKEY=fake MPESA_CALLBACK_TOKEN=fake uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import random
+import secrets
+from datetime import datetime
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException, Request
+
+app = FastAPI(title="Fake Daraja")
+config = argparse.Namespace(latency_ms=150, error_rate=0.0, cancel_rate=0.0, callback_delay_ms=2000)
+stats = {"tokens": 0, "pushes": 0, "errors": 0, "callbacks": 0, "callback_failures": 0}
+_tokens = set()
+_callback_client: httpx.AsyncClient = None
+
+
+@app.on_event("startup")
+async def start_client():
+    global _callback_client
+    _callback_client = httpx.AsyncClient(timeout=10)
+
+
+@app.on_event("shutdown")
+async def close_client():
+    await _callback_client.aclose()
+
+
+@app.get("/oauth/v1/generate")
+async def generate_token(grant_type: str):
+    token = secrets.token_hex(16)
+    _tokens.add(token)
+    stats["tokens"] += 1
+    return {"access_token": token, "expires_in": "3599"}
+
+
+@app.post("/mpesa/stkpush/v1/processrequest")
+async def process_request(request: Request, authorization: str = Header("")):
+    if authorization.removeprefix("Bearer ") not in _tokens:
+        raise HTTPException(status_code=401, detail="Invalid Access Token")
+    await asyncio.sleep(config.latency_ms / 1000 * random.uniform(0.5, 1.5))
+    if random.random() < config.error_rate:
+        stats["errors"] += 1
+        raise HTTPException(status_code=503, detail="Service Unavailable")
+
+    body = await request.json()
+    merchant_request_id = f"{random.randint(10000, 99999)}-{random.randint(10**7, 10**8 - 1)}-1"
+    checkout_request_id = f"ws_CO_{datetime.now():%d%m%Y%H%M%S}{secrets.token_hex(6)}"
+    stats["pushes"] += 1
+    asyncio.create_task(send_callback(body, merchant_request_id, checkout_request_id))
+    return {
+        "MerchantRequestID": merchant_request_id,
+        "CheckoutRequestID": checkout_request_id,
+        "ResponseCode": "0",
+        "ResponseDescription": "Success. Request accepted for processing",
+        "CustomerMessage": "Success. Request accepted for processing",
+    }
+
+
+async def send_callback(body: dict, merchant_request_id: str, checkout_request_id: str) -> None:
+    # The customer enters their PIN (or cancels) a moment after the prompt appears
+    await asyncio.sleep(config.callback_delay_ms / 1000 * random.uniform(0.5, 1.5))
+    callback = {"MerchantRequestID": merchant_request_id, "CheckoutRequestID": checkout_request_id}
+    if random.random() < config.cancel_rate:
+        callback.update(ResultCode=1032, ResultDesc="Request cancelled by user")
+    else:
+        callback.update(
+            ResultCode=0,
+            ResultDesc="The service request is processed successfully.",
+            CallbackMetadata={"Item": [
+                {"Name": "Amount", "Value": body["Amount"]},
+                {"Name": "MpesaReceiptNumber", "Value": secrets.token_hex(5).upper()},
+                {"Name": "TransactionDate", "Value": int(f"{datetime.now():%Y%m%d%H%M%S}")},
+                {"Name": "PhoneNumber", "Value": int(body["PhoneNumber"])},
+            ]},
+        )
+    try:
+        response = await _callback_client.post(body["CallBackURL"], json={"Body": {"stkCallback": callback}})
+        response.raise_for_status()
+        stats["callbacks"] += 1
+    except httpx.HTTPError:
+        stats["callback_failures"] += 1
+
+
+@app.get("/stats")
+async def read_stats():
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of pushes answered with 503")
+    parser.add_argument("--cancel-rate", type=float, default=0.0, help="fraction of callbacks reporting a cancelled prompt")
+    parser.add_argument("--callback-delay-ms", type=float, default=2000)
+    args = parser.parse_args()
+    config.latency_ms = args.latency_ms
+    config.error_rate = args.error_rate
+    config.cancel_rate = args.cancel_rate
+    config.callback_delay_ms = args.callback_delay_ms
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
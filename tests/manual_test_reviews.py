@@ -1,27 +0,0 @@
-import asyncio
-from app.services.trust_score import trust_score_service
-from app.schemas.review import ReviewCreate
-import uuid
-
-async def test_trust_score_logic():
-    print("Testing Trust Score Logic...")
-    
-    # Mock Provider ID
-    provider_id = str(uuid.uuid4())
-    
-    # Test Calculation
-    # Since we are mocking the DB, we expect the detailed mock logic in `calculate_score` to run
-    score = await trust_score_service.calculate_score(provider_id, None)
-    
-    print(f"Calculated Score: {score}")
-    
-    # Assertions based on the mock values in service (4.5 rating, 12 reviews, etc.)
-    # Formula: (90*0.4) + (24*0.2) + (95*0.2) + (90*0.2)
-    # 36 + 4.8 + 19 + 18 = 77.8
-    # Let's see what the service actually returns
-    
-    assert score > 0 and score <= 100
-    print("Test Passed: Trust Score calculation returned valid range.")
-
-if __name__ == "__main__":
-    asyncio.run(test_trust_score_logic())
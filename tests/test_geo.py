@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from app.core.geo import geohash, geohash_cells_within, GEOTILE_MAX_CELLS
+
+NAIROBI = (-1.2921, 36.7836)
+
+
+def test_cells_start_with_the_centre_tile():
+    cells = geohash_cells_within(*NAIROBI, 3.0)
+    assert cells[0] == geohash(*NAIROBI)
+    assert len(cells) == len(set(cells))
+
+
+def test_antimeridian_wraps():
+    east = geohash_cells_within(0.0, 179.99, 5.0)
+    west = geohash_cells_within(0.0, -179.99, 5.0)
+    assert geohash(0.001, -179.99) in east
+    assert geohash(0.001, 179.99) in west
+
+
+@pytest.mark.parametrize("lat", [90.0, -90.0, 89.99, 120.0, -200.0])
+def test_poles_are_bounded(lat):
+    start = time.perf_counter()
+    cells = geohash_cells_within(lat, 0.0, 15.0)
+    assert time.perf_counter() - start < 1.0
+    assert 0 < len(cells) <= GEOTILE_MAX_CELLS
+    assert len(cells) == len(set(cells))
@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, select
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.pagination import encode_cursor, keyset
+
+rows = Table(
+    "rows", MetaData(),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("score", Integer),
+    Column("created_at", DateTime(timezone=True)),
+)
+
+
+def test_cursor_round_trips_into_a_seek():
+    cursor = encode_cursor(7, uuid.uuid4())
+    sql = str(keyset(select(rows), [rows.c.score, rows.c.id], cursor, 10))
+    assert "(rows.score, rows.id) <" in sql
+
+
+@pytest.mark.parametrize("values", [
+    ("7", uuid.uuid4()),
+    (True, uuid.uuid4()),
+    (7, "not-a-uuid"),
+    (datetime.now(timezone.utc), uuid.uuid4()),
+])
+def test_mistyped_cursor_values_are_rejected(values):
+    with pytest.raises(HTTPException) as exc:
+        keyset(select(rows), [rows.c.score, rows.c.id], encode_cursor(*values), 10)
+    assert exc.value.status_code == 400
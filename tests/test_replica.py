@@ -0,0 +1,87 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from starlette.requests import Request
+
+from app.api import deps
+from app.core import replica
+from app.core.security import create_access_token
+
+
+def http_scope(method: str, token: str = None) -> dict:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {"type": "http", "method": method, "path": "/api/v1/alerts/report", "headers": headers, "query_string": b""}
+
+
+async def write(token: str, status: int = 200) -> None:
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    await replica.ReadYourWritesMiddleware(app)(http_scope("POST", token), receive, send)
+
+
+@asynccontextmanager
+async def session(name: str):
+    yield name
+
+
+async def read_db_for(token: str) -> str:
+    generator = deps.get_read_db(Request(http_scope("GET", token)))
+    name = await generator.__anext__()
+    await generator.aclose()
+    return name
+
+
+@pytest.fixture
+def with_replica(monkeypatch):
+    async def usable():
+        return True
+
+    monkeypatch.setattr(replica, "replica_engine", object())
+    monkeypatch.setattr(replica.replica_health, "usable", usable)
+    monkeypatch.setattr(deps, "ReplicaSessionLocal", lambda: session("replica"))
+    monkeypatch.setattr(deps, "AsyncSessionLocal", lambda: session("primary"))
+    replica.recent_writers.clear()
+
+
+def test_reads_go_to_replica_without_recent_writes(with_replica):
+    token = create_access_token(uuid.uuid4())
+    assert asyncio.run(read_db_for(token)) == "replica"
+    assert asyncio.run(read_db_for(None)) == "replica"
+
+
+def test_bearer_writer_reads_from_primary_without_cookies(with_replica):
+    writer = create_access_token(uuid.uuid4())
+    other = create_access_token(uuid.uuid4())
+    asyncio.run(write(writer))
+
+    assert asyncio.run(read_db_for(writer)) == "primary"
+    # Same user on another device/token
+    assert asyncio.run(read_db_for(create_access_token(replica.token_subject(f"Bearer {writer}")))) == "primary"
+    assert asyncio.run(read_db_for(other)) == "replica"
+
+
+def test_failed_writes_and_bad_tokens_do_not_stick(with_replica):
+    writer = create_access_token(uuid.uuid4())
+    asyncio.run(write(writer, status=422))
+    asyncio.run(write("not-a-jwt"))
+
+    assert asyncio.run(read_db_for(writer)) == "replica"
+    assert len(replica.recent_writers) == 0
+
+
+def test_response_cache_misses_read_from_primary(with_replica):
+    request = Request(http_scope("GET"))
+    request.state.read_from_primary = True
+    generator = deps.get_read_db(request)
+    assert asyncio.run(generator.__anext__()) == "primary"
+    asyncio.run(generator.aclose())
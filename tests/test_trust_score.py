@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.trust_score import score_from_stats, trust_score_service
+
+
+def stats(**overrides):
+    values = dict(
+        rating_sum=0, rating_count=0, vouch_weight_sum=0.0,
+        bookings_completed=0, bookings_cancelled=0,
+        response_minutes_sum=0.0, response_count=0,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_no_stats_scores_zero():
+    assert score_from_stats(None) == 0.0
+    assert score_from_stats(stats()) == 0.0
+
+
+def test_perfect_provider_scores_100():
+    perfect = stats(
+        rating_sum=250, rating_count=50,
+        bookings_completed=10, response_minutes_sum=300.0, response_count=10,
+    )
+    assert score_from_stats(perfect) == 100.0
+
+
+def test_components_are_weighted():
+    # 4.5 stars (36) + 12 reviews of 50 (4.8) + 95% completion (19) + no responses (0)
+    provider = stats(rating_sum=54, rating_count=12, bookings_completed=19, bookings_cancelled=1)
+    assert score_from_stats(provider) == pytest.approx(59.8)
+
+
+def test_vouches_add_social_proof_up_to_cap():
+    assert score_from_stats(stats(vouch_weight_sum=25.0)) == pytest.approx(10.0)
+    assert score_from_stats(stats(vouch_weight_sum=500.0)) == pytest.approx(20.0)
+
+
+def test_response_time_is_linear_between_an_hour_and_a_day():
+    hour = stats(response_minutes_sum=60.0, response_count=1)
+    day = stats(response_minutes_sum=24 * 60.0, response_count=1)
+    midway = stats(response_minutes_sum=(60 + 24 * 60) / 2, response_count=1)
+    assert score_from_stats(hour) == pytest.approx(20.0)
+    assert score_from_stats(day) == 0.0
+    assert score_from_stats(midway) == pytest.approx(10.0)
+
+
+class RecordingSession:
+    """
+    Captures the statements `_apply` issues; the upsert returns `row`.
+    """
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(one=lambda: self.row)
+
+
+def compiled(stmt) -> str:
+    return " ".join(str(stmt.compile(dialect=postgresql.dialect())).split())
+
+
+def test_apply_upserts_deltas_and_writes_back_score():
+    provider_id = uuid.uuid4()
+    row = stats(rating_sum=9, rating_count=2, bookings_completed=3, response_minutes_sum=90.0, response_count=3)
+    db = RecordingSession(row)
+
+    score = asyncio.run(trust_score_service._apply(db, provider_id, {"rating_sum": 4, "rating_count": 1}))
+
+    assert score == score_from_stats(row)
+    upsert, provider_update = db.statements
+    sql = compiled(upsert)
+    assert "ON CONFLICT (provider_id) DO UPDATE SET" in sql
+    # Increments against the stored row, so concurrent events never lose updates
+    assert "rating_sum = (provider_stats.rating_sum + excluded.rating_sum)" in sql
+    assert "rating_count = (provider_stats.rating_count + excluded.rating_count)" in sql
+    # Only the columns in the delta are touched
+    assert "bookings_completed =" not in sql
+    assert "RETURNING" in sql
+
+    params = provider_update.compile(dialect=postgresql.dialect()).params
+    assert params["trust_score"] == round(score)
+    assert params["jobs_completed"] == 3
+    assert params["response_time_avg"] == 30